@@ -0,0 +1,1826 @@
+"""
+Camada de dados do sistema de ordens de serviço (SQLite).
+
+Não depende da interface: pode ser importada por scripts, testes de carga
+ou outra interface além da do Flet (ver servico_os.py).
+"""
+import logging
+import sqlite3
+from datetime import datetime, timedelta
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Arquivo do banco de dados
+DB_PATH = 'sistema_os.db'
+
+# Formato brasileiro usado na interface e nos PDFs
+FORMATO_DATA = '%d/%m/%Y %H:%M'
+
+# Camada de formatação das datas: no banco as datas ficam como epoch (inteiro),
+# ordenáveis e indexáveis; na tela e nos PDFs continuam no formato brasileiro.
+def agora_epoch():
+    return int(datetime.now().timestamp())
+
+def formatar_data(ts):
+    """Converte um epoch em texto dd/mm/aaaa hh:mm (None continua None)."""
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts).strftime(FORMATO_DATA)
+
+def para_epoch(valor):
+    """Aceita datetime, epoch ou texto dd/mm/aaaa [hh:mm] e devolve o epoch."""
+    if valor is None or valor == "":
+        return None
+    if isinstance(valor, (int, float)):
+        return int(valor)
+    if isinstance(valor, datetime):
+        return int(valor.timestamp())
+    for formato in (FORMATO_DATA, '%d/%m/%Y'):
+        try:
+            return int(datetime.strptime(valor.strip(), formato).timestamp())
+        except ValueError:
+            continue
+    return None
+
+def limite_periodo(valor, fim=False):
+    """
+    Epoch de um limite de período informado pelo usuário (None se vazio).
+    Um `fim` só com a data (dd/mm/aaaa) vale até o último segundo do dia.
+    Data informada que não pode ser lida gera ValueError, em vez de virar
+    um período aberto.
+    """
+    ts = para_epoch(valor)
+    if ts is None:
+        if valor is None or valor == "":
+            return None
+        raise ValueError(f"Data inválida: {valor!r} (use dd/mm/aaaa ou dd/mm/aaaa hh:mm)")
+    if fim and isinstance(valor, str):
+        try:
+            dia = datetime.strptime(valor.strip(), '%d/%m/%Y')
+        except ValueError:
+            return ts
+        return int((dia + timedelta(days=1)).timestamp()) - 1
+    return ts
+
+def versao_schema(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+# Inicialização do Banco de Dados
+def init_db(caminho=None):
+    """
+    Leva o banco até a VERSAO_SCHEMA aplicando as migrações pendentes.
+    Devolve False sem alterar nada se o banco já estiver na versão atual.
+    """
+    conn = sqlite3.connect(caminho or DB_PATH)
+    try:
+        if versao_schema(conn) >= VERSAO_SCHEMA:
+            return False
+        aplicar_migracoes(conn)
+        return True
+    finally:
+        conn.close()
+
+def criar_tabelas(cursor):
+    """Tabelas do sistema no formato atual (não altera tabelas já existentes)."""
+    # Verificamos que a tabela de clientes tem a coluna data_cadastro
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS clientes (
+            id TEXT PRIMARY KEY,
+            nome TEXT NOT NULL,
+            telefone TEXT NOT NULL,
+            email TEXT,
+            rua TEXT,
+            numero TEXT,
+            bairro TEXT,
+            cidade TEXT,
+            estado TEXT,
+            data_cadastro TEXT,
+            data_cadastro_ts INTEGER
+        )
+    ''')
+    
+    # Tabela Equipamentos
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS equipamentos (
+            id TEXT PRIMARY KEY,
+            cliente_id TEXT,
+            tipo TEXT NOT NULL,
+            marca TEXT,
+            modelo TEXT,
+            numero_serie TEXT,
+            observacao TEXT,
+            FOREIGN KEY (cliente_id) REFERENCES clientes(id)
+        )
+    ''')
+    
+    # Tabela Produtos
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS produtos (
+            id TEXT PRIMARY KEY,
+            nome TEXT NOT NULL,
+            descricao TEXT,
+            preco REAL,
+            quantidade INTEGER
+        )
+    ''')
+    
+    # Tabela Ordens de Serviço
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ordens_servico (
+            id TEXT PRIMARY KEY,
+            cliente_id TEXT,
+            equipamento_id TEXT,
+            tecnico_id TEXT,
+            data_abertura TEXT,
+            data_fechamento TEXT,
+            status TEXT,
+            descricao_problema TEXT,
+            descricao_solucao TEXT,
+            data_abertura_ts INTEGER,
+            data_fechamento_ts INTEGER,
+            FOREIGN KEY (cliente_id) REFERENCES clientes(id),
+            FOREIGN KEY (equipamento_id) REFERENCES equipamentos(id),
+            FOREIGN KEY (tecnico_id) REFERENCES tecnicos(id)
+        )
+    ''')
+    
+    # Tabela Técnicos
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tecnicos (
+            id TEXT PRIMARY KEY,
+            nome TEXT NOT NULL,
+            especialidade TEXT
+        )
+    ''')
+
+# Sequências dos IDs: nome -> (prefixo, tabela). Ex.: CLI00001, OS00042
+SEQUENCIAS = {
+    "clientes": ("CLI", "clientes"),
+    "equipamentos": ("EQP", "equipamentos"),
+    "produtos": ("PRD", "produtos"),
+    "tecnicos": ("TEC", "tecnicos"),
+    "ordens_servico": ("OS", "ordens_servico"),
+}
+
+def formatar_id(nome, valor):
+    prefixo = SEQUENCIAS[nome][0]
+    return f"{prefixo}{valor:05d}"  # formato: PREFIX + 5 dígitos com zeros à esquerda
+
+def criar_sequencias(cursor):
+    """
+    Cria a tabela de sequências e a alinha com o maior ID já gravado em cada
+    tabela (inclusive IDs gerados por versões antigas, que contavam em memória).
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sequencias (
+            nome TEXT PRIMARY KEY,
+            valor INTEGER NOT NULL
+        )
+    ''')
+    for nome, (prefixo, tabela) in SEQUENCIAS.items():
+        cursor.execute(f'''
+            SELECT MAX(CAST(SUBSTR(id, {len(prefixo) + 1}) AS INTEGER))
+            FROM {tabela} WHERE id >= ? AND id < ?
+        ''', (prefixo + "0", prefixo + ":"))
+        maior = cursor.fetchone()[0] or 0
+        cursor.execute("INSERT OR IGNORE INTO sequencias (nome, valor) VALUES (?, 0)", (nome,))
+        cursor.execute("UPDATE sequencias SET valor = MAX(valor, ?) WHERE nome = ?", (maior, nome))
+
+def alocar_ids(conn, nome, quantidade=1):
+    """
+    Reserva `quantidade` IDs consecutivos da sequência `nome` e devolve a lista
+    formatada. Deve rodar na mesma transação do INSERT: o UPDATE trava o banco
+    para escrita até o commit, então duas instâncias do programa nunca recebem
+    o mesmo número.
+    """
+    conn.execute("UPDATE sequencias SET valor = valor + ? WHERE nome = ?", (quantidade, nome))
+    ultimo = conn.execute("SELECT valor FROM sequencias WHERE nome = ?", (nome,)).fetchone()[0]
+    return [formatar_id(nome, valor) for valor in range(ultimo - quantidade + 1, ultimo + 1)]
+
+# Migração de IDs antigos (UUID) para IDs sequenciais --------------------
+
+# Chaves estrangeiras reescritas na migração: (tabela, coluna, sequência referenciada)
+CHAVES_ESTRANGEIRAS = [
+    ("equipamentos", "cliente_id", "clientes"),
+    ("ordens_servico", "cliente_id", "clientes"),
+    ("ordens_servico", "equipamento_id", "equipamentos"),
+    ("ordens_servico", "tecnico_id", "tecnicos"),
+]
+
+def id_sequencial(nome, id):
+    """True se `id` já está no formato da sequência `nome` (ex.: CLI00001)."""
+    prefixo = SEQUENCIAS[nome][0]
+    return id is not None and id.startswith(prefixo) and id[len(prefixo):].isdigit()
+
+def migrar_para_novos_ids(caminho=None, lote=1000, ao_progresso=None):
+    """
+    Troca os IDs antigos (UUID) das cinco tabelas por IDs sequenciais e
+    reescreve as chaves estrangeiras que apontavam para eles.
+
+    Roda no lugar, em lotes de `lote` linhas por rowid, cada lote numa
+    transação que também grava o mapa antigo -> novo (tabela mapa_ids) e o
+    ponto de parada (tabela progresso_migracao_ids). Se for interrompida,
+    basta chamar de novo: continua do último lote gravado. Linhas que já têm
+    ID sequencial ficam como estão.
+
+    `ao_progresso(etapa, processadas, total, linhas_por_segundo)` é chamado a
+    cada lote. Retorna o número de IDs trocados mais o de referências
+    reescritas.
+
+    Uso (com o programa fechado):
+        python -c "import banco_os; banco_os.migrar_para_novos_ids()"
+    """
+    conn = sqlite3.connect(caminho or DB_PATH)
+    try:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS mapa_ids (
+                tabela TEXT NOT NULL,
+                id_antigo TEXT NOT NULL,
+                id_novo TEXT NOT NULL,
+                PRIMARY KEY (tabela, id_antigo)
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS progresso_migracao_ids (
+                etapa TEXT PRIMARY KEY,
+                ultimo_rowid INTEGER NOT NULL DEFAULT 0,
+                concluida INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        # A migração antiga guardou o UUID dos clientes em id_antigo; as
+        # referências a esses UUIDs são reescritas pelo mesmo mapa
+        cursor = conn.cursor()
+        if "id_antigo" in colunas_tabela(cursor, "clientes"):
+            conn.execute('''
+                INSERT OR IGNORE INTO mapa_ids (tabela, id_antigo, id_novo)
+                SELECT 'clientes', id_antigo, id FROM clientes
+                WHERE id_antigo IS NOT NULL AND id_antigo != id
+            ''')
+        # Linhas das cópias *_old que não chegaram às tabelas atuais voltam
+        # antes de init_db (a versão 2 do esquema remove as cópias)
+        recuperar_tabelas_old(cursor)
+        conn.commit()
+        init_db(caminho)
+
+        # Garante que a sequência começa depois dos IDs sequenciais já gravados
+        criar_sequencias(conn.cursor())
+        conn.commit()
+
+        trocados = reescritas = 0
+        # Primeiro as chaves primárias: o mapa de cada tabela precisa estar
+        # completo antes de reescrever as referências a ela
+        for nome, (_, tabela) in SEQUENCIAS.items():
+            def renumerar(linhas, nome=nome, tabela=tabela):
+                pendentes = [(rowid, id) for rowid, id in linhas
+                             if id is not None and not id_sequencial(nome, id)]
+                if not pendentes:
+                    return 0
+                novos = alocar_ids(conn, nome, len(pendentes))
+                conn.executemany("INSERT INTO mapa_ids (tabela, id_antigo, id_novo) VALUES (?, ?, ?)",
+                                 [(nome, id, novo) for (_, id), novo in zip(pendentes, novos)])
+                conn.executemany(f"UPDATE {tabela} SET id = ? WHERE rowid = ?",
+                                 [(novo, rowid) for (rowid, _), novo in zip(pendentes, novos)])
+                return len(pendentes)
+            trocados += _etapa_migracao_ids(conn, tabela, tabela, "id", renumerar, lote, ao_progresso)
+
+        for tabela, coluna, nome in CHAVES_ESTRANGEIRAS:
+            def reescrever(linhas, tabela=tabela, coluna=coluna, nome=nome):
+                # Referências sem cadastro correspondente ficam como estão
+                pendentes = [(nome, rowid) for rowid, valor in linhas
+                             if valor is not None and not id_sequencial(nome, valor)]
+                if not pendentes:
+                    return 0
+                return conn.executemany(f'''
+                    UPDATE {tabela} SET {coluna} = (
+                        SELECT id_novo FROM mapa_ids WHERE tabela = ?1 AND id_antigo = {tabela}.{coluna})
+                    WHERE rowid = ?2 AND {coluna} IN (SELECT id_antigo FROM mapa_ids WHERE tabela = ?1)
+                ''', pendentes).rowcount
+            reescritas += _etapa_migracao_ids(conn, f"{tabela}.{coluna}", tabela, coluna, reescrever,
+                                              lote, ao_progresso)
+
+        # Os triggers do painel deixaram contadores zerados nos IDs antigos dos técnicos
+        reconstruir_resumos_painel(conn.cursor())
+        conn.commit()
+
+        logger.info("Migração de IDs concluída: %d IDs trocados, %d referências reescritas", trocados, reescritas)
+        return trocados + reescritas
+    finally:
+        conn.close()
+
+def _etapa_migracao_ids(conn, etapa, tabela, coluna, processar, lote, ao_progresso):
+    """Percorre `tabela` por rowid a partir do último ponto gravado de `etapa`."""
+    linha = conn.execute("SELECT ultimo_rowid, concluida FROM progresso_migracao_ids WHERE etapa = ?",
+                         (etapa,)).fetchone()
+    if linha and linha[1]:
+        return 0
+    ultimo_rowid = linha[0] if linha else 0
+    total = conn.execute(f"SELECT COUNT(*) FROM {tabela} WHERE rowid > ?", (ultimo_rowid,)).fetchone()[0]
+
+    processadas = alteradas = 0
+    inicio = ultimo_aviso = time.perf_counter()
+    while True:
+        linhas = conn.execute(f'''
+            SELECT rowid, {coluna} FROM {tabela} WHERE rowid > ? ORDER BY rowid LIMIT ?
+        ''', (ultimo_rowid, lote)).fetchall()
+        if not linhas:
+            break
+        ultimo_rowid = linhas[-1][0]
+        try:
+            alteradas += processar(linhas)
+            conn.execute('''
+                INSERT INTO progresso_migracao_ids (etapa, ultimo_rowid) VALUES (?, ?)
+                ON CONFLICT(etapa) DO UPDATE SET ultimo_rowid = excluded.ultimo_rowid
+            ''', (etapa, ultimo_rowid))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        processadas += len(linhas)
+        agora = time.perf_counter()
+        velocidade = processadas / max(agora - inicio, 1e-6)
+        if ao_progresso:
+            ao_progresso(etapa, processadas, total, velocidade)
+        # No console, no máximo um aviso por segundo
+        if agora - ultimo_aviso >= 1:
+            logger.info("Migração de IDs [%s]: %d/%d linhas (%.0f linhas/s)", etapa, processadas, total, velocidade)
+            ultimo_aviso = agora
+
+    conn.execute('''
+        INSERT INTO progresso_migracao_ids (etapa, ultimo_rowid, concluida) VALUES (?, ?, 1)
+        ON CONFLICT(etapa) DO UPDATE SET concluida = 1
+    ''', (etapa, ultimo_rowid))
+    conn.commit()
+    if processadas:
+        logger.info("Migração de IDs [%s]: %d linhas em %.1f s", etapa, processadas, time.perf_counter() - inicio)
+    return alteradas
+
+# Colunas epoch (INTEGER) que acompanham as datas em texto dd/mm/aaaa
+COLUNAS_EPOCH = [
+    ("clientes", "data_cadastro", "data_cadastro_ts"),
+    ("ordens_servico", "data_abertura", "data_abertura_ts"),
+    ("ordens_servico", "data_fechamento", "data_fechamento_ts"),
+]
+
+def garantir_colunas_epoch(cursor):
+    """Adiciona as colunas epoch em bancos criados antes delas existirem."""
+    for tabela, _, coluna_ts in COLUNAS_EPOCH:
+        if coluna_ts not in colunas_tabela(cursor, tabela):
+            logger.info("Migrando banco de dados: adicionando coluna %s à tabela %s", coluna_ts, tabela)
+            cursor.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna_ts} INTEGER")
+
+def migrar_datas_epoch(conn, lote=500):
+    """
+    Preenche as colunas epoch a partir do texto dd/mm/aaaa em lotes pequenos,
+    cada um na sua própria transação, para não segurar o banco durante a migração.
+    Pode ser interrompida e rodada de novo: só converte o que ainda falta.
+    Retorna o número de linhas convertidas.
+    """
+    cursor = conn.cursor()
+    total = 0
+    for tabela, coluna_txt, coluna_ts in COLUNAS_EPOCH:
+        ultimo_rowid = 0
+        while True:
+            cursor.execute(f'''
+                SELECT rowid, {coluna_txt} FROM {tabela}
+                WHERE rowid > ? AND {coluna_ts} IS NULL AND {coluna_txt} IS NOT NULL
+                ORDER BY rowid LIMIT ?
+            ''', (ultimo_rowid, lote))
+            linhas = cursor.fetchall()
+            if not linhas:
+                break
+            ultimo_rowid = linhas[-1][0]
+            valores = [(para_epoch(texto), rowid) for rowid, texto in linhas]
+            valores = [v for v in valores if v[0] is not None]
+            if valores:
+                cursor.executemany(f"UPDATE {tabela} SET {coluna_ts} = ? WHERE rowid = ?", valores)
+                total += len(valores)
+            conn.commit()
+    if total:
+        logger.info("Migração de datas: %d registros convertidos para epoch", total)
+    return total
+
+# Índices secundários gerenciados (nome, tabela, colunas).
+# Cobrem o caminho de JOIN de buscar_ordens_servico e os filtros mais usados.
+INDICES = [
+    ("idx_os_cliente_ts", "ordens_servico", "cliente_id, data_abertura_ts"),
+    ("idx_os_equipamento", "ordens_servico", "equipamento_id"),
+    ("idx_os_tecnico", "ordens_servico", "tecnico_id, status"),
+    ("idx_os_status_ts", "ordens_servico", "status, data_abertura_ts"),
+    ("idx_os_abertura_ts", "ordens_servico", "data_abertura_ts, id"),
+    # Paginação da listagem: ordens sem data convertida entram no fim (ver CHAVE_LISTA_OS)
+    ("idx_os_lista", "ordens_servico", "COALESCE(data_abertura_ts, 0), id"),
+    ("idx_equipamentos_cliente", "equipamentos", "cliente_id"),
+]
+
+# Índices substituídos por versões novas; removidos ao inicializar o banco
+INDICES_OBSOLETOS = ["idx_os_cliente", "idx_os_status", "idx_os_data_abertura"]
+
+def criar_indices(cursor):
+    """Cria os índices gerenciados (idempotente)."""
+    for nome in INDICES_OBSOLETOS:
+        cursor.execute(f"DROP INDEX IF EXISTS {nome}")
+    for nome, tabela, colunas in INDICES:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {nome} ON {tabela} ({colunas})")
+
+# Índices de texto completo (FTS5): (tabela_fts, tabela_origem, colunas).
+# Usam conteúdo externo (a própria tabela de origem) e são mantidos por triggers.
+TABELAS_FTS = [
+    ("clientes_fts", "clientes", ["nome", "telefone", "email"]),
+    ("equipamentos_fts", "equipamentos", ["tipo", "marca", "modelo", "numero_serie"]),
+    ("tecnicos_fts", "tecnicos", ["nome", "especialidade"]),
+    ("ordens_fts", "ordens_servico", ["descricao_problema", "descricao_solucao"]),
+]
+
+# Sem acentos ("joao" encontra "João") e com índices de prefixo de 2 e 3 letras
+TOKENIZADOR_FTS = "unicode61 remove_diacritics 2"
+
+def criar_indices_fts(cursor):
+    """Cria as tabelas FTS5 e seus triggers; popula as que acabaram de ser criadas."""
+    for tabela_fts, tabela, colunas in TABELAS_FTS:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (tabela_fts,))
+        ja_existia = cursor.fetchone() is not None
+
+        lista = ", ".join(colunas)
+        novos = ", ".join(f"new.{col}" for col in colunas)
+        antigos = ", ".join(f"old.{col}" for col in colunas)
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {tabela_fts} USING fts5(
+                {lista}, content='{tabela}', content_rowid='rowid',
+                tokenize='{TOKENIZADOR_FTS}', prefix='2 3'
+            )
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {tabela_fts}_ai AFTER INSERT ON {tabela} BEGIN
+                INSERT INTO {tabela_fts}(rowid, {lista}) VALUES (new.rowid, {novos});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {tabela_fts}_ad AFTER DELETE ON {tabela} BEGIN
+                INSERT INTO {tabela_fts}({tabela_fts}, rowid, {lista}) VALUES ('delete', old.rowid, {antigos});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {tabela_fts}_au AFTER UPDATE ON {tabela} BEGIN
+                INSERT INTO {tabela_fts}({tabela_fts}, rowid, {lista}) VALUES ('delete', old.rowid, {antigos});
+                INSERT INTO {tabela_fts}(rowid, {lista}) VALUES (new.rowid, {novos});
+            END
+        ''')
+
+        if not ja_existia:
+            logger.info("Criando índice de texto %s para a tabela %s", tabela_fts, tabela)
+            cursor.execute(f"INSERT INTO {tabela_fts}({tabela_fts}) VALUES ('rebuild')")
+
+def montar_consulta_fts(termo):
+    """
+    Converte o texto digitado em uma consulta FTS5: cada palavra vira um
+    prefixo ("joa"* "silv"*) e todas precisam aparecer. Retorna None se não
+    houver nenhuma palavra pesquisável.
+    """
+    palavras = re.findall(r"\w+", termo or "")
+    if not palavras:
+        return None
+    return " ".join(f'"{palavra}"*' for palavra in palavras)
+
+def verificar_planos_consulta(conn, consultas):
+    """
+    Roda EXPLAIN QUERY PLAN em cada consulta e falha se alguma tabela
+    for percorrida com SCAN completo em vez de SEARCH por índice.
+
+    `consultas` é uma lista de (nome, sql, parametros, tabelas_com_scan_permitido).
+    Um SCAN que percorre um índice (ex.: ORDER BY ... LIMIT) é aceito.
+    """
+    cursor = conn.cursor()
+    problemas = []
+    for nome, sql, parametros, permitidos in consultas:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parametros)
+        for linha in cursor.fetchall():
+            detalhe = linha[-1]
+            if not detalhe.startswith("SCAN "):
+                continue
+            tabela = detalhe.split()[1]
+            if "USING" in detalhe and "INDEX" in detalhe:
+                continue
+            # Tabelas FTS5 respondem pelo próprio índice invertido
+            if "VIRTUAL TABLE INDEX" in detalhe:
+                continue
+            if tabela in permitidos:
+                continue
+            problemas.append(f"{nome}: {detalhe}")
+    if problemas:
+        raise RuntimeError("Consultas sem índice encontradas:\n" + "\n".join(problemas))
+
+# Contadores do painel ----------------------------------------------------
+
+# Situações de uma OS, na ordem em que aparecem no painel
+STATUS_OS = ["Aberta", "Em andamento", "Aguardando peças", "Fechada"]
+
+# Uma OS entra no tempo médio de atendimento quando está fechada com as duas datas
+_OS_CONCLUIDA = "{r}.status = 'Fechada' AND {r}.data_abertura_ts IS NOT NULL AND {r}.data_fechamento_ts IS NOT NULL"
+
+def criar_resumos_painel(cursor):
+    """
+    Tabelas de resumo do painel e os triggers que as mantêm a cada INSERT,
+    UPDATE (ex.: update_status_os) e DELETE em ordens_servico, para o painel
+    ler contadores prontos em vez de agrupar a tabela inteira.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS resumo_tecnico_status (
+            tecnico_id TEXT NOT NULL,
+            status TEXT NOT NULL,
+            quantidade INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (tecnico_id, status)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS resumo_tecnico_tempo (
+            tecnico_id TEXT PRIMARY KEY,
+            fechadas INTEGER NOT NULL DEFAULT 0,
+            soma_segundos INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+
+    def somar(r):
+        return f'''
+            INSERT INTO resumo_tecnico_status (tecnico_id, status, quantidade)
+            VALUES (COALESCE({r}.tecnico_id, ''), COALESCE({r}.status, ''), 1)
+            ON CONFLICT (tecnico_id, status) DO UPDATE SET quantidade = quantidade + 1;
+            INSERT INTO resumo_tecnico_tempo (tecnico_id, fechadas, soma_segundos)
+            SELECT COALESCE({r}.tecnico_id, ''), 1, {r}.data_fechamento_ts - {r}.data_abertura_ts
+            WHERE {_OS_CONCLUIDA.format(r=r)}
+            ON CONFLICT (tecnico_id) DO UPDATE SET
+                fechadas = fechadas + 1, soma_segundos = soma_segundos + excluded.soma_segundos;
+        '''
+
+    def subtrair(r):
+        return f'''
+            UPDATE resumo_tecnico_status SET quantidade = quantidade - 1
+            WHERE tecnico_id = COALESCE({r}.tecnico_id, '') AND status = COALESCE({r}.status, '');
+            UPDATE resumo_tecnico_tempo SET
+                fechadas = fechadas - 1,
+                soma_segundos = soma_segundos - ({r}.data_fechamento_ts - {r}.data_abertura_ts)
+            WHERE tecnico_id = COALESCE({r}.tecnico_id, '') AND {_OS_CONCLUIDA.format(r=r)};
+        '''
+
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS resumo_os_ai AFTER INSERT ON ordens_servico BEGIN
+            {somar("new")}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS resumo_os_ad AFTER DELETE ON ordens_servico BEGIN
+            {subtrair("old")}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS resumo_os_au
+        AFTER UPDATE OF tecnico_id, status, data_abertura_ts, data_fechamento_ts ON ordens_servico BEGIN
+            {subtrair("old")}
+            {somar("new")}
+        END
+    """)
+
+def reconstruir_resumos_painel(cursor):
+    """Recalcula as tabelas de resumo a partir de ordens_servico."""
+    cursor.execute("DELETE FROM resumo_tecnico_status")
+    cursor.execute("DELETE FROM resumo_tecnico_tempo")
+    cursor.execute('''
+        INSERT INTO resumo_tecnico_status (tecnico_id, status, quantidade)
+        SELECT COALESCE(tecnico_id, ''), COALESCE(status, ''), COUNT(*)
+        FROM ordens_servico GROUP BY 1, 2
+    ''')
+    cursor.execute(f'''
+        INSERT INTO resumo_tecnico_tempo (tecnico_id, fechadas, soma_segundos)
+        SELECT COALESCE(os.tecnico_id, ''), COUNT(*), SUM(os.data_fechamento_ts - os.data_abertura_ts)
+        FROM ordens_servico os WHERE {_OS_CONCLUIDA.format(r="os")} GROUP BY 1
+    ''')
+
+def diferencas_resumos_painel(cursor):
+    """
+    Compara os contadores gravados com um recálculo completo. Devolve a lista
+    de (tecnico_id, item, gravado, correto) que não batem (vazia se tudo certo).
+    """
+    cursor.execute('''
+        SELECT COALESCE(tecnico_id, ''), COALESCE(status, ''), COUNT(*)
+        FROM ordens_servico GROUP BY 1, 2
+    ''')
+    correto = {(t, s): q for t, s, q in cursor.fetchall()}
+    cursor.execute("SELECT tecnico_id, status, quantidade FROM resumo_tecnico_status WHERE quantidade != 0")
+    gravado = {(t, s): q for t, s, q in cursor.fetchall()}
+
+    cursor.execute(f'''
+        SELECT COALESCE(os.tecnico_id, ''), COUNT(*), SUM(os.data_fechamento_ts - os.data_abertura_ts)
+        FROM ordens_servico os WHERE {_OS_CONCLUIDA.format(r="os")} GROUP BY 1
+    ''')
+    correto.update({(t, "tempo"): (f, soma) for t, f, soma in cursor.fetchall()})
+    cursor.execute("SELECT tecnico_id, fechadas, soma_segundos FROM resumo_tecnico_tempo WHERE fechadas != 0")
+    gravado.update({(t, "tempo"): (f, soma) for t, f, soma in cursor.fetchall()})
+
+    return [(tecnico_id, item, gravado.get((tecnico_id, item)), correto.get((tecnico_id, item)))
+            for tecnico_id, item in sorted(set(correto) | set(gravado))
+            if gravado.get((tecnico_id, item)) != correto.get((tecnico_id, item))]
+
+# Migrações do esquema ----------------------------------------------------
+
+def colunas_tabela(cursor, tabela):
+    cursor.execute(f"PRAGMA table_info({tabela})")
+    return [col[1] for col in cursor.fetchall()]
+
+def _migracao_esquema_inicial(cursor):
+    # Bancos criados por versões antigas podem ter as tabelas sem as colunas
+    # adicionadas depois; as novas já nascem completas em criar_tabelas.
+    criar_tabelas(cursor)
+    if "data_cadastro" not in colunas_tabela(cursor, "clientes"):
+        cursor.execute("ALTER TABLE clientes ADD COLUMN data_cadastro TEXT")
+        # Define um valor padrão para registros existentes
+        cursor.execute("UPDATE clientes SET data_cadastro = ?", (formatar_data(agora_epoch()),))
+    if "observacao" not in colunas_tabela(cursor, "equipamentos"):
+        cursor.execute("ALTER TABLE equipamentos ADD COLUMN observacao TEXT")
+    # As colunas epoch são preenchidas depois, em lotes (ver MIGRACOES)
+    garantir_colunas_epoch(cursor)
+    criar_indices(cursor)
+    criar_indices_fts(cursor)
+    criar_sequencias(cursor)
+
+def tabela_existe(cursor, tabela):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (tabela,))
+    return cursor.fetchone() is not None
+
+def _condicao_ja_migrada(cursor, nome, tabela, coluna_id):
+    """SQL que é verdadeiro quando o ID `coluna_id` já está na tabela atual."""
+    alternativas = [f"{coluna_id} IN (SELECT id FROM {tabela})"]
+    if "id_antigo" in colunas_tabela(cursor, tabela):
+        alternativas.append(f"{coluna_id} IN (SELECT id_antigo FROM {tabela} WHERE id_antigo IS NOT NULL)")
+    if tabela_existe(cursor, "mapa_ids"):
+        alternativas.append(f"{coluna_id} IN (SELECT id_antigo FROM mapa_ids WHERE tabela = '{nome}')")
+    return " OR ".join(alternativas)
+
+def recuperar_tabelas_old(cursor):
+    """
+    Devolve às tabelas atuais as linhas das cópias *_old (deixadas pela
+    migração antiga de UUID para IDs sequenciais) que nunca chegaram a elas.
+    Uma linha já foi migrada se o ID dela está na tabela atual, em
+    clientes.id_antigo ou em mapa_ids. As devolvidas mantêm o UUID;
+    migrar_para_novos_ids as renumera depois. Retorna quantas voltaram.
+    """
+    devolvidas = 0
+    for nome, (_, tabela) in SEQUENCIAS.items():
+        copia = f"{tabela}_old"
+        if not tabela_existe(cursor, copia) or not tabela_existe(cursor, tabela):
+            continue
+        atuais = colunas_tabela(cursor, tabela)
+        lista = ", ".join(col for col in colunas_tabela(cursor, copia) if col in atuais)
+        pendentes = f"FROM {copia} o WHERE NOT ({_condicao_ja_migrada(cursor, nome, tabela, 'o.id')})"
+        cursor.execute(f"INSERT INTO {tabela} ({lista}) SELECT {lista} {pendentes}")
+        if cursor.rowcount > 0:
+            logger.warning("%s: %d linhas não migradas devolvidas à tabela %s", copia, cursor.rowcount, tabela)
+            devolvidas += cursor.rowcount
+        cursor.execute(f"SELECT COUNT(*) {pendentes}")
+        restantes = cursor.fetchone()[0]
+        if restantes:
+            raise RuntimeError(f"{copia}: {restantes} linhas não puderam ser devolvidas à tabela {tabela}")
+
+        # As datas das linhas devolvidas ainda não têm o epoch
+        for tabela_data, coluna_txt, coluna_ts in COLUNAS_EPOCH:
+            if tabela_data != tabela or coluna_ts not in atuais:
+                continue
+            cursor.execute(f"SELECT rowid, {coluna_txt} FROM {tabela} "
+                           f"WHERE {coluna_ts} IS NULL AND {coluna_txt} IS NOT NULL")
+            valores = [(para_epoch(texto), rowid) for rowid, texto in cursor.fetchall()]
+            cursor.executemany(f"UPDATE {tabela} SET {coluna_ts} = ? WHERE rowid = ?",
+                               [v for v in valores if v[0] is not None])
+    return devolvidas
+
+def _migracao_remover_tabelas_old(cursor):
+    # Cópias deixadas pela migração de UUID para IDs sequenciais. Só saem
+    # depois de toda linha delas estar na tabela atual (ver recuperar_tabelas_old)
+    recuperar_tabelas_old(cursor)
+    for tabela in ["clientes", "equipamentos", "produtos", "tecnicos", "ordens_servico"]:
+        cursor.execute(f"DROP TABLE IF EXISTS {tabela}_old")
+
+def _migracao_resumos_painel(cursor):
+    criar_resumos_painel(cursor)
+    reconstruir_resumos_painel(cursor)
+
+def _migracao_indice_lista_os(cursor):
+    criar_indices(cursor)
+
+# (versão, descrição, passo, preenchimento). Cada passo roda numa transação
+# própria junto com a gravação de PRAGMA user_version; nunca altere um passo
+# já publicado, crie um novo no fim da lista.
+# O preenchimento (ou None) é a parte longa, que percorre tabelas inteiras:
+# roda depois do commit do passo, em lotes com commit próprio (o outro balcão
+# continua gravando), e a versão só é gravada quando ele termina. Se o programa
+# fechar no meio, a próxima abertura repete o passo e continua o preenchimento,
+# então os dois precisam poder rodar de novo.
+MIGRACOES = [
+    (1, "tabelas, colunas epoch, índices, busca de texto e sequências", _migracao_esquema_inicial,
+     migrar_datas_epoch),
+    (2, "remove as tabelas *_old da migração de IDs", _migracao_remover_tabelas_old, None),
+    (3, "contadores do painel por técnico e situação", _migracao_resumos_painel, None),
+    (4, "índice da listagem de OS que inclui as sem data convertida", _migracao_indice_lista_os, None),
+]
+
+# Versão do esquema esperada por este código (gravada em PRAGMA user_version)
+VERSAO_SCHEMA = MIGRACOES[-1][0]
+
+def aplicar_migracoes(conn):
+    """
+    Aplica, em ordem, as migrações acima da versão atual do banco. Cada passo
+    é atômico: se falhar, o banco fica na versão anterior. A versão é relida
+    depois de travar o banco, então dois programas abrindo ao mesmo tempo não
+    aplicam o mesmo passo duas vezes (os que têm preenchimento em lotes podem
+    rodar nos dois, e por isso podem ser repetidos). Devolve a versão final.
+    """
+    for versao, descricao, passo, preenchimento in MIGRACOES:
+        if versao_schema(conn) >= versao:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if versao_schema(conn) >= versao:
+                conn.rollback()
+                continue
+            logger.info("Migrando banco de dados para a versão %d: %s", versao, descricao)
+            passo(conn.cursor())
+            if preenchimento is None:
+                conn.execute(f"PRAGMA user_version = {versao}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        if preenchimento is not None:
+            preenchimento(conn)
+            conn.execute("BEGIN IMMEDIATE")
+            # O outro programa pode ter terminado antes e já ido adiante
+            if versao_schema(conn) < versao:
+                conn.execute(f"PRAGMA user_version = {versao}")
+            conn.commit()
+    return versao_schema(conn)
+
+# Instrumentação das consultas ---------------------------------------------
+
+# Consultas que levam mais que isto (segundos) vão para o log de lentas
+LIMITE_CONSULTA_LENTA = 0.05
+# Quantas consultas lentas ficam guardadas (as mais antigas vão saindo)
+TAMANHO_LOG_LENTAS = 200
+
+class ConsultaExecutada(NamedTuple):
+    sql: str
+    parametros: str          # só o formato (quantidade e tipos), nunca os valores
+    linhas: int              # lidas (SELECT) ou alteradas (INSERT/UPDATE/DELETE)
+    segundos: float          # execução mais a leitura das linhas
+    quando: float            # time.time() da execução
+    plano: Optional[str] = None
+
+def formato_parametros(parametros, lote=False):
+    """'3: str, str, int' para (?, ?, ?); em executemany, 'lote de N'."""
+    if lote:
+        return f"lote de {len(parametros)}" if hasattr(parametros, "__len__") else "lote"
+    if isinstance(parametros, dict):
+        return f"{len(parametros)}: " + ", ".join(f"{k}={type(v).__name__}" for k, v in parametros.items())
+    if not parametros:
+        return "0"
+    return f"{len(parametros)}: " + ", ".join(type(v).__name__ for v in parametros)
+
+class MonitorConsultas:
+    """
+    Mede as consultas das conexões do pool (ver CursorInstrumentado).
+
+    Cada execução soma nas estatísticas por SQL e é passada aos ganchos
+    (`adicionar_gancho(funcao)`, que recebe um ConsultaExecutada). As que
+    passam de `limite_lenta` segundos entram em `lentas` (só as últimas
+    `tamanho_log`) e no log com nível WARNING, junto com o EXPLAIN QUERY PLAN
+    quando `capturar_plano` está ligado. Com `ativo = False` os cursores não
+    medem nada.
+    """
+
+    def __init__(self, limite_lenta=LIMITE_CONSULTA_LENTA, tamanho_log=TAMANHO_LOG_LENTAS,
+                 capturar_plano=True):
+        self.ativo = True
+        self.limite_lenta = limite_lenta
+        self.capturar_plano = capturar_plano
+        self.lentas = deque(maxlen=tamanho_log)
+        self._por_sql = {}  # sql -> [execuções, segundos, maior tempo, linhas]
+        self._sql_compacto = {}  # texto original -> sem quebras de linha e espaços repetidos
+        self._ganchos = []
+        self._lock = threading.Lock()
+
+    def adicionar_gancho(self, gancho):
+        self._ganchos.append(gancho)
+
+    def remover_gancho(self, gancho):
+        self._ganchos.remove(gancho)
+
+    def registrar(self, conn, sql, parametros, lote, linhas, segundos, quando):
+        compacto = self._sql_compacto.get(sql)
+        if compacto is None:
+            compacto = self._sql_compacto[sql] = " ".join(sql.split())
+        sql = compacto
+        with self._lock:
+            soma = self._por_sql.setdefault(sql, [0, 0.0, 0.0, 0])
+            soma[0] += 1
+            soma[1] += segundos
+            soma[2] = max(soma[2], segundos)
+            soma[3] += linhas
+        lenta = segundos >= self.limite_lenta
+        if not lenta and not self._ganchos:
+            return
+
+        plano = None
+        if lenta and self.capturar_plano and not lote and sql[:6].upper() in ("SELECT", "WITH "):
+            plano = self._plano(conn, sql, parametros)
+        consulta = ConsultaExecutada(sql, formato_parametros(parametros, lote), linhas, segundos, quando, plano)
+        if lenta:
+            self.lentas.append(consulta)
+            logger.warning("Consulta lenta: %.1f ms, %d linhas, parâmetros %s: %s%s",
+                           segundos * 1000, linhas, consulta.parametros, sql,
+                           f"\n{plano}" if plano else "")
+        for gancho in list(self._ganchos):
+            gancho(consulta)
+
+    def _plano(self, conn, sql, parametros):
+        try:
+            # Direto na classe base: o EXPLAIN não entra nas medições
+            linhas = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, parametros).fetchall()
+        except sqlite3.Error as e:
+            return f"(plano indisponível: {e})"
+        return "\n".join(linha[-1] for linha in linhas)
+
+    def estatisticas(self, limite=20):
+        """As `limite` consultas de maior tempo total, com contagem, média e máximo."""
+        with self._lock:
+            itens = sorted(self._por_sql.items(), key=lambda item: item[1][1], reverse=True)[:limite]
+        return [{"sql": sql, "execucoes": n, "total_ms": total * 1000, "media_ms": total / n * 1000,
+                 "max_ms": maior * 1000, "linhas": linhas}
+                for sql, (n, total, maior, linhas) in itens]
+
+    def limpar(self):
+        with self._lock:
+            self._por_sql.clear()
+            self.lentas.clear()
+
+class CursorInstrumentado(sqlite3.Cursor):
+    """
+    Cursor que mede cada execução no MonitorConsultas da conexão. O tempo
+    inclui a leitura das linhas (fetch*), que no SQLite é onde a consulta
+    realmente roda; a medição fecha quando as linhas acabam, na próxima
+    execução ou quando o cursor é descartado.
+    """
+    _medicao = None  # [sql, parâmetros, lote, quando, segundos, linhas]
+
+    def execute(self, sql, parametros=()):
+        self._concluir()
+        if not self.connection.monitor.ativo:
+            return super().execute(sql, parametros)
+        inicio = time.perf_counter()
+        super().execute(sql, parametros)
+        self._medicao = [sql, parametros, False, time.time(), time.perf_counter() - inicio, 0]
+        if self.description is None:
+            self._concluir()
+        return self
+
+    def executemany(self, sql, parametros):
+        self._concluir()
+        if not self.connection.monitor.ativo:
+            return super().executemany(sql, parametros)
+        inicio = time.perf_counter()
+        super().executemany(sql, parametros)
+        self._medicao = [sql, parametros, True, time.time(), time.perf_counter() - inicio, 0]
+        self._concluir()
+        return self
+
+    def fetchone(self):
+        inicio = time.perf_counter()
+        linha = super().fetchone()
+        self._somar(inicio, linha is not None)
+        if linha is None:
+            self._concluir()
+        return linha
+
+    def fetchmany(self, size=None):
+        inicio = time.perf_counter()
+        linhas = super().fetchmany(self.arraysize if size is None else size)
+        self._somar(inicio, len(linhas))
+        if len(linhas) < (self.arraysize if size is None else size):
+            self._concluir()
+        return linhas
+
+    def fetchall(self):
+        inicio = time.perf_counter()
+        linhas = super().fetchall()
+        self._somar(inicio, len(linhas))
+        self._concluir()
+        return linhas
+
+    def __next__(self):
+        inicio = time.perf_counter()
+        try:
+            linha = super().__next__()
+        except StopIteration:
+            self._concluir()
+            raise
+        self._somar(inicio, 1)
+        return linha
+
+    def close(self):
+        self._concluir()
+        super().close()
+
+    def __del__(self):
+        self._concluir()
+
+    def _somar(self, inicio, linhas):
+        if self._medicao is not None:
+            self._medicao[4] += time.perf_counter() - inicio
+            self._medicao[5] += linhas
+
+    def _concluir(self):
+        medicao, self._medicao = self._medicao, None
+        if medicao is None:
+            return
+        sql, parametros, lote, quando, segundos, linhas = medicao
+        if self.description is None:
+            linhas = max(self.rowcount, 0)
+        self.connection.monitor.registrar(self.connection, sql, parametros, lote, linhas, segundos, quando)
+
+class ConexaoInstrumentada(sqlite3.Connection):
+    """Conexão do pool: todo execute passa por um CursorInstrumentado."""
+    monitor = None
+
+    def cursor(self, factory=CursorInstrumentado):
+        return super().cursor(factory)
+
+    def execute(self, sql, parametros=()):
+        return self.cursor().execute(sql, parametros)
+
+    def executemany(self, sql, parametros):
+        return self.cursor().executemany(sql, parametros)
+
+# Ajustes aplicados a toda conexão aberta pelo pool
+PRAGMAS_CONEXAO = [
+    "PRAGMA synchronous = NORMAL",     # seguro em WAL e bem mais rápido que FULL
+    "PRAGMA busy_timeout = 5000",      # espera até 5 s por um lock em vez de falhar
+    "PRAGMA mmap_size = 268435456",    # leitura via memória mapeada (256 MB)
+    "PRAGMA cache_size = -20000",      # ~20 MB de cache de páginas por conexão
+    "PRAGMA temp_store = MEMORY",
+]
+
+class PoolConexoes:
+    """
+    Acesso ao banco seguro entre threads.
+
+    O banco fica em modo WAL, então leituras não bloqueiam a escrita e
+    vice-versa. Cada thread recebe sua própria conexão de leitura (reutilizada
+    nas chamadas seguintes) e todas as escritas passam por uma única conexão,
+    serializada por um lock. Todas as conexões medem suas consultas em
+    `monitor` (ver MonitorConsultas).
+    """
+
+    def __init__(self, caminho=None, monitor=None):
+        self.caminho = caminho or DB_PATH
+        self.monitor = monitor or MonitorConsultas()
+        self._local = threading.local()
+        self._leitores = {}
+        self._leitores_lock = threading.Lock()
+        self._escrita_lock = threading.RLock()
+        self._escritor = self._conectar()
+        self._escritor.execute("PRAGMA journal_mode = WAL")
+        self._versao_dados = self._ler_versao_dados()
+
+    def _conectar(self, somente_leitura=False):
+        conn = sqlite3.connect(self.caminho, check_same_thread=False, factory=ConexaoInstrumentada)
+        conn.monitor = self.monitor
+        for pragma in PRAGMAS_CONEXAO:
+            conn.execute(pragma)
+        if somente_leitura:
+            conn.execute("PRAGMA query_only = ON")
+        # Datas saem do banco já no formato brasileiro
+        conn.create_function("data_br", 1, formatar_data, deterministic=True)
+        return conn
+
+    def leitura(self):
+        """Conexão de leitura da thread atual."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._conectar(somente_leitura=True)
+            self._local.conn = conn
+            with self._leitores_lock:
+                # Esquece conexões de threads que já terminaram
+                vivas = {t.ident for t in threading.enumerate()}
+                for ident in [i for i in self._leitores if i not in vivas]:
+                    del self._leitores[ident]
+                self._leitores[threading.get_ident()] = conn
+        return conn
+
+    @contextmanager
+    def escrita(self):
+        """Conexão de escrita exclusiva; faz commit ao sair ou rollback em erro."""
+        with self._escrita_lock:
+            try:
+                yield self._escritor
+                self._escritor.commit()
+            except Exception:
+                self._escritor.rollback()
+                raise
+
+    def _ler_versao_dados(self):
+        # Direto no sqlite3: a verificação não entra nas estatísticas do monitor
+        return sqlite3.Connection.execute(self._escritor, "PRAGMA data_version").fetchone()[0]
+
+    def dados_alterados(self):
+        """
+        True se outra conexão (outro programa no mesmo banco) gravou desde a
+        chamada anterior. Lê PRAGMA data_version na conexão de escrita, que
+        não muda com os commits dela mesma: as gravações deste pool já passam
+        por CacheConsultas.invalidar. Com uma escrita em andamento devolve
+        False; a mudança aparece na próxima chamada.
+        """
+        if not self._escrita_lock.acquire(blocking=False):
+            return False
+        try:
+            versao = self._ler_versao_dados()
+            anterior, self._versao_dados = self._versao_dados, versao
+            return versao != anterior
+        finally:
+            self._escrita_lock.release()
+
+    def interromper(self, thread):
+        """Cancela a consulta em andamento na conexão de leitura de `thread`."""
+        with self._leitores_lock:
+            conn = self._leitores.get(thread.ident)
+        if conn is not None:
+            conn.interrupt()
+
+    def fechar(self):
+        with self._leitores_lock:
+            for conn in self._leitores.values():
+                conn.close()
+            self._leitores.clear()
+        with self._escrita_lock:
+            self._escritor.close()
+
+# Chave de ordenação da listagem paginada. Uma data antiga que não pôde ser
+# convertida deixa data_abertura_ts NULL, e (NULL, id) < (?, ?) nunca é
+# verdadeiro: sem o COALESCE essas ordens sumiriam depois da primeira página.
+# Tem de ser igual à expressão do índice idx_os_lista.
+CHAVE_LISTA_OS = "COALESCE(os.data_abertura_ts, 0)"
+
+# Quantidade de ordens carregadas por página na listagem (e limite de
+# resultados das buscas de clientes e técnicos por texto)
+TAMANHO_PAGINA_OS = 30
+
+# Registros devolvidos pelas consultas por ID (get_*) e pelas buscas
+# (buscar_*): tuplas com nome, então continuam valendo tanto registro.nome
+# quanto registro[1]
+class Cliente(NamedTuple):
+    id: str
+    nome: str
+    telefone: str
+    email: Optional[str]
+    rua: Optional[str]
+    numero: Optional[str]
+    bairro: Optional[str]
+    cidade: Optional[str]
+    estado: Optional[str]
+
+class Equipamento(NamedTuple):
+    id: str
+    cliente_id: str
+    tipo: str
+    marca: Optional[str]
+    modelo: Optional[str]
+    numero_serie: Optional[str]
+    observacao: Optional[str]
+
+class Tecnico(NamedTuple):
+    id: str
+    nome: str
+    especialidade: Optional[str]
+
+class Ordem(NamedTuple):
+    """Uma linha de SistemaOS.SQL_ORDENS (OS com cliente, equipamento e técnico)."""
+    id: str
+    cliente_id: str
+    equipamento_id: str
+    tecnico_id: str
+    data_abertura: Optional[str]
+    data_fechamento: Optional[str]
+    status: Optional[str]
+    descricao_problema: Optional[str]
+    descricao_solucao: Optional[str]
+    cliente_nome: str
+    telefone: str
+    email: Optional[str]
+    rua: Optional[str]
+    numero: Optional[str]
+    bairro: Optional[str]
+    cidade: Optional[str]
+    estado: Optional[str]
+    equipamento_tipo: str
+    marca: Optional[str]
+    modelo: Optional[str]
+    numero_serie: Optional[str]
+    observacao: Optional[str]
+    tecnico_nome: str
+    especialidade: Optional[str]
+
+class OrdemResumo(NamedTuple):
+    """Projeção estreita de uma OS para as listas (o resto vem de get_ordem)."""
+    id: str
+    status: Optional[str]
+    cliente_nome: str
+    equipamento: str
+    data_abertura: Optional[str]
+    data_fechamento: Optional[str]
+    problema: Optional[str]  # só o começo da descrição
+
+# Caracteres da descrição do problema trazidos para a lista
+TAMANHO_RESUMO_PROBLEMA = 50
+
+# Tamanho máximo (entradas) e validade (segundos) do cache de consultas
+TAMANHO_CACHE_CONSULTAS = 512
+VALIDADE_CACHE_CONSULTAS = 30
+
+class CacheConsultas:
+    """
+    Cache LRU, em memória, de resultados de consultas de leitura.
+
+    Cada entrada declara de que dados depende: ("clientes", "CLI00001") para
+    uma consulta de um registro, ("clientes", None) para uma busca que pode
+    mudar com qualquer cliente novo, ("equipamentos", "cliente_id", id) para
+    as linhas de uma tabela com aquele valor numa coluna. `invalidar(tabela,
+    id, coluna=valor)`, chamado pelos métodos de escrita depois do commit,
+    remove só as entradas daquele registro, as buscas da tabela e as listas
+    das colunas indicadas.
+
+    Gravações feitas por outro computador (mesmo banco na rede) não passam
+    por `invalidar`: antes de cada consulta, `dados_alterados()` (ver
+    PoolConexoes.dados_alterados) diz se o banco mudou e, se mudou, o cache
+    é esvaziado. A validade é só um limite extra.
+    """
+
+    def __init__(self, tamanho_maximo=TAMANHO_CACHE_CONSULTAS, validade=VALIDADE_CACHE_CONSULTAS,
+                 dados_alterados=None):
+        self.tamanho_maximo = tamanho_maximo
+        self.validade = validade
+        self.dados_alterados = dados_alterados
+        self._itens = OrderedDict()  # chave -> (dependências, expira_em, valor)
+        self._por_dependencia = {}   # dependência -> chaves
+        self._lock = threading.Lock()
+        # Muda a cada invalidação: um resultado calculado enquanto alguém
+        # escrevia pode já estar velho e não é guardado
+        self._geracao = 0
+        self.acertos = self.falhas = self.invalidacoes = self.despejos = 0
+
+    def obter(self, chave, dependencias, calcular):
+        """Valor em cache de `chave`; se não houver, chama `calcular()` e guarda."""
+        if self.dados_alterados is not None and self.dados_alterados():
+            self.limpar()
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None and item[1] > time.monotonic():
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return _copia(item[2])
+            self.falhas += 1
+            geracao = self._geracao
+
+        valor = calcular()
+        with self._lock:
+            if geracao != self._geracao:
+                return _copia(valor)
+            self._remover(chave)
+            self._itens[chave] = (dependencias, time.monotonic() + self.validade, valor)
+            for dependencia in dependencias:
+                self._por_dependencia.setdefault(dependencia, set()).add(chave)
+            while len(self._itens) > self.tamanho_maximo:
+                self._remover(next(iter(self._itens)))
+                self.despejos += 1
+        return _copia(valor)
+
+    def invalidar(self, tabela, id=None, **colunas):
+        """
+        Descarta o que depende do registro `id` de `tabela`, as buscas nessa
+        tabela e as listas por coluna de `colunas` (ex.: cliente_id="CLI00001").
+        Sem `id` (escritas em lote), descarta tudo da tabela.
+        """
+        with self._lock:
+            self._geracao += 1
+            if id is None:
+                dependencias = [d for d in self._por_dependencia if d[0] == tabela]
+            else:
+                dependencias = [(tabela, id), (tabela, None)]
+                dependencias += [(tabela, coluna, valor) for coluna, valor in colunas.items()]
+            for dependencia in dependencias:
+                for chave in list(self._por_dependencia.get(dependencia, ())):
+                    self._remover(chave)
+                    self.invalidacoes += 1
+
+    def limpar(self):
+        with self._lock:
+            self._geracao += 1
+            self._itens.clear()
+            self._por_dependencia.clear()
+
+    def estatisticas(self):
+        """Contadores para ajustar o tamanho do cache."""
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                "itens": len(self._itens),
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+                "invalidacoes": self.invalidacoes,
+                "despejos": self.despejos,
+            }
+
+    def _remover(self, chave):
+        item = self._itens.pop(chave, None)
+        if item is None:
+            return
+        for dependencia in item[0]:
+            chaves = self._por_dependencia.get(dependencia)
+            if chaves is not None:
+                chaves.discard(chave)
+                if not chaves:
+                    del self._por_dependencia[dependencia]
+
+def _copia(valor):
+    # Listas saem copiadas para quem chama não alterar o que está no cache
+    return list(valor) if isinstance(valor, list) else valor
+
+# Funções de CRUD
+class SistemaOS:
+    # Consulta base das ordens de serviço com os dados de cliente, equipamento e técnico.
+    # Datas antigas que para_epoch não converteu (epoch NULL) saem como o texto gravado
+    SQL_ORDENS = '''
+        SELECT os.id, os.cliente_id, os.equipamento_id, os.tecnico_id, 
+              COALESCE(data_br(os.data_abertura_ts), os.data_abertura),
+              COALESCE(data_br(os.data_fechamento_ts), os.data_fechamento), os.status, 
+              os.descricao_problema, os.descricao_solucao,
+              c.nome, c.telefone, c.email, c.rua, c.numero, c.bairro, c.cidade, c.estado,
+              e.tipo, e.marca, e.modelo, e.numero_serie, e.observacao,
+              t.nome as tecnico_nome, t.especialidade
+        FROM ordens_servico os
+        JOIN clientes c ON os.cliente_id = c.id
+        JOIN equipamentos e ON os.equipamento_id = e.id
+        JOIN tecnicos t ON os.tecnico_id = t.id
+    '''
+    # Consulta das listas: só as colunas do cartão (ver OrdemResumo)
+    SQL_ORDENS_LISTA = f'''
+        SELECT os.id, os.status, c.nome,
+              TRIM(COALESCE(e.tipo, '') || ' ' || COALESCE(e.marca, '') || ' ' || COALESCE(e.modelo, '')),
+              COALESCE(data_br(os.data_abertura_ts), os.data_abertura),
+              COALESCE(data_br(os.data_fechamento_ts), os.data_fechamento),
+              SUBSTR(os.descricao_problema, 1, {TAMANHO_RESUMO_PROBLEMA + 1})
+        FROM ordens_servico os
+        JOIN clientes c ON os.cliente_id = c.id
+        JOIN equipamentos e ON os.equipamento_id = e.id
+    '''
+
+    # Nomes das colunas de SQL_ORDENS, na ordem (exportações)
+    COLUNAS_ORDENS = list(Ordem._fields)
+
+    SQL_CLIENTES = "SELECT id, nome, telefone, email, rua, numero, bairro, cidade, estado FROM clientes"
+    SQL_TECNICOS = "SELECT id, nome, especialidade FROM tecnicos"
+
+    # Consultas por ID: sequência -> (tipo do registro, SELECT sem o WHERE, coluna do ID)
+    CONSULTAS_POR_ID = {
+        "clientes": (Cliente, SQL_CLIENTES, "id"),
+        "equipamentos": (Equipamento, "SELECT id, cliente_id, tipo, marca, modelo, numero_serie, observacao FROM equipamentos", "id"),
+        "tecnicos": (Tecnico, SQL_TECNICOS, "id"),
+        "ordens_servico": (Ordem, SQL_ORDENS, "os.id"),
+    }
+
+    # Demais consultas fixas. Ficam aqui, e não dentro dos métodos, porque
+    # _consultas_planejadas confere o plano exatamente do que é executado.
+    SQL_CLIENTES_TEXTO = '''
+        SELECT c.id, c.nome, c.telefone, c.email, c.rua, c.numero, c.bairro, c.cidade, c.estado
+        FROM clientes_fts
+        JOIN clientes c ON c.rowid = clientes_fts.rowid
+        WHERE clientes_fts MATCH ?
+        ORDER BY bm25(clientes_fts)
+        LIMIT ?
+    '''
+    SQL_EQUIPAMENTOS_DO_CLIENTE = '''
+        SELECT id, cliente_id, tipo, marca, modelo, numero_serie, observacao
+        FROM equipamentos
+        WHERE cliente_id = ?
+    '''
+    SQL_EQUIPAMENTOS_TEXTO = '''
+        SELECT e.id, e.cliente_id, e.tipo, e.marca, e.modelo, e.numero_serie, e.observacao
+        FROM equipamentos_fts
+        JOIN equipamentos e ON e.rowid = equipamentos_fts.rowid
+        WHERE equipamentos_fts MATCH ?
+        ORDER BY bm25(equipamentos_fts)
+    '''
+    SQL_TECNICOS_TEXTO = '''
+        SELECT t.id, t.nome, t.especialidade
+        FROM tecnicos_fts
+        JOIN tecnicos t ON t.rowid = tecnicos_fts.rowid
+        WHERE tecnicos_fts MATCH ?
+        ORDER BY bm25(tecnicos_fts)
+        LIMIT ?
+    '''
+    SQL_PAINEL_STATUS = '''
+        SELECT r.tecnico_id, t.nome, r.status, r.quantidade
+        FROM resumo_tecnico_status r
+        LEFT JOIN tecnicos t ON t.id = r.tecnico_id
+        WHERE r.quantidade > 0
+    '''
+    SQL_PAINEL_TEMPO = "SELECT tecnico_id, fechadas, soma_segundos FROM resumo_tecnico_tempo WHERE fechadas > 0"
+    SQL_ITERAR_CLIENTES = '''
+        SELECT id, nome, telefone, email, rua, numero, bairro, cidade, estado,
+               COALESCE(data_br(data_cadastro_ts), data_cadastro)
+        FROM clientes ORDER BY id
+    '''
+    SQL_FECHAR_OS = 'UPDATE ordens_servico SET status = ?, data_fechamento = ?, data_fechamento_ts = ?, descricao_solucao = ? WHERE id = ?'
+    SQL_STATUS_OS = 'UPDATE ordens_servico SET status = ? WHERE id = ?'
+
+    def __init__(self, caminho=None):
+        # Aplica as migrações pendentes antes de abrir as conexões
+        init_db(caminho)
+        # Todo acesso ao banco passa pelo pool (leituras por thread, escritor único)
+        self.pool = PoolConexoes(caminho)
+        # Tempos por consulta e log das lentas (sistema.monitor.lentas / estatisticas())
+        self.monitor = self.pool.monitor
+        # Buscas recentes; os métodos de escrita invalidam o que alteram
+        self.cache = CacheConsultas(dados_alterados=self.pool.dados_alterados)
+        # Falha na inicialização se alguma consulta deixar de usar índice
+        verificar_planos_consulta(self.pool.leitura(), self._consultas_planejadas())
+
+    def _consultas_planejadas(self):
+        """
+        Consultas da classe verificadas com EXPLAIN QUERY PLAN na inicialização.
+        Saem das mesmas constantes e dos mesmos métodos _sql_* que os métodos
+        executam, com os filtros das ordens em todas as combinações.
+        """
+        texto = montar_consulta_fts("ab")
+        consultas = []
+        for nome in self.CONSULTAS_POR_ID:
+            consultas.append((f"get ({nome})", self._sql_por_id(nome), ("",), ()))
+            consultas.append((f"get_many ({nome})", self._sql_por_id(nome, 2), ("", ""), ()))
+        for nome in SEQUENCIAS:
+            consultas.append((f"ids_existentes ({nome})", self._sql_ids_existentes(nome, 2), ("", ""), ()))
+        consultas += [
+            ("buscar_clientes (texto)", self.SQL_CLIENTES_TEXTO, (texto, TAMANHO_PAGINA_OS), ()),
+            # Sem termo: os 20 primeiros, sem ordem; o SCAN para no LIMIT
+            ("buscar_clientes (sem termo)", self.SQL_CLIENTES + " LIMIT 20", (), ("clientes",)),
+            ("buscar_equipamentos_por_cliente", self.SQL_EQUIPAMENTOS_DO_CLIENTE, ("",), ()),
+            ("buscar_equipamentos", self.SQL_EQUIPAMENTOS_TEXTO, (texto,), ()),
+            ("buscar_tecnicos (texto)", self.SQL_TECNICOS_TEXTO, (texto, TAMANHO_PAGINA_OS), ()),
+            ("buscar_tecnicos (sem termo)", self.SQL_TECNICOS + " LIMIT 20", (), ("tecnicos",)),
+            # Tabelas de resumo: uma linha por técnico e situação, lidas inteiras
+            ("painel_tecnicos (situações)", self.SQL_PAINEL_STATUS, (), ("r",)),
+            ("painel_tecnicos (tempo)", self.SQL_PAINEL_TEMPO, (), ("resumo_tecnico_tempo",)),
+            ("iterar_clientes", self.SQL_ITERAR_CLIENTES, (), ()),
+            ("update_status_os (fechada)", self.SQL_FECHAR_OS, ("", "", 0, "", ""), ()),
+            ("update_status_os", self.SQL_STATUS_OS, ("", ""), ()),
+        ]
+
+        data = "01/01/2024"
+        for filtro in (None, "ab"):
+            for inicio in (None, data):
+                sql, parametros = self._sql_ordens_servico(filtro, inicio, inicio)
+                consultas.append((f"buscar_ordens_servico (filtro={filtro}, período={inicio})", sql, parametros, ()))
+                for apos in (None, (0, "")):
+                    sql, parametros = self._sql_ordens_pagina(filtro, inicio, inicio, apos, TAMANHO_PAGINA_OS)
+                    consultas.append((f"buscar_ordens_pagina (filtro={filtro}, período={inicio}, após={apos})",
+                                      sql, parametros, ()))
+                for status in (None, "Aberta"):
+                    for tecnico_id in (None, "TEC00001"):
+                        sql, parametros = self._sql_iterar_ordens(status, inicio, inicio, tecnico_id, filtro)
+                        consultas.append((f"iterar_ordens (status={status}, técnico={tecnico_id}, "
+                                          f"filtro={filtro}, período={inicio})", sql, parametros, ()))
+        return consultas
+    
+    # Métodos para gerar novos IDs
+    def reservar_ids(self, nome, quantidade):
+        """
+        Reserva um bloco de IDs numa única transação, para cadastros em lote
+        (uma trava de escrita por bloco, e não uma por ID).
+        """
+        with self.pool.escrita() as conn:
+            return alocar_ids(conn, nome, quantidade)
+
+    def _get_next_id(self, nome):
+        return self.reservar_ids(nome, 1)[0]
+    
+    def get_next_cliente_id(self):
+        return self._get_next_id("clientes")
+    
+    def get_next_equip_id(self):
+        return self._get_next_id("equipamentos")
+    
+    def get_next_produto_id(self):
+        return self._get_next_id("produtos")
+    
+    def get_next_tecnico_id(self):
+        return self._get_next_id("tecnicos")
+    
+    def get_next_os_id(self):
+        return self._get_next_id("ordens_servico")
+    
+    # Modifique todos os métodos add_* para usar os novos IDs
+    def add_cliente(self, nome, telefone, email, rua, numero, bairro, cidade, estado):
+        if not nome or not telefone:
+            raise ValueError("Nome e telefone são obrigatórios")
+        
+        data_cadastro_ts = agora_epoch()
+        # O texto continua sendo gravado para instâncias antigas que leem o mesmo banco
+        data_cadastro = formatar_data(data_cadastro_ts)
+        
+        try:
+            with self.pool.escrita() as conn:
+                id = alocar_ids(conn, "clientes")[0]
+                conn.execute('''
+                    INSERT INTO clientes (id, nome, telefone, email, rua, numero, bairro, cidade, estado, data_cadastro, data_cadastro_ts)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (id, nome, telefone, email, rua, numero, bairro, cidade, estado, data_cadastro, data_cadastro_ts))
+            self.cache.invalidar("clientes", id)
+            return id
+        except Exception as e:
+            logger.error("Erro ao inserir cliente: %s", e)
+            raise
+    
+    def add_equipamento(self, cliente_id, tipo, marca, modelo, numero_serie, observacao=None):
+        try:
+            with self.pool.escrita() as conn:
+                id = alocar_ids(conn, "equipamentos")[0]
+                conn.execute('INSERT INTO equipamentos (id, cliente_id, tipo, marca, modelo, numero_serie, observacao) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                             (id, cliente_id, tipo, marca, modelo, numero_serie, observacao))
+            self.cache.invalidar("equipamentos", id, cliente_id=cliente_id)
+            return id
+        except Exception as ex:
+            logger.error("Erro ao cadastrar equipamento: %s", ex)
+            raise
+    
+    def add_produto(self, nome, descricao, preco, quantidade):
+        with self.pool.escrita() as conn:
+            id = alocar_ids(conn, "produtos")[0]
+            conn.execute('INSERT INTO produtos (id, nome, descricao, preco, quantidade) VALUES (?, ?, ?, ?, ?)',
+                         (id, nome, descricao, preco, quantidade))
+        self.cache.invalidar("produtos", id)
+        return id
+    
+    def add_tecnico(self, nome, especialidade):
+        with self.pool.escrita() as conn:
+            id = alocar_ids(conn, "tecnicos")[0]
+            conn.execute('INSERT INTO tecnicos (id, nome, especialidade) VALUES (?, ?, ?)',
+                         (id, nome, especialidade))
+        self.cache.invalidar("tecnicos", id)
+        return id
+    
+    def inserir_lote(self, nome, colunas, linhas):
+        """
+        Insere várias linhas na tabela da sequência `nome` numa transação só,
+        com um bloco de IDs reservado nessa mesma transação (importações em
+        massa). `linhas` traz os valores de `colunas`, sem o ID. Devolve os IDs.
+        """
+        if not linhas:
+            return []
+        tabela = SEQUENCIAS[nome][1]
+        marcadores = ", ".join("?" * (len(colunas) + 1))
+        with self.pool.escrita() as conn:
+            ids = alocar_ids(conn, nome, len(linhas))
+            conn.executemany(f"INSERT INTO {tabela} (id, {', '.join(colunas)}) VALUES ({marcadores})",
+                             [(id, *linha) for id, linha in zip(ids, linhas)])
+        self.cache.invalidar(tabela)
+        return ids
+
+    def ids_existentes(self, nome, ids):
+        """Subconjunto de `ids` que existe na tabela da sequência `nome`."""
+        ids = list(set(ids))
+        existentes = set()
+        cursor = self.pool.leitura().cursor()
+        # Em blocos, abaixo do limite de parâmetros do SQLite
+        for i in range(0, len(ids), 500):
+            bloco = ids[i:i + 500]
+            cursor.execute(self._sql_ids_existentes(nome, len(bloco)), bloco)
+            existentes.update(linha[0] for linha in cursor.fetchall())
+        return existentes
+
+    def _sql_ids_existentes(self, nome, quantidade):
+        return f"SELECT id FROM {SEQUENCIAS[nome][1]} WHERE id IN ({', '.join('?' * quantidade)})"
+
+    def add_ordem_servico(self, cliente_id, equipamento_id, tecnico_id, descricao_problema):
+        try:
+            data_abertura_ts = agora_epoch()
+            data_abertura = formatar_data(data_abertura_ts)
+            status = 'Aberta'
+            with self.pool.escrita() as conn:
+                id = alocar_ids(conn, "ordens_servico")[0]
+                logger.debug("Inserindo OS: %s, %s, %s, %s, %s, %s, %r", id, cliente_id, equipamento_id,
+                             tecnico_id, data_abertura, status, descricao_problema)
+                conn.execute('INSERT INTO ordens_servico (id, cliente_id, equipamento_id, tecnico_id, data_abertura, data_abertura_ts, status, descricao_problema) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                             (id, cliente_id, equipamento_id, tecnico_id, data_abertura, data_abertura_ts, status, descricao_problema))
+            self.cache.invalidar("ordens_servico", id)
+            return id
+        except Exception as e:
+            logger.error("Erro ao inserir OS: %s", e)
+            raise
+    
+    def update_status_os(self, os_id, status, descricao_solucao=None):
+        with self.pool.escrita() as conn:
+            if status == 'Fechada':
+                data_fechamento_ts = agora_epoch()
+                # Formato de data brasileiro (dia/mês/ano)
+                data_fechamento = formatar_data(data_fechamento_ts)
+                conn.execute(self.SQL_FECHAR_OS, (status, data_fechamento, data_fechamento_ts, descricao_solucao, os_id))
+            else:
+                conn.execute(self.SQL_STATUS_OS, (status, os_id))
+        self.cache.invalidar("ordens_servico", os_id)
+
+    def painel_tecnicos(self):
+        """
+        Contadores do painel, lidos das tabelas de resumo (sem percorrer as
+        ordens). Uma entrada por técnico com OS: dicionário com tecnico_id,
+        tecnico_nome, a quantidade em cada situação de STATUS_OS, total e
+        tempo_medio_horas (None se nenhuma OS foi fechada).
+        """
+        cursor = self.pool.leitura().cursor()
+        cursor.execute(self.SQL_PAINEL_STATUS)
+        painel = {}
+        for tecnico_id, nome, status, quantidade in cursor.fetchall():
+            linha = painel.setdefault(tecnico_id, dict(
+                {"tecnico_id": tecnico_id, "tecnico_nome": nome or "(sem técnico)", "total": 0,
+                 "tempo_medio_horas": None},
+                **{s: 0 for s in STATUS_OS}))
+            linha[status] = linha.get(status, 0) + quantidade
+            linha["total"] += quantidade
+
+        cursor.execute(self.SQL_PAINEL_TEMPO)
+        for tecnico_id, fechadas, soma_segundos in cursor.fetchall():
+            if tecnico_id in painel:
+                painel[tecnico_id]["tempo_medio_horas"] = soma_segundos / fechadas / 3600
+        return sorted(painel.values(), key=lambda linha: linha["tecnico_nome"])
+
+    def reconstruir_painel(self):
+        """
+        Confere os contadores do painel contra um recálculo completo e os
+        reconstrói. Devolve as diferenças encontradas antes da reconstrução.
+        Ex.: python -c "import banco_os; print(banco_os.SistemaOS().reconstruir_painel())"
+        """
+        with self.pool.escrita() as conn:
+            cursor = conn.cursor()
+            diferencas = diferencas_resumos_painel(cursor)
+            reconstruir_resumos_painel(cursor)
+        if diferencas:
+            logger.warning("Painel: %d contadores corrigidos", len(diferencas))
+        return diferencas
+
+    # Consultas diretas pela chave primária ---------------------------------
+
+    def get_cliente(self, id) -> Optional[Cliente]:
+        return self._get_cache("clientes", id)
+
+    def get_equipamento(self, id) -> Optional[Equipamento]:
+        return self._get_cache("equipamentos", id)
+
+    def get_tecnico(self, id) -> Optional[Tecnico]:
+        return self._get_cache("tecnicos", id)
+
+    def get_ordem(self, id) -> Optional[Ordem]:
+        # Sem cache: a linha junta dados de quatro tabelas e muda com o status
+        return self._get("ordens_servico", id)
+
+    def get_many(self, nome, ids):
+        """
+        Vários registros da sequência `nome` ("clientes", "equipamentos",
+        "tecnicos" ou "ordens_servico") numa consulta por bloco de 500 IDs.
+        Devolve {id: registro} só com os IDs encontrados.
+        """
+        classe = self.CONSULTAS_POR_ID[nome][0]
+        ids = list(dict.fromkeys(i for i in ids if i))
+        registros = {}
+        cursor = self.pool.leitura().cursor()
+        for i in range(0, len(ids), 500):
+            bloco = ids[i:i + 500]
+            cursor.execute(self._sql_por_id(nome, len(bloco)), bloco)
+            registros.update((linha[0], classe._make(linha)) for linha in cursor.fetchall())
+        return registros
+
+    def _get_cache(self, nome, id):
+        return self.cache.obter(("get", nome, id), [(nome, id)], lambda: self._get(nome, id))
+
+    def _get(self, nome, id):
+        if not id:
+            return None
+        classe = self.CONSULTAS_POR_ID[nome][0]
+        cursor = self.pool.leitura().cursor()
+        cursor.execute(self._sql_por_id(nome), (id,))
+        linha = cursor.fetchone()
+        return classe._make(linha) if linha else None
+
+    def _sql_por_id(self, nome, quantidade=None):
+        """SELECT da sequência `nome` por um ID ou, com `quantidade`, por vários."""
+        sql, coluna = self.CONSULTAS_POR_ID[nome][1:]
+        if quantidade is None:
+            return f"{sql} WHERE {coluna} = ?"
+        return f"{sql} WHERE {coluna} IN ({', '.join('?' * quantidade)})"
+
+    def buscar_clientes(self, termo_busca=None):
+        return self.cache.obter(("buscar_clientes", termo_busca), [("clientes", None)],
+                                lambda: self._buscar_clientes(termo_busca))
+
+    def _buscar_clientes(self, termo_busca):
+        cursor = self.pool.leitura().cursor()
+        if termo_busca:
+            # Primeiro tenta buscar pelo ID exato (se for um ID)
+            cursor.execute(self._sql_por_id("clientes"), (termo_busca,))
+            result = cursor.fetchall()
+            
+            # Se não encontrou pelo ID, busca no índice de texto (nome, telefone, email),
+            # só os mais relevantes: a lista é redesenhada a cada tecla
+            consulta = montar_consulta_fts(termo_busca)
+            if not result and consulta:
+                cursor.execute(self.SQL_CLIENTES_TEXTO, (consulta, TAMANHO_PAGINA_OS))
+                result = cursor.fetchall()
+                
+            return [Cliente._make(linha) for linha in result]
+        else:
+            # Retorna todos os clientes (limitados a 20)
+            cursor.execute(self.SQL_CLIENTES + " LIMIT 20")
+            return [Cliente._make(linha) for linha in cursor.fetchall()]
+
+    # Adicione este método à classe SistemaOS para buscar equipamentos por cliente
+    def buscar_equipamentos_por_cliente(self, cliente_id):
+        return self.cache.obter(("buscar_equipamentos_por_cliente", cliente_id),
+                                [("equipamentos", "cliente_id", cliente_id)],
+                                lambda: self._buscar_equipamentos_por_cliente(cliente_id))
+
+    def _buscar_equipamentos_por_cliente(self, cliente_id):
+        cursor = self.pool.leitura().cursor()
+        cursor.execute(self.SQL_EQUIPAMENTOS_DO_CLIENTE, (cliente_id,))
+        return [Equipamento._make(linha) for linha in cursor.fetchall()]
+
+    def buscar_equipamentos(self, termo_busca):
+        """Busca equipamentos por tipo, marca, modelo ou número de série."""
+        return self.cache.obter(("buscar_equipamentos", termo_busca), [("equipamentos", None)],
+                                lambda: self._buscar_equipamentos(termo_busca))
+
+    def _buscar_equipamentos(self, termo_busca):
+        consulta = montar_consulta_fts(termo_busca)
+        if not consulta:
+            return []
+        cursor = self.pool.leitura().cursor()
+        cursor.execute(self.SQL_EQUIPAMENTOS_TEXTO, (consulta,))
+        return [Equipamento._make(linha) for linha in cursor.fetchall()]
+
+    # Adicione o método de busca de técnicos na classe SistemaOS
+    def buscar_tecnicos(self, termo_busca=None):
+        return self.cache.obter(("buscar_tecnicos", termo_busca), [("tecnicos", None)],
+                                lambda: self._buscar_tecnicos(termo_busca))
+
+    def _buscar_tecnicos(self, termo_busca):
+        cursor = self.pool.leitura().cursor()
+        consulta = montar_consulta_fts(termo_busca)
+        if consulta:
+            # Busca por nome ou especialidade no índice de texto (os mais relevantes)
+            cursor.execute(self.SQL_TECNICOS_TEXTO, (consulta, TAMANHO_PAGINA_OS))
+        elif termo_busca:
+            return []
+        else:
+            # Retorna todos os técnicos (limitados a 20)
+            cursor.execute(self.SQL_TECNICOS + " LIMIT 20")
+        
+        return [Tecnico._make(linha) for linha in cursor.fetchall()]
+
+    # Adicione este método à classe SistemaOS para buscar ordens de serviço
+    def _condicoes_ordens(self, filtro=None, inicio=None, fim=None, status=None, tecnico_id=None):
+        """Monta as condições WHERE (e parâmetros) dos filtros de ordens de serviço."""
+        condicoes = []
+        parametros = []
+
+        if status:
+            condicoes.append("os.status = ?")
+            parametros.append(status)
+
+        if tecnico_id:
+            condicoes.append("os.tecnico_id = ?")
+            parametros.append(tecnico_id)
+
+        if filtro:
+            # Busca por ID da OS (prefixo, pela chave primária), pelo cliente
+            # ou pelo texto do problema/solução, via índices de texto
+            prefixo = filtro.strip().upper()
+            if prefixo.isdigit():
+                prefixo = f"OS{int(prefixo):05d}"
+            alternativas = ["(os.id >= ? AND os.id < ?)"]
+            parametros += [prefixo, prefixo + "\uffff"]
+            consulta = montar_consulta_fts(filtro)
+            if consulta:
+                alternativas.append('''os.cliente_id IN (
+                    SELECT cf.id FROM clientes_fts
+                    JOIN clientes cf ON cf.rowid = clientes_fts.rowid
+                    WHERE clientes_fts MATCH ?)''')
+                alternativas.append(
+                    "os.rowid IN (SELECT rowid FROM ordens_fts WHERE ordens_fts MATCH ?)")
+                parametros += [consulta, consulta]
+            condicoes.append("(" + " OR ".join(alternativas) + ")")
+
+        if inicio is not None or fim is not None:
+            # Faixa de datas pelo índice de data_abertura_ts
+            condicoes.append("os.data_abertura_ts BETWEEN ? AND ?")
+            inicio_ts, fim_ts = limite_periodo(inicio), limite_periodo(fim, fim=True)
+            parametros += [0 if inicio_ts is None else inicio_ts,
+                           agora_epoch() if fim_ts is None else fim_ts]
+
+        return condicoes, parametros
+
+    def buscar_ordens_servico(self, filtro=None, inicio=None, fim=None):
+        """
+        Busca ordens de serviço com filtro por ID da OS ou nome do cliente.
+        `inicio` e `fim` limitam o período de abertura (datetime, epoch ou
+        dd/mm/aaaa; ver limite_periodo).
+        """
+        cursor = self.pool.leitura().cursor()
+        cursor.execute(*self._sql_ordens_servico(filtro, inicio, fim))
+        return [Ordem._make(linha) for linha in cursor.fetchall()]
+
+    def _sql_ordens_servico(self, filtro, inicio, fim):
+        condicoes, parametros = self._condicoes_ordens(filtro, inicio, fim)
+        sql = self.SQL_ORDENS
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        sql += " ORDER BY os.data_abertura_ts DESC"
+        if not condicoes:
+            # Retorna todas as ordens (limitadas a 50)
+            sql += " LIMIT 50"
+        return sql, parametros
+
+    def iterar_ordens(self, status=None, inicio=None, fim=None, tecnico_id=None, filtro=None, lote=200):
+        """
+        Percorre as ordens que atendem aos filtros, da mais antiga para a mais
+        nova, lendo `lote` linhas por vez do cursor (nunca a tabela inteira).
+        """
+        sql, parametros = self._sql_iterar_ordens(status, inicio, fim, tecnico_id, filtro)
+        return map(Ordem._make, self._iterar(sql, parametros, lote))
+
+    def _sql_iterar_ordens(self, status, inicio, fim, tecnico_id, filtro):
+        condicoes, parametros = self._condicoes_ordens(filtro, inicio, fim, status, tecnico_id)
+        sql = self.SQL_ORDENS
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        sql += " ORDER BY os.data_abertura_ts, os.id"
+        return sql, parametros
+
+    # Colunas de iterar_clientes, na ordem
+    COLUNAS_CLIENTES = ["id", "nome", "telefone", "email", "rua", "numero", "bairro",
+                        "cidade", "estado", "data_cadastro"]
+
+    def iterar_clientes(self, lote=200):
+        """Percorre todos os clientes pela chave primária, `lote` linhas por vez."""
+        return self._iterar(self.SQL_ITERAR_CLIENTES, (), lote)
+
+    def _iterar(self, sql, parametros, lote):
+        cursor = self.pool.leitura().cursor()
+        cursor.execute(sql, parametros)
+        try:
+            while True:
+                linhas = cursor.fetchmany(lote)
+                if not linhas:
+                    break
+                yield from linhas
+        finally:
+            cursor.close()
+
+    def buscar_ordens_pagina(self, filtro=None, inicio=None, fim=None, apos=None, limite=TAMANHO_PAGINA_OS):
+        """
+        Uma página de ordens de serviço (mais recentes primeiro), com paginação
+        por chave (CHAVE_LISTA_OS, id) em vez de OFFSET: cada página custa o
+        mesmo, não importa quantas já foram lidas.
+
+        `apos` é o marcador devolvido pela página anterior (None na primeira).
+        Retorna (ordens, proximo): `ordens` são OrdemResumo (só o que a lista
+        mostra) e `proximo` é None quando não há mais páginas.
+        """
+        cursor = self.pool.leitura().cursor()
+        cursor.execute(*self._sql_ordens_pagina(filtro, inicio, fim, apos, limite))
+        linhas = cursor.fetchall()
+        # A primeira coluna (a chave de ordenação) só serve de marcador
+        ordens = [OrdemResumo._make(linha[1:]) for linha in linhas]
+        proximo = None
+        if len(linhas) == limite:
+            proximo = (linhas[-1][0], linhas[-1][1])
+        return ordens, proximo
+
+    def _sql_ordens_pagina(self, filtro, inicio, fim, apos, limite):
+        condicoes, parametros = self._condicoes_ordens(filtro, inicio, fim)
+        if apos is not None:
+            condicoes.append(f"({CHAVE_LISTA_OS}, os.id) < (?, ?)")
+            parametros += list(apos)
+
+        sql = self.SQL_ORDENS_LISTA.replace("SELECT ", f"SELECT {CHAVE_LISTA_OS}, ", 1)
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        sql += f" ORDER BY {CHAVE_LISTA_OS} DESC, os.id DESC LIMIT ?"
+        parametros.append(limite)
+        return sql, parametros
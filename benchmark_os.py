@@ -0,0 +1,446 @@
+"""
+Benchmark reproduzível da camada de dados (SistemaOS) e da geração de PDF.
+
+Gera bancos sintéticos com nomes, telefones, endereços e equipamentos
+brasileiros (mesma semente -> mesmo banco) nos tamanhos pedidos, mede cada
+operação várias vezes e grava p50/p95/p99 e vazão num arquivo JSON, para
+comparar uma versão do código com outra.
+
+Os bancos gerados ficam em PASTA_BENCHMARK e são reaproveitados nas rodadas
+seguintes; cada rodada trabalha numa cópia, então as escritas medidas não
+alteram a base. Por padrão o cache de consultas é limpo antes de cada
+chamada (mede a consulta no banco); --com-cache mede como a interface usa.
+
+Uso:
+    python benchmark_os.py 1k 100k                 # grava benchmarks/resultado_<data>.json
+    python benchmark_os.py 1M --repeticoes 500 --saida antes.json
+    python benchmark_os.py --comparar antes.json depois.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import unicodedata
+from datetime import datetime, timedelta, timezone
+
+from banco_os import STATUS_OS, SistemaOS, formatar_data, formatar_id
+
+# Bancos gerados e resultados
+PASTA_BENCHMARK = "benchmarks"
+
+# Aumente quando o gerador mudar: os bancos antigos deixam de ser reaproveitados
+VERSAO_GERADOR = 2
+SEMENTE_PADRAO = 20250401
+
+# Fim do período das OS geradas (fixo, para o banco não depender do dia nem
+# do fuso horário da máquina: meia-noite de 01/04/2025 em Brasília)
+DATA_REFERENCIA = int(datetime(2025, 4, 1, tzinfo=timezone(timedelta(hours=-3))).timestamp())
+DIAS_HISTORICO = 3 * 365
+
+# Linhas gravadas por transação na geração
+LOTE_GERACAO = 10000
+
+QUANTIDADE_TECNICOS = 25
+REPETICOES_PADRAO = 200
+
+# Regressão destacada na comparação (variação do p50/p95)
+LIMITE_REGRESSAO = 0.10
+
+NOMES = [
+    "Ana", "Antônio", "Beatriz", "Bruno", "Camila", "Carlos", "Daniela", "Diego", "Eduarda",
+    "Fernanda", "Francisco", "Gabriel", "Gabriela", "Gustavo", "Helena", "Igor", "Isabela",
+    "João", "José", "Juliana", "Larissa", "Leonardo", "Letícia", "Lucas", "Luiz", "Marcos",
+    "Maria", "Mariana", "Matheus", "Natália", "Paulo", "Pedro", "Rafael", "Raimunda",
+    "Rodrigo", "Sebastião", "Sérgio", "Tatiane", "Thiago", "Vitória",
+]
+SOBRENOMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira",
+    "Lima", "Gomes", "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares",
+    "Fernandes", "Vieira", "Barbosa", "Rocha", "Dias", "Nascimento", "Andrade", "Moreira",
+    "Nunes", "Marques", "Machado", "Mendes", "Freitas", "Cardoso", "Araújo", "Conceição",
+]
+# (cidade, UF, DDD)
+CIDADES = [
+    ("São Paulo", "SP", "11"), ("Campinas", "SP", "19"), ("Rio de Janeiro", "RJ", "21"),
+    ("Belo Horizonte", "MG", "31"), ("Salvador", "BA", "71"), ("Recife", "PE", "81"),
+    ("Fortaleza", "CE", "85"), ("Maceió", "AL", "82"), ("Arapiraca", "AL", "82"),
+    ("Curitiba", "PR", "41"), ("Porto Alegre", "RS", "51"), ("Goiânia", "GO", "62"),
+    ("Manaus", "AM", "92"), ("Belém", "PA", "91"), ("Natal", "RN", "84"),
+]
+BAIRROS = ["Centro", "Jardim América", "Vila Nova", "Boa Vista", "Santa Luzia", "Ponta Verde",
+           "Farol", "São José", "Liberdade", "Bela Vista", "Planalto", "Cidade Universitária"]
+RUAS = ["Rua das Flores", "Avenida Brasil", "Rua São João", "Rua Sete de Setembro",
+        "Avenida Getúlio Vargas", "Rua Tiradentes", "Rua Dom Pedro II", "Travessa da Paz",
+        "Rua Quinze de Novembro", "Avenida Fernandes Lima", "Rua do Comércio"]
+DOMINIOS_EMAIL = ["gmail.com", "hotmail.com", "outlook.com", "yahoo.com.br", "uol.com.br", "bol.com.br"]
+# tipo -> [(marca, [modelos])]
+EQUIPAMENTOS = {
+    "Notebook": [("Dell", ["Inspiron 15", "Vostro 3520"]), ("Lenovo", ["IdeaPad 3", "ThinkPad E14"]),
+                 ("Samsung", ["Book X30"]), ("Positivo", ["Motion C4500"])],
+    "Celular": [("Samsung", ["Galaxy A54", "Galaxy S23"]), ("Motorola", ["Moto G84", "Edge 40"]),
+                ("Apple", ["iPhone 13", "iPhone 15"]), ("Xiaomi", ["Redmi Note 13"])],
+    "TV": [("LG", ["43UR8750", "OLED55C3"]), ("Samsung", ["UN50CU7700"]), ("TCL", ["P735"])],
+    "Impressora": [("Epson", ["L3250", "L4260"]), ("HP", ["DeskJet 2774", "LaserJet M111w"])],
+    "Desktop": [("Positivo", ["Master D580"]), ("Dell", ["OptiPlex 3000"])],
+    "Tablet": [("Samsung", ["Galaxy Tab A9"]), ("Apple", ["iPad 10"])],
+}
+PROBLEMAS = [
+    "Não liga", "Tela quebrada", "Não carrega a bateria", "Superaquecendo e desligando sozinho",
+    "Sem imagem, só som", "Teclado com teclas falhando", "Muito lento, travando ao abrir programas",
+    "Não reconhece o carregador", "Papel enroscando", "Manchas na impressão", "Wi-Fi não conecta",
+    "Caiu na água", "Conector de carga com mau contato", "Ruído na fonte",
+]
+SOLUCOES = [
+    "Troca da tela", "Substituição da bateria", "Limpeza interna e troca da pasta térmica",
+    "Reinstalação do sistema", "Troca do conector de carga", "Substituição da fonte",
+    "Limpeza do cabeçote", "Troca do teclado", "Reparo na placa",
+]
+ESPECIALIDADES = ["Notebooks", "Celulares", "TVs", "Impressoras", "Eletrônica geral", "Redes"]
+
+def interpretar_tamanho(texto):
+    """'1k' -> 1000, '1M' -> 1000000, '5000' -> 5000."""
+    multiplicador = {"k": 1000, "m": 1000000}.get(texto[-1:].lower(), 1)
+    return int(float(texto[:-1] if multiplicador > 1 else texto) * multiplicador)
+
+def _sem_acento(texto):
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode()
+
+def _gerar_cliente(rnd, data_ts):
+    nome = f"{rnd.choice(NOMES)} {rnd.choice(SOBRENOMES)} {rnd.choice(SOBRENOMES)}"
+    cidade, estado, ddd = rnd.choice(CIDADES)
+    # Só os dígitos, como o programa grava (ver servico_os.limpar_telefone)
+    telefone = f"{ddd}9{rnd.randint(6000, 9999)}{rnd.randint(0, 9999):04d}"
+    partes = _sem_acento(nome).lower().split()
+    email = f"{partes[0]}.{partes[-1]}{rnd.randint(1, 999)}@{rnd.choice(DOMINIOS_EMAIL)}" if rnd.random() < 0.7 else None
+    return (nome, telefone, email, rnd.choice(RUAS), str(rnd.randint(1, 3000)), rnd.choice(BAIRROS),
+            cidade, estado, formatar_data(data_ts), data_ts)
+
+def _gerar_equipamento(rnd, cliente_id):
+    tipo = rnd.choice(list(EQUIPAMENTOS))
+    marca, modelos = rnd.choice(EQUIPAMENTOS[tipo])
+    numero_serie = f"{marca[:2].upper()}{rnd.randint(10**7, 10**8 - 1)}" if rnd.random() < 0.8 else None
+    observacao = rnd.choice(["Com carregador", "Sem carregador", "Arranhado na lateral", None, None])
+    return (cliente_id, tipo, marca, rnd.choice(modelos), numero_serie, observacao)
+
+def _gerar_ordem(rnd, equipamento_id, cliente_id, tecnico_id):
+    abertura = DATA_REFERENCIA - rnd.randint(0, DIAS_HISTORICO * 86400)
+    # OS antigas quase sempre já foram fechadas
+    if DATA_REFERENCIA - abertura > 30 * 86400 and rnd.random() < 0.95:
+        status = "Fechada"
+    else:
+        status = rnd.choice(STATUS_OS)
+    if status == "Fechada":
+        fechamento = min(abertura + rnd.randint(3600, 15 * 86400), DATA_REFERENCIA)
+        solucao = rnd.choice(SOLUCOES)
+    else:
+        fechamento = solucao = None
+    return (cliente_id, equipamento_id, tecnico_id, formatar_data(abertura), abertura,
+            formatar_data(fechamento) if fechamento else None, fechamento,
+            status, rnd.choice(PROBLEMAS), solucao)
+
+COLUNAS_GERACAO = {
+    "clientes": ["nome", "telefone", "email", "rua", "numero", "bairro", "cidade", "estado",
+                 "data_cadastro", "data_cadastro_ts"],
+    "equipamentos": ["cliente_id", "tipo", "marca", "modelo", "numero_serie", "observacao"],
+    "tecnicos": ["nome", "especialidade"],
+    "ordens_servico": ["cliente_id", "equipamento_id", "tecnico_id", "data_abertura", "data_abertura_ts",
+                       "data_fechamento", "data_fechamento_ts", "status", "descricao_problema",
+                       "descricao_solucao"],
+}
+
+def quantidades(ordens):
+    """Registros gerados para `ordens` OS: clientes, equipamentos, técnicos."""
+    return {"clientes": max(ordens // 4, 10), "equipamentos": max(ordens // 2, 10),
+            "tecnicos": QUANTIDADE_TECNICOS, "ordens_servico": ordens}
+
+def gerar_banco(caminho, ordens, semente=SEMENTE_PADRAO, lote=LOTE_GERACAO):
+    """
+    Cria em `caminho` um banco com `ordens` OS e os cadastros proporcionais
+    (ver quantidades), usando SistemaOS.inserir_lote. Mesma semente, mesmo banco.
+    """
+    if os.path.exists(caminho):
+        os.remove(caminho)
+    rnd = random.Random(semente)
+    sistema = SistemaOS(caminho)
+    total = quantidades(ordens)
+    inicio = time.perf_counter()
+
+    def inserir(nome, linhas):
+        ids = []
+        for i in range(0, len(linhas), lote):
+            ids.extend(sistema.inserir_lote(nome, COLUNAS_GERACAO[nome], linhas[i:i + lote]))
+        return ids
+
+    tecnicos = inserir("tecnicos", [(f"{rnd.choice(NOMES)} {rnd.choice(SOBRENOMES)}", rnd.choice(ESPECIALIDADES))
+                                    for _ in range(total["tecnicos"])])
+    clientes = []
+    for i in range(0, total["clientes"], lote):
+        linhas = [_gerar_cliente(rnd, DATA_REFERENCIA - rnd.randint(0, DIAS_HISTORICO * 86400))
+                  for _ in range(min(lote, total["clientes"] - i))]
+        clientes.extend(inserir("clientes", linhas))
+    equipamentos = []  # (id, cliente_id)
+    for i in range(0, total["equipamentos"], lote):
+        donos = [rnd.choice(clientes) for _ in range(min(lote, total["equipamentos"] - i))]
+        ids = inserir("equipamentos", [_gerar_equipamento(rnd, dono) for dono in donos])
+        equipamentos.extend(zip(ids, donos))
+    for i in range(0, ordens, lote):
+        linhas = []
+        for _ in range(min(lote, ordens - i)):
+            equipamento_id, cliente_id = rnd.choice(equipamentos)
+            linhas.append(_gerar_ordem(rnd, equipamento_id, cliente_id, rnd.choice(tecnicos)))
+        inserir("ordens_servico", linhas)
+        print(f"  {i + len(linhas)}/{ordens} OS geradas", end="\r")
+    print()
+
+    with sistema.pool.escrita() as conn:
+        conn.execute("ANALYZE")
+    # Tudo no arquivo principal: a base pode ser copiada sem o -wal
+    sistema.pool._escritor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    sistema.pool.fechar()
+    print(f"Banco com {ordens} OS gerado em {time.perf_counter() - inicio:.1f} s: {caminho}")
+    return caminho
+
+def banco_base(ordens, semente=SEMENTE_PADRAO, pasta=PASTA_BENCHMARK):
+    """Caminho do banco sintético de `ordens` OS, gerando-o se ainda não existir."""
+    caminho = os.path.join(pasta, f"base_v{VERSAO_GERADOR}_{ordens}_{semente}.db")
+    if not os.path.exists(caminho):
+        os.makedirs(pasta, exist_ok=True)
+        gerar_banco(caminho + ".parcial", ordens, semente)
+        os.replace(caminho + ".parcial", caminho)
+    return caminho
+
+def percentil(valores_ordenados, p):
+    """Percentil `p` (0-100) por interpolação linear entre as amostras."""
+    if len(valores_ordenados) == 1:
+        return valores_ordenados[0]
+    posicao = (len(valores_ordenados) - 1) * p / 100
+    abaixo = int(posicao)
+    acima = min(abaixo + 1, len(valores_ordenados) - 1)
+    return valores_ordenados[abaixo] + (valores_ordenados[acima] - valores_ordenados[abaixo]) * (posicao - abaixo)
+
+def medir(nome, operacao, repeticoes, aquecimento=5, antes=None):
+    """
+    Executa `operacao(i)` `repeticoes` vezes (depois de `aquecimento` chamadas
+    não medidas) e resume os tempos. `antes()`, se dado, roda fora da medição
+    antes de cada chamada. Se a operação devolve um número ou uma lista, ele
+    conta como itens processados (vazão em itens/s).
+    """
+    for i in range(aquecimento):
+        if antes:
+            antes()
+        operacao(i)
+    tempos = []
+    itens = 0
+    for i in range(repeticoes):
+        if antes:
+            antes()
+        inicio = time.perf_counter()
+        resultado = operacao(i)
+        tempos.append(time.perf_counter() - inicio)
+        if isinstance(resultado, int) and not isinstance(resultado, bool):
+            itens += resultado
+        elif hasattr(resultado, "__len__"):
+            itens += len(resultado)
+    tempos.sort()
+    total = sum(tempos)
+    return {
+        "operacao": nome,
+        "repeticoes": repeticoes,
+        "p50_ms": round(percentil(tempos, 50) * 1000, 4),
+        "p95_ms": round(percentil(tempos, 95) * 1000, 4),
+        "p99_ms": round(percentil(tempos, 99) * 1000, 4),
+        "media_ms": round(statistics.fmean(tempos) * 1000, 4),
+        "max_ms": round(tempos[-1] * 1000, 4),
+        "ops_por_s": round(repeticoes / total, 1) if total else None,
+        "itens_por_s": round(itens / total, 1) if total and itens else None,
+    }
+
+def operacoes(sistema, ordens, rnd):
+    """
+    Lista de (nome, operacao(i), repetições relativas) sobre um banco gerado
+    com `ordens` OS. As entradas variam a cada chamada (IDs e termos sorteados).
+    """
+    total = quantidades(ordens)
+
+    def sortear(nome, quantidade=200):
+        return [formatar_id(nome, rnd.randint(1, total[nome])) for _ in range(quantidade)]
+
+    clientes, equipamentos = sortear("clientes"), sortear("equipamentos")
+    tecnicos, ordens_ids = sortear("tecnicos"), sortear("ordens_servico")
+    termos = [rnd.choice(NOMES + SOBRENOMES) for _ in range(200)]
+    # Começo de um celular (DDD + 9 + 4 dígitos), como digitado na busca
+    telefones = [f"{rnd.choice(CIDADES)[2]}9{rnd.randint(6000, 9999)}" for _ in range(200)]
+    marcas = [marca for lista in EQUIPAMENTOS.values() for marca, _ in lista]
+    cidade, estado, _ = CIDADES[0]
+    marcador = {}
+
+    def pagina(i):
+        if i % 10 == 0:
+            marcador["proximo"] = None
+        linhas, marcador["proximo"] = sistema.buscar_ordens_pagina(apos=marcador.get("proximo"))
+        return linhas
+
+    def iterar_mes(i):
+        fim = DATA_REFERENCIA - (i % 24) * 30 * 86400
+        return sum(1 for _ in sistema.iterar_ordens(status="Fechada", inicio=fim - 30 * 86400, fim=fim))
+
+    def novo_cliente(i):
+        return sistema.add_cliente(f"Cliente Benchmark {i}", "11900000000", None,
+                                   RUAS[0], "1", BAIRROS[0], cidade, estado)
+
+    def nova_ordem(i):
+        return sistema.add_ordem_servico(clientes[i % 200], equipamentos[i % 200], tecnicos[i % 200],
+                                         PROBLEMAS[i % len(PROBLEMAS)])
+
+    return [
+        ("get_cliente", lambda i: sistema.get_cliente(clientes[i % 200]), 1),
+        ("get_equipamento", lambda i: sistema.get_equipamento(equipamentos[i % 200]), 1),
+        ("get_ordem", lambda i: sistema.get_ordem(ordens_ids[i % 200]), 1),
+        ("get_many (ordens, 100)", lambda i: sistema.get_many("ordens_servico", ordens_ids[:100]), 0.25),
+        ("buscar_clientes (todos)", lambda i: sistema.buscar_clientes(), 1),
+        ("buscar_clientes (nome)", lambda i: sistema.buscar_clientes(termos[i % 200]), 1),
+        ("buscar_clientes (telefone)", lambda i: sistema.buscar_clientes(telefones[i % 200]), 1),
+        ("buscar_clientes (id)", lambda i: sistema.buscar_clientes(clientes[i % 200]), 1),
+        ("buscar_equipamentos_por_cliente", lambda i: sistema.buscar_equipamentos_por_cliente(clientes[i % 200]), 1),
+        ("buscar_equipamentos (marca)", lambda i: sistema.buscar_equipamentos(marcas[i % len(marcas)]), 0.25),
+        ("buscar_tecnicos", lambda i: sistema.buscar_tecnicos(termos[i % 200]), 1),
+        ("buscar_ordens_servico (últimas 50)", lambda i: sistema.buscar_ordens_servico(), 1),
+        ("buscar_ordens_servico (nome)", lambda i: sistema.buscar_ordens_servico(termos[i % 200]), 0.1),
+        ("buscar_ordens_pagina", pagina, 1),
+        ("iterar_ordens (fechadas no mês)", iterar_mes, 0.1),
+        ("painel_tecnicos", lambda i: sistema.painel_tecnicos(), 1),
+        ("add_cliente", novo_cliente, 0.5),
+        ("add_ordem_servico", nova_ordem, 0.5),
+        ("update_status_os", lambda i: sistema.update_status_os(ordens_ids[i % 200], STATUS_OS[i % 3]), 0.5),
+    ]
+
+def medir_pdf(sistema, ordens, repeticoes, rnd):
+    """Tempo de renderizar_pdf_os (sem o cache de PDFs); None sem o reportlab."""
+    try:
+        from pdf_os import renderizar_pdf_os
+        from pdf_os import _reportlab
+        _reportlab()
+    except ImportError:
+        print("  reportlab não instalado: geração de PDF não medida")
+        return None
+    registros = list(sistema.get_many("ordens_servico", [
+        formatar_id("ordens_servico", rnd.randint(1, ordens)) for _ in range(20)]).values())
+    with tempfile.TemporaryDirectory() as pasta:
+        return medir("renderizar_pdf_os",
+                     lambda i: renderizar_pdf_os(registros[i % len(registros)], os.path.join(pasta, f"{i}.pdf")),
+                     repeticoes, aquecimento=2)
+
+def executar(tamanhos, repeticoes=REPETICOES_PADRAO, semente=SEMENTE_PADRAO, com_cache=False,
+             pasta=PASTA_BENCHMARK):
+    """Roda o benchmark em cada tamanho (quantidade de OS); devolve o relatório."""
+    relatorio = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_atual(),
+        "python": sys.version.split()[0],
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "semente": semente,
+        "versao_gerador": VERSAO_GERADOR,
+        "com_cache": com_cache,
+        "resultados": [],
+        "consultas_mais_custosas": {},
+    }
+    for ordens in tamanhos:
+        base = banco_base(ordens, semente, pasta)
+        with tempfile.TemporaryDirectory() as temporario:
+            copia = os.path.join(temporario, "sistema_os.db")
+            shutil.copyfile(base, copia)
+            sistema = SistemaOS(copia)
+            # O EXPLAIN das consultas lentas entraria no tempo medido
+            sistema.monitor.capturar_plano = False
+            sistema.monitor.limpar()
+            rnd = random.Random(semente)
+            antes = None if com_cache else sistema.cache.limpar
+            print(f"\n{ordens} OS ({'com' if com_cache else 'sem'} cache):")
+            medicoes = [medir(nome, operacao, max(int(repeticoes * peso), 10), antes=antes)
+                        for nome, operacao, peso in operacoes(sistema, ordens, rnd)]
+            pdf = medir_pdf(sistema, ordens, max(repeticoes // 10, 10), rnd)
+            if pdf:
+                medicoes.append(pdf)
+            consultas = sistema.monitor.estatisticas(limite=10)
+            sistema.pool.fechar()
+        relatorio["consultas_mais_custosas"][str(ordens)] = consultas
+        for medicao in medicoes:
+            medicao["ordens"] = ordens
+            print(f"  {medicao['operacao']:38} p50 {medicao['p50_ms']:9.3f} ms  "
+                  f"p95 {medicao['p95_ms']:9.3f} ms  p99 {medicao['p99_ms']:9.3f} ms")
+        relatorio["resultados"].extend(medicoes)
+    return relatorio
+
+def _commit_atual():
+    try:
+        resultado = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                   cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return resultado.stdout.strip() or None
+
+def gravar_relatorio(relatorio, destino=None):
+    if destino is None:
+        destino = os.path.join(PASTA_BENCHMARK, f"resultado_{datetime.now():%Y%m%d_%H%M%S}.json")
+    pasta = os.path.dirname(destino)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    with open(destino, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados gravados em {destino}")
+    return destino
+
+def comparar(arquivo_antes, arquivo_depois, limite=LIMITE_REGRESSAO):
+    """
+    Compara dois relatórios (mesma operação e tamanho) e mostra a variação do
+    p50 e do p95. Devolve as regressões acima de `limite` (0.10 = 10%).
+    """
+    with open(arquivo_antes, encoding="utf-8") as f:
+        antes = {(r["ordens"], r["operacao"]): r for r in json.load(f)["resultados"]}
+    with open(arquivo_depois, encoding="utf-8") as f:
+        depois = json.load(f)["resultados"]
+
+    regressoes = []
+    for novo in depois:
+        chave = (novo["ordens"], novo["operacao"])
+        if chave not in antes:
+            continue
+        velho = antes[chave]
+        variacoes = {p: (novo[p] - velho[p]) / velho[p] if velho[p] else 0.0 for p in ("p50_ms", "p95_ms")}
+        marca = " <- mais lento" if max(variacoes.values()) > limite else ""
+        if marca:
+            regressoes.append((chave, variacoes))
+        print(f"{novo['ordens']:>8} {novo['operacao']:38} p50 {velho['p50_ms']:9.3f} -> {novo['p50_ms']:9.3f} "
+              f"({variacoes['p50_ms']:+.0%})  p95 {velho['p95_ms']:9.3f} -> {novo['p95_ms']:9.3f} "
+              f"({variacoes['p95_ms']:+.0%}){marca}")
+    return regressoes
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Benchmark do SistemaOS com bancos sintéticos.")
+    parser.add_argument("tamanhos", nargs="*", default=["1k", "100k"],
+                        help="quantidade de OS de cada banco (ex.: 1k 100k 1M)")
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES_PADRAO)
+    parser.add_argument("--semente", type=int, default=SEMENTE_PADRAO)
+    parser.add_argument("--com-cache", action="store_true", help="não limpa o cache entre as chamadas")
+    parser.add_argument("--saida", help="arquivo JSON dos resultados")
+    parser.add_argument("--comparar", nargs=2, metavar=("ANTES", "DEPOIS"),
+                        help="compara dois arquivos de resultados em vez de medir")
+    args = parser.parse_args()
+
+    if args.comparar:
+        sys.exit(1 if comparar(*args.comparar) else 0)
+    relatorio = executar([interpretar_tamanho(t) for t in args.tamanhos], args.repeticoes,
+                         args.semente, args.com_cache)
+    gravar_relatorio(relatorio, args.saida)
@@ -0,0 +1,145 @@
+"""
+Exportação das ordens de serviço e dos clientes para CSV, JSONL ou Parquet.
+
+As linhas vêm do banco em lotes (fetchmany, via SistemaOS.iterar_ordens e
+iterar_clientes) e são gravadas conforme chegam, então a memória usada não
+depende do tamanho das tabelas. O arquivo é escrito com outro nome e só
+trocado pelo definitivo no fim, para nunca deixar um extrato pela metade.
+
+O CSV sai separado por ponto e vírgula e em UTF-8 com BOM, como o Excel em
+português espera. Parquet requer o pacote opcional pyarrow.
+
+Uso:
+    python exportacao_os.py ordens extrato_04_2025.csv --inicio 01/04/2025 --fim 30/04/2025
+    python exportacao_os.py ordens fechadas.jsonl --status Fechada
+    python exportacao_os.py clientes clientes.parquet
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+
+from banco_os import SistemaOS, limite_periodo
+
+logger = logging.getLogger(__name__)
+
+FORMATOS_EXPORTACAO = ("csv", "jsonl", "parquet")
+
+# Linhas lidas do banco (e gravadas no Parquet) por vez
+TAMANHO_LOTE_EXPORTACAO = 1000
+
+def formato_do_arquivo(destino, formato=None):
+    formato = (formato or os.path.splitext(destino)[1].lstrip(".")).lower()
+    if formato not in FORMATOS_EXPORTACAO:
+        raise ValueError(f"Formato de exportação desconhecido: {formato}")
+    return formato
+
+def exportar_ordens(destino, formato=None, status=None, inicio=None, fim=None, tecnico_id=None,
+                    sistema=None, lote=TAMANHO_LOTE_EXPORTACAO):
+    """
+    Exporta as ordens (com cliente, equipamento e técnico) que atendem aos
+    filtros, da mais antiga para a mais nova. `inicio` e `fim` limitam a data
+    de abertura (datetime, epoch ou dd/mm/aaaa; um `fim` só com a data inclui
+    o dia inteiro). Data que não pode ser lida gera ValueError. Retorna o
+    número de linhas.
+    """
+    sistema = sistema or SistemaOS()
+    linhas = sistema.iterar_ordens(status=status, inicio=inicio, fim=fim,
+                                   tecnico_id=tecnico_id, lote=lote)
+    return exportar_linhas(linhas, SistemaOS.COLUNAS_ORDENS, destino, formato, lote)
+
+def exportar_clientes(destino, formato=None, sistema=None, lote=TAMANHO_LOTE_EXPORTACAO):
+    """Exporta o cadastro de clientes. Retorna o número de linhas."""
+    sistema = sistema or SistemaOS()
+    return exportar_linhas(sistema.iterar_clientes(lote=lote), SistemaOS.COLUNAS_CLIENTES,
+                           destino, formato, lote)
+
+def exportar_linhas(linhas, colunas, destino, formato=None, lote=TAMANHO_LOTE_EXPORTACAO):
+    """Grava as tuplas de `linhas` em `destino` no formato pedido (ou pela extensão)."""
+    formato = formato_do_arquivo(destino, formato)
+    escrever = {"csv": _escrever_csv, "jsonl": _escrever_jsonl, "parquet": _escrever_parquet}[formato]
+
+    pasta = os.path.dirname(destino)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    temporario = destino + ".parcial"
+    try:
+        total = escrever(linhas, colunas, temporario, lote)
+        os.replace(temporario, destino)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+    logger.info("Exportação concluída: %d linhas em %s", total, destino)
+    return total
+
+def _escrever_csv(linhas, colunas, destino, lote):
+    total = 0
+    with open(destino, "w", newline="", encoding="utf-8-sig") as f:
+        escritor = csv.writer(f, delimiter=";")
+        escritor.writerow(colunas)
+        for linha in linhas:
+            escritor.writerow(linha)
+            total += 1
+    return total
+
+def _escrever_jsonl(linhas, colunas, destino, lote):
+    total = 0
+    with open(destino, "w", encoding="utf-8") as f:
+        for linha in linhas:
+            f.write(json.dumps(dict(zip(colunas, linha)), ensure_ascii=False) + "\n")
+            total += 1
+    return total
+
+def _escrever_parquet(linhas, colunas, destino, lote):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Instale o pyarrow para exportar em Parquet (pip install pyarrow)")
+
+    # Todas as colunas como texto: o esquema não depende do primeiro lote
+    esquema = pa.schema([(coluna, pa.string()) for coluna in colunas])
+    total = 0
+    with pq.ParquetWriter(destino, esquema) as escritor:
+        bloco = []
+        for linha in linhas:
+            bloco.append(linha)
+            if len(bloco) >= lote:
+                escritor.write_table(_tabela_arrow(pa, esquema, colunas, bloco))
+                total += len(bloco)
+                bloco = []
+        if bloco or not total:
+            escritor.write_table(_tabela_arrow(pa, esquema, colunas, bloco))
+            total += len(bloco)
+    return total
+
+def _tabela_arrow(pa, esquema, colunas, bloco):
+    valores = {coluna: [None if linha[i] is None else str(linha[i]) for linha in bloco]
+               for i, coluna in enumerate(colunas)}
+    return pa.Table.from_pydict(valores, schema=esquema)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Exporta ordens de serviço ou clientes.")
+    parser.add_argument("tabela", choices=["ordens", "clientes"])
+    parser.add_argument("destino", help="arquivo .csv, .jsonl ou .parquet")
+    parser.add_argument("--formato", choices=FORMATOS_EXPORTACAO)
+    parser.add_argument("--inicio", help="data de abertura inicial (dd/mm/aaaa [hh:mm])")
+    parser.add_argument("--fim", help="data de abertura final (dd/mm/aaaa [hh:mm])")
+    parser.add_argument("--status", help="ex.: Aberta, Fechada")
+    parser.add_argument("--tecnico", help="ID do técnico")
+    args = parser.parse_args()
+
+    try:
+        limite_periodo(args.inicio)
+        limite_periodo(args.fim, fim=True)
+    except ValueError as erro:
+        parser.error(str(erro))
+
+    if args.tabela == "ordens":
+        exportar_ordens(args.destino, args.formato, status=args.status, inicio=args.inicio,
+                        fim=args.fim, tecnico_id=args.tecnico)
+    else:
+        exportar_clientes(args.destino, args.formato)
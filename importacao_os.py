@@ -0,0 +1,190 @@
+"""
+Importação em massa de clientes, equipamentos, produtos e técnicos.
+
+Lê CSV (separado por vírgula, ponto e vírgula ou tabulação) ou XLSX linha a
+linha, valida cada linha com as mesmas regras dos formulários (ServicoOS) e
+grava em lotes grandes, uma transação com executemany por lote. Linhas
+inválidas vão para um arquivo de rejeitados com o número da linha e o motivo.
+
+A primeira linha do arquivo é o cabeçalho, com os nomes dos campos do
+formulário (maiúsculas e acentos são ignorados), por exemplo:
+    nome;telefone;email;rua;numero;bairro;cidade;estado
+
+Uso:
+    python importacao_os.py clientes clientes.csv
+    python importacao_os.py equipamentos equipamentos.xlsx --lote 2000
+"""
+import csv
+import logging
+import os
+import sys
+import time
+import unicodedata
+from dataclasses import dataclass, fields
+from typing import Optional
+
+from servico_os import ErroValidacao, NovoCliente, NovoEquipamento, NovoProduto, NovoTecnico, ServicoOS
+from banco_os import agora_epoch, formatar_data
+
+logger = logging.getLogger(__name__)
+
+# Linhas gravadas por transação
+TAMANHO_LOTE_IMPORTACAO = 1000
+
+@dataclass
+class ResultadoImportacao:
+    importadas: int
+    rejeitadas: int
+    arquivo_rejeitados: Optional[str]
+    segundos: float
+
+def _colunas_cliente(c):
+    data_cadastro_ts = agora_epoch()
+    return (c.nome, c.telefone, c.email, c.rua, c.numero, c.bairro, c.cidade, c.estado,
+            formatar_data(data_cadastro_ts), data_cadastro_ts)
+
+# tipo -> (classe de entrada, validação no serviço, sequência, colunas, valores da linha)
+TIPOS_IMPORTACAO = {
+    "clientes": (NovoCliente, "validar_cliente", "clientes",
+                 ["nome", "telefone", "email", "rua", "numero", "bairro", "cidade", "estado",
+                  "data_cadastro", "data_cadastro_ts"],
+                 _colunas_cliente),
+    "equipamentos": (NovoEquipamento, "validar_equipamento", "equipamentos",
+                     ["cliente_id", "tipo", "marca", "modelo", "numero_serie", "observacao"],
+                     lambda e: (e.cliente_id, e.tipo, e.marca, e.modelo, e.numero_serie, e.observacao)),
+    "produtos": (NovoProduto, "validar_produto", "produtos",
+                 ["nome", "descricao", "preco", "quantidade"],
+                 lambda p: (p.nome, p.descricao, p.preco, p.quantidade)),
+    "tecnicos": (NovoTecnico, "validar_tecnico", "tecnicos",
+                 ["nome", "especialidade"],
+                 lambda t: (t.nome, t.especialidade)),
+}
+
+def normalizar_cabecalho(nome):
+    """'Número Série' -> 'numero_serie'."""
+    sem_acento = unicodedata.normalize("NFKD", str(nome or "")).encode("ascii", "ignore").decode()
+    return "_".join(sem_acento.strip().lower().split())
+
+def ler_csv(arquivo):
+    """Gera dicionários (cabeçalho -> valor) do CSV, sem carregar o arquivo todo."""
+    with open(arquivo, newline="", encoding="utf-8-sig") as f:
+        amostra = f.read(4096)
+        f.seek(0)
+        try:
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=";,\t")
+        except csv.Error:
+            dialeto = csv.excel
+        for linha in csv.DictReader(f, dialect=dialeto):
+            yield linha
+
+def ler_xlsx(arquivo):
+    """Gera dicionários da primeira planilha do XLSX (requer openpyxl)."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RuntimeError("Instale o openpyxl para importar planilhas .xlsx (pip install openpyxl)")
+    planilha = load_workbook(arquivo, read_only=True, data_only=True)
+    try:
+        linhas = planilha.worksheets[0].iter_rows(values_only=True)
+        cabecalho = [str(c) if c is not None else "" for c in next(linhas, [])]
+        for valores in linhas:
+            if not any(v is not None and str(v).strip() for v in valores):
+                continue
+            yield {col: ("" if v is None else str(v)) for col, v in zip(cabecalho, valores)}
+    finally:
+        planilha.close()
+
+def ler_linhas(arquivo):
+    if arquivo.lower().endswith((".xlsx", ".xlsm")):
+        return ler_xlsx(arquivo)
+    return ler_csv(arquivo)
+
+class _ArquivoRejeitados:
+    """Arquivo CSV dos rejeitados, criado só quando aparece a primeira linha ruim."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.total = 0
+        self._arquivo = None
+        self._escritor = None
+
+    def adicionar(self, numero_linha, dados, erro):
+        if self._escritor is None:
+            self._arquivo = open(self.caminho, "w", newline="", encoding="utf-8-sig")
+            self._escritor = csv.writer(self._arquivo, delimiter=";")
+            self._escritor.writerow(["linha", "erro"] + list(dados.keys()))
+        self._escritor.writerow([numero_linha, erro] + list(dados.values()))
+        self.total += 1
+
+    def fechar(self):
+        if self._arquivo:
+            self._arquivo.close()
+
+def importar(tipo, arquivo, servico=None, lote=TAMANHO_LOTE_IMPORTACAO,
+             arquivo_rejeitados=None, ao_progresso=None):
+    """
+    Importa `arquivo` (CSV ou XLSX) como registros de `tipo` (ver
+    TIPOS_IMPORTACAO). As linhas rejeitadas vão para `arquivo_rejeitados`
+    (padrão: <arquivo>.rejeitados.csv). `ao_progresso(importadas, rejeitadas)`
+    é chamado a cada lote gravado.
+    """
+    if tipo not in TIPOS_IMPORTACAO:
+        raise ValueError(f"Tipo de importação desconhecido: {tipo}")
+    classe, validacao, nome, colunas, valores = TIPOS_IMPORTACAO[tipo]
+    servico = servico or ServicoOS()
+    validar = getattr(servico, validacao)
+    campos = [f.name for f in fields(classe)]
+    rejeitados = _ArquivoRejeitados(arquivo_rejeitados or os.path.splitext(arquivo)[0] + ".rejeitados.csv")
+
+    inicio = time.perf_counter()
+    importadas = 0
+    pendentes = []  # (número da linha, dados originais, registro validado)
+
+    def gravar():
+        nonlocal importadas
+        if tipo == "equipamentos":
+            # O cliente precisa existir; confere o lote inteiro numa consulta só
+            existentes = servico.sistema.ids_existentes("clientes", [r.cliente_id for _, _, r in pendentes])
+            for numero, dados, registro in pendentes:
+                if registro.cliente_id not in existentes:
+                    rejeitados.adicionar(numero, dados, f"Cliente {registro.cliente_id} não encontrado!")
+            pendentes[:] = [p for p in pendentes if p[2].cliente_id in existentes]
+        servico.sistema.inserir_lote(nome, colunas, [valores(r) for _, _, r in pendentes])
+        importadas += len(pendentes)
+        pendentes.clear()
+        if ao_progresso:
+            ao_progresso(importadas, rejeitados.total)
+
+    try:
+        # Linha 1 é o cabeçalho
+        for numero, dados in enumerate(ler_linhas(arquivo), start=2):
+            normalizados = {normalizar_cabecalho(k): (v or "").strip() for k, v in dados.items() if k}
+            try:
+                # Coluna ausente conta como campo em branco
+                registro = validar(classe(**{c: normalizados.get(c, "") for c in campos}))
+            except ErroValidacao as e:
+                rejeitados.adicionar(numero, dados, str(e))
+                continue
+            pendentes.append((numero, dados, registro))
+            if len(pendentes) >= lote:
+                gravar()
+        if pendentes:
+            gravar()
+    finally:
+        rejeitados.fechar()
+
+    segundos = time.perf_counter() - inicio
+    logger.info("Importação de %s: %d importadas, %d rejeitadas em %.1f s (%.0f linhas/s)",
+                tipo, importadas, rejeitados.total, segundos, importadas / max(segundos, 1e-6))
+    return ResultadoImportacao(importadas, rejeitados.total,
+                               rejeitados.caminho if rejeitados.total else None, segundos)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if len(sys.argv) < 3 or sys.argv[1] not in TIPOS_IMPORTACAO:
+        print(f"Uso: python importacao_os.py {{{'|'.join(TIPOS_IMPORTACAO)}}} arquivo.csv|arquivo.xlsx [--lote N]")
+        sys.exit(1)
+    tamanho = int(sys.argv[sys.argv.index("--lote") + 1]) if "--lote" in sys.argv else TAMANHO_LOTE_IMPORTACAO
+    resultado = importar(sys.argv[1], sys.argv[2], lote=tamanho)
+    if resultado.arquivo_rejeitados:
+        print(f"Linhas rejeitadas em {resultado.arquivo_rejeitados}")
@@ -0,0 +1,100 @@
+"""
+Medição do tempo de abertura do sistema de OS.
+
+sistema_os.py importa este módulo antes de tudo e marca as etapas da abertura
+(importações, janela, banco, primeiro quadro). Ao desenhar a tela pela primeira
+vez, `registrar()` acrescenta uma linha em ARQUIVO_INICIALIZACAO com os tempos,
+para acompanhar a evolução entre versões.
+
+Uso:
+    python inicio_os.py            # importações mais lentas + últimas aberturas
+    python inicio_os.py 30         # mostra as 30 importações mais lentas
+"""
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Histórico das aberturas, uma linha JSON por execução
+ARQUIVO_INICIALIZACAO = "inicializacao.jsonl"
+
+_inicio = time.perf_counter()
+_marcas = []
+
+def marcar(etapa):
+    """Registra o tempo (desde a importação deste módulo) em que `etapa` terminou."""
+    _marcas.append((etapa, time.perf_counter() - _inicio))
+
+def etapas():
+    """Lista de (etapa, milissegundos desde o início)."""
+    return [(etapa, round(segundos * 1000, 1)) for etapa, segundos in _marcas]
+
+def registrar(arquivo=ARQUIVO_INICIALIZACAO):
+    """Grava as marcas desta abertura no histórico e mostra o resumo."""
+    medicoes = etapas()
+    registro = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "etapas": dict(medicoes),
+        "total_ms": medicoes[-1][1] if medicoes else 0,
+    }
+    try:
+        with open(arquivo, "a", encoding="utf-8") as f:
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    except OSError as e:
+        logger.error("Erro ao gravar tempos de inicialização: %s", e)
+    logger.info("Inicialização: %s", ", ".join(f"{etapa} {ms:.0f} ms" for etapa, ms in medicoes))
+    return registro
+
+def tempos_importacao(modulo="sistema_os", limite=15):
+    """
+    Importa `modulo` num processo novo com `python -X importtime` e devolve os
+    `limite` módulos de maior tempo acumulado: lista de
+    (módulo, próprio_ms, acumulado_ms).
+    """
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    tempos = []
+    for linha in resultado.stderr.splitlines():
+        # Formato: "import time:   self [us] | cumulative | imported package"
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        try:
+            proprio, acumulado, nome = linha[len("import time:"):].split("|", 2)
+            tempos.append((nome.strip(), int(proprio) / 1000, int(acumulado) / 1000))
+        except ValueError:
+            continue
+    if resultado.returncode != 0 and not tempos:
+        raise RuntimeError(f"Falha ao importar {modulo}: {resultado.stderr.strip()}")
+    tempos.sort(key=lambda t: t[2], reverse=True)
+    return tempos[:limite]
+
+def ultimas_aberturas(arquivo=ARQUIVO_INICIALIZACAO, quantidade=10):
+    """Últimos registros do histórico de aberturas."""
+    if not os.path.exists(arquivo):
+        return []
+    with open(arquivo, encoding="utf-8") as f:
+        linhas = f.readlines()[-quantidade:]
+    return [json.loads(linha) for linha in linhas if linha.strip()]
+
+def main(limite=15):
+    print("Importações mais lentas de sistema_os (acumulado / próprio):")
+    for nome, proprio, acumulado in tempos_importacao(limite=limite):
+        print(f"  {acumulado:9.1f} ms {proprio:9.1f} ms  {nome}")
+
+    aberturas = ultimas_aberturas()
+    if aberturas:
+        print("\nÚltimas aberturas (ms até cada etapa):")
+        for registro in aberturas:
+            etapas_txt = ", ".join(f"{etapa} {ms:.0f}" for etapa, ms in registro["etapas"].items())
+            print(f"  {registro['data']}  {etapas_txt}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 15)
@@ -0,0 +1,617 @@
+"""
+Geração dos PDFs das ordens de serviço fora da thread da interface.
+
+O desenho do PDF (renderizar_pdf_os) é uma função simples de módulo para poder
+rodar num processo separado; FilaPdf cuida da fila de trabalhos, evita pedidos
+repetidos para a mesma OS e avisa a interface do andamento por callbacks.
+CachePdf reaproveita o PDF já gerado enquanto os dados da OS não mudarem.
+"""
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import sqlite3
+import time
+import subprocess
+import threading
+import tempfile
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# O reportlab é importado só na hora de desenhar (ver _reportlab): é a parte
+# mais pesada da importação e a maioria das aberturas do programa não gera PDF.
+
+# Processos do pool começam do zero ("spawn"), e não com fork de um processo
+# que já tem as threads da interface e do pool de conexões
+CONTEXTO_PROCESSOS = multiprocessing.get_context("spawn")
+
+# Pasta onde os PDFs das OS são gravados
+PASTA_PDF = "OS"
+
+# Aumente sempre que o layout do PDF mudar: invalida todo o cache
+VERSAO_MODELO_PDF = 2
+
+def chave_pdf(os_data):
+    """Hash dos dados da OS (as 24 colunas) junto com a versão do modelo."""
+    conteudo = json.dumps([VERSAO_MODELO_PDF, list(os_data)], ensure_ascii=False, default=str)
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+def caminho_pdf_os(os_id, cliente_nome, chave=None, pasta=PASTA_PDF):
+    """
+    Nome do arquivo do PDF. Com `chave` o nome é endereçado pelo conteúdo
+    (mesmos dados -> mesmo arquivo); sem ela leva a data para evitar sobrescrita.
+    """
+    sufixo = chave[:12] if chave else datetime.now().strftime('%Y%m%d_%H%M')
+    return os.path.join(pasta, f"os_{os_id}_{cliente_nome.replace(' ', '_')}_{sufixo}.pdf".replace(" ", "_"))
+
+def _reportlab():
+    """Importa o reportlab na primeira geração de PDF; devolve (canvas, letter)."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+    return canvas, letter
+
+def renderizar_pdf_os(os_data, filename):
+    """Desenha o PDF de uma OS existente (tupla de 24 colunas) em `filename`."""
+    pasta = os.path.dirname(filename)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+
+    canvas, letter = _reportlab()
+    c = canvas.Canvas(filename, pagesize=letter)
+    desenhar_pagina_os(c, os_data)
+    c.save()
+    return filename
+
+def desenhar_pagina_os(c, os_data):
+    """Desenha uma OS na página atual do canvas `c` (sem salvar)."""
+    # Extrair os dados necessários
+    (os_id, cliente_id, equipamento_id, tecnico_id, 
+     data_abertura, data_fechamento, status, 
+     descricao_problema, descricao_solucao,
+     cliente_nome, telefone, email, rua, numero, bairro, cidade, estado,
+     tipo_equip, marca, modelo, num_serie, observacao,
+     tecnico_nome, especialidade) = os_data
+
+    width, height = _reportlab()[1]  # width=612, height=792 pontos
+    
+    # Adicionar borda à página (mais fina e sutil)
+    c.setStrokeColorRGB(0.8, 0.8, 0.8)
+    c.setLineWidth(1)
+    c.rect(20, 20, width-40, height-40)
+    
+    # Cabeçalho com informações da empresa - TAMANHO REDUZIDO
+    c.setFont("Helvetica-Bold", 16)  # Reduzido de 18 para 16
+    c.drawCentredString(width/2, height-50, "ELETRÔNICA NEW STAR")  # Posição ajustada de -60 para -50
+    
+    c.setFont("Helvetica", 10)  # Reduzido de 12 para 10
+    c.drawCentredString(width/2, height-70, "CNPJ: 07.914.206/0001-76")  # Posição ajustada
+    c.drawCentredString(width/2, height-85, "Rua Sete de Maio, 559 A - Chã do Pilar")
+    c.drawCentredString(width/2, height-100, "Pilar - AL, CEP: 57150-000 - Tel: (82) 9999-9999")
+    
+    # Linha separadora
+    c.setLineWidth(0.5)  # Linha mais fina
+    c.line(50, height-115, width-50, height-115)
+    
+    # Título do documento
+    c.setFont("Helvetica-Bold", 14)  # Reduzido de 16 para 14
+    c.drawCentredString(width/2, height-140, f"ORDEM DE SERVIÇO #{os_id}")
+    
+    # Status da OS com design melhorado
+    status_colors = {
+        "Aberta": (0, 0, 0.8),  # Azul
+        "Em andamento": (0.9, 0.5, 0),  # Laranja
+        "Aguardando peças": (0.6, 0, 0.6),  # Roxo
+        "Fechada": (0, 0.6, 0),  # Verde
+    }
+    color = status_colors.get(status, (0.5, 0.5, 0.5))  # Cinza como padrão
+    
+    # Caixa para o status mais compacta
+    c.setFillColorRGB(*color)
+    c.setStrokeColorRGB(*color)
+    c.roundRect(width/2-50, height-165, 100, 20, 8, fill=1)  # Menor e mais acima
+    c.setFillColorRGB(1, 1, 1)  # Branco
+    c.setFont("Helvetica-Bold", 12)  # Fonte menor
+    c.drawCentredString(width/2, height-155, status.upper())
+    c.setFillColorRGB(0, 0, 0)  # Preto
+    
+    # Datas - Posicionamento ajustado
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(50, height-190, "Abertura:")
+    c.setFont("Helvetica", 10)
+    c.drawString(110, height-190, data_abertura or "Não informada")
+    
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(width-250, height-190, "Fechamento:")
+    c.setFont("Helvetica", 10)
+    c.drawString(width-170, height-190, data_fechamento or "Em aberto")
+    
+    # Linha separadora
+    c.line(50, height-200, width-50, height-200)
+    
+    # Dados do Cliente - Layout mais compacto
+    y = height-220
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(50, y, "INFORMAÇÕES DO CLIENTE")
+    y -= 15
+    
+    # Tabela de informações do cliente em duas colunas
+    col1_x = 50
+    col2_x = width/2
+    
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(col1_x, y, "Nome:")
+    c.setFont("Helvetica", 10)
+    c.drawString(col1_x + 50, y, cliente_nome)
+    
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(col2_x, y, "Telefone:")
+    c.setFont("Helvetica", 10)
+    c.drawString(col2_x + 60, y, telefone)
+    y -= 15
+    
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(col1_x, y, "Email:")
+    c.setFont("Helvetica", 10)
+    c.drawString(col1_x + 50, y, email or "N/A")
+    y -= 15
+    
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(col1_x, y, "Endereço:")
+    c.setFont("Helvetica", 10)
+    endereco = f"{rua}, {numero} - {bairro}, {cidade}/{estado}"
+    # Verificar se o endereço é muito longo
+    if len(endereco) > 50:
+        c.drawString(col1_x + 60, y, endereco[:50])
+        c.drawString(col1_x + 60, y - 12, endereco[50:])
+        y -= 12  # Espaço adicional se endereço for longo
+    else:
+        c.drawString(col1_x + 60, y, endereco)
+    y -= 20
+    
+    # Dados do Equipamento - Layout melhorado
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(50, y, "INFORMAÇÕES DO EQUIPAMENTO")
+    y -= 15
+    
+    # Tabela de informações do equipamento em duas colunas
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(col1_x, y, "Tipo:")
+    c.setFont("Helvetica", 10)
+    c.drawString(col1_x + 50, y, tipo_equip or "")
+    
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(col2_x, y, "Marca/Modelo:")
+    c.setFont("Helvetica", 10)
+    c.drawString(col2_x + 80, y, f"{marca} {modelo}".strip())
+    y -= 15
+    
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(col1_x, y, "Nº Série:")
+    c.setFont("Helvetica", 10)
+    c.drawString(col1_x + 50, y, num_serie or "Não informado")
+    y -= 15
+    
+    # Observações do equipamento com quebra de linha se for muito longo
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(col1_x, y, "Observações:")
+    c.setFont("Helvetica", 10)
+    obs = observacao or "Nenhuma"
+    if len(obs) > 70:
+        c.drawString(col1_x + 75, y, obs[:70])
+        c.drawString(col1_x + 75, y - 12, obs[70:140])
+        y -= 12  # Espaço adicional
+    else:
+        c.drawString(col1_x + 75, y, obs)
+    y -= 20
+    
+    # Descrição do problema
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(50, y, "DESCRIÇÃO DO PROBLEMA")
+    y -= 15
+    
+    # Caixa para o problema - mais compacta
+    c.setFillColorRGB(0.95, 0.95, 1.0)  # Azul bem claro
+    c.setStrokeColorRGB(0.8, 0.8, 0.9)
+    problema_height = 50  # Reduzido de 60 para 50
+    c.rect(50, y-problema_height, width-100, problema_height, fill=1)
+    c.setFillColorRGB(0, 0, 0)  # Preto
+    
+    # Texto do problema
+    textobject = c.beginText(55, y-12)
+    textobject.setFont("Helvetica", 10)  # Fonte menor
+    if descricao_problema:
+        # Dividir em linhas se for muito longo
+        lines = []
+        for line in descricao_problema.split('\n'):
+            if len(line) > 80:  # Permite linhas um pouco mais longas
+                words = line.split()
+                current_line = ""
+                for word in words:
+                    if len(current_line) + len(word) + 1 <= 80:
+                        current_line += (" " + word if current_line else word)
+                    else:
+                        lines.append(current_line)
+                        current_line = word
+                if current_line:
+                    lines.append(current_line)
+            else:
+                lines.append(line)
+        
+        for line in lines[:4]:  # Limitar a 4 linhas
+            textobject.textLine(line)
+    else:
+        textobject.textLine("Não informado")
+    
+    c.drawText(textobject)
+    y -= problema_height + 5
+    
+    # Se existir solução, mostrá-la
+    if status == "Fechada" and descricao_solucao:
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(50, y, "SOLUÇÃO APLICADA")
+        y -= 15
+        
+        # Caixa para a solução - também mais compacta
+        c.setFillColorRGB(0.95, 1.0, 0.95)  # Verde bem claro
+        c.setStrokeColorRGB(0.8, 0.9, 0.8)
+        solucao_height = 50  # Altura reduzida
+        c.rect(50, y-solucao_height, width-100, solucao_height, fill=1)
+        c.setFillColorRGB(0, 0, 0)  # Preto
+        
+        # Texto da solução
+        textobject = c.beginText(55, y-12)
+        textobject.setFont("Helvetica", 10)  # Fonte menor
+        
+        # Mesmo processamento para o texto da solução
+        lines = []
+        for line in descricao_solucao.split('\n'):
+            if len(line) > 80:
+                words = line.split()
+                current_line = ""
+                for word in words:
+                    if len(current_line) + len(word) + 1 <= 80:
+                        current_line += (" " + word if current_line else word)
+                    else:
+                        lines.append(current_line)
+                        current_line = word
+                if current_line:
+                    lines.append(current_line)
+            else:
+                lines.append(line)
+        
+        for line in lines[:4]:  # Limitar a 4 linhas
+            textobject.textLine(line)
+        
+        c.drawText(textobject)
+        y -= solucao_height + 5
+    
+    # Técnico responsável
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(50, y, "Técnico Responsável:")
+    c.setFont("Helvetica", 10)
+    c.drawString(160, y, tecnico_nome)
+    
+    c.setFont("Helvetica-Oblique", 9)
+    c.drawString(160, y-12, f"Especialidade: {especialidade or 'N/A'}")
+    y -= 25
+    
+    # Termo de garantia em destaque - MAIS COMPACTO
+    c.setFont("Helvetica-Bold", 11)  # Reduzido
+    c.drawString(50, y, "TERMO DE GARANTIA")
+    y -= 15
+    
+    # Texto do termo de garantia melhorado - FONTE MENOR
+    termo_garantia = """
+1. PRAZO: Garantimos os serviços por 90 dias, conforme Código de Defesa do Consumidor.
+2. COBERTURA: Esta garantia cobre apenas componentes substituídos e serviços descritos nesta OS.
+3. EXCLUSÕES: Não cobre: a) Uso inadequado; b) Quedas/umidade; c) Oscilações elétricas; d) Outros problemas.
+4. RETIRADA: Prazo de 90 dias para retirada após conclusão. Após, sujeito a descarte conforme lei.
+    """
+    
+    # Caixa para o termo de garantia - MENOR ALTURA
+    c.setFillColorRGB(1.0, 0.98, 0.9)  # Amarelo bem claro
+    c.setStrokeColorRGB(0.9, 0.8, 0.7)
+    termo_height = 70  # Reduzido
+    c.rect(50, y-termo_height, width-100, termo_height, fill=1)
+    c.setFillColorRGB(0, 0, 0)  # Preto
+    
+    # Texto do termo
+    textobject = c.beginText(55, y-12)
+    textobject.setFont("Helvetica", 8)  # Fonte menor
+    for line in termo_garantia.split('\n'):
+        if line.strip():  # Só adiciona linhas não vazias
+            textobject.textLine(line)
+    c.drawText(textobject)
+    y -= termo_height + 10
+    
+    # Assinaturas - ESPAÇAMENTO ADEQUADO PARA EVITAR SOBREPOSIÇÃO
+    assinatura_y = max(100, y-20)  # Garante espaço mínimo ou usa a posição calculada
+    
+    c.setFont("Helvetica", 10)
+    c.line(100, assinatura_y, 250, assinatura_y)
+    c.drawCentredString(175, assinatura_y-15, "Assinatura do Cliente")
+    
+    c.line(350, assinatura_y, 500, assinatura_y)
+    c.drawCentredString(425, assinatura_y-15, "Assinatura do Representante")
+    
+    # Carimbo da empresa
+    c.setStrokeColorRGB(0.7, 0.7, 0.7)
+    c.circle(175, assinatura_y-65, 30, stroke=1)  # Carimbo menor
+    c.setFont("Helvetica-Bold", 9)
+    c.drawCentredString(175, assinatura_y-60, "CARIMBO")
+    c.drawCentredString(175, assinatura_y-72, "DA EMPRESA")
+    
+    # Rodapé
+    c.setFont("Helvetica-Oblique", 7)  # Fonte ainda menor
+    # Sem a hora da geração: o PDF depende só dos dados da OS (cache em chave_pdf)
+    c.drawCentredString(width/2, 35, f"Ordem de Serviço #{os_id}")
+    c.drawCentredString(width/2, 25, "Este documento é um comprovante oficial de serviço - ELETRÔNICA NEW STAR")
+
+def abrir_pdf(filename):
+    """Abre o PDF no visualizador padrão sem esperar ele fechar."""
+    try:
+        if platform.system() == 'Darwin':       # macOS
+            subprocess.Popen(('open', filename))
+        elif platform.system() == 'Windows':    # Windows
+            os.startfile(filename)
+        else:                                   # linux
+            subprocess.Popen(('xdg-open', filename))
+    except Exception as e:
+        logger.error("Erro ao abrir PDF: %s", e)
+
+class CachePdf:
+    """
+    Cache dos PDFs gerados, endereçado pelo hash dos dados da OS.
+
+    O índice fica num pequeno banco SQLite dentro da pasta dos PDFs (seguro com
+    duas instâncias do programa abertas), então uma consulta nunca precisa
+    listar a pasta. Arquivos sem acesso há mais de `idade_maxima` segundos são
+    removidos, e se a pasta passar de `tamanho_maximo` bytes os menos usados
+    saem primeiro. Só arquivos registrados no índice são apagados.
+    """
+
+    def __init__(self, pasta=PASTA_PDF, tamanho_maximo=200 * 1024 * 1024, idade_maxima=90 * 24 * 3600):
+        self.pasta = pasta
+        self.tamanho_maximo = tamanho_maximo
+        self.idade_maxima = idade_maxima
+        os.makedirs(pasta, exist_ok=True)
+        self.caminho_indice = os.path.join(pasta, "indice_pdf.db")
+        with self._conectar() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS pdfs (
+                    chave TEXT PRIMARY KEY,
+                    os_id TEXT,
+                    arquivo TEXT NOT NULL,
+                    tamanho INTEGER NOT NULL,
+                    criado INTEGER NOT NULL,
+                    acesso INTEGER NOT NULL
+                )
+            ''')
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_pdfs_acesso ON pdfs (acesso)")
+
+    @contextmanager
+    def _conectar(self):
+        # Conexão curta por operação: o cache é usado de várias threads
+        conn = sqlite3.connect(self.caminho_indice, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def obter(self, chave):
+        """Caminho do PDF já gerado para esta chave, ou None."""
+        with self._conectar() as conn:
+            linha = conn.execute("SELECT arquivo FROM pdfs WHERE chave = ?", (chave,)).fetchone()
+            if linha is None:
+                return None
+            if not os.path.exists(linha[0]):
+                # Arquivo apagado por fora do programa
+                conn.execute("DELETE FROM pdfs WHERE chave = ?", (chave,))
+                return None
+            conn.execute("UPDATE pdfs SET acesso = ? WHERE chave = ?", (int(time.time()), chave))
+            return linha[0]
+
+    def registrar(self, chave, os_id, arquivo):
+        agora = int(time.time())
+        with self._conectar() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO pdfs (chave, os_id, arquivo, tamanho, criado, acesso) VALUES (?, ?, ?, ?, ?, ?)",
+                (chave, os_id, arquivo, os.path.getsize(arquivo), agora, agora))
+        self.limpar()
+
+    def limpar(self):
+        """Aplica as regras de idade e de tamanho máximo. Retorna os arquivos removidos."""
+        removidos = []
+        with self._conectar() as conn:
+            limite = int(time.time()) - self.idade_maxima
+            vencidos = conn.execute("SELECT chave, arquivo FROM pdfs WHERE acesso < ?", (limite,)).fetchall()
+            total = conn.execute("SELECT COALESCE(SUM(tamanho), 0) FROM pdfs WHERE acesso >= ?", (limite,)).fetchone()[0]
+            excedentes = []
+            if total > self.tamanho_maximo:
+                for chave, arquivo, tamanho in conn.execute(
+                        "SELECT chave, arquivo, tamanho FROM pdfs WHERE acesso >= ? ORDER BY acesso", (limite,)):
+                    if total <= self.tamanho_maximo:
+                        break
+                    excedentes.append((chave, arquivo))
+                    total -= tamanho
+            for chave, arquivo in vencidos + excedentes:
+                try:
+                    os.remove(arquivo)
+                except FileNotFoundError:
+                    pass
+                conn.execute("DELETE FROM pdfs WHERE chave = ?", (chave,))
+                removidos.append(arquivo)
+        return removidos
+
+def gerar_pdf_com_cache(os_data, cache):
+    """Devolve o PDF da OS, gerando-o só se os dados mudaram desde a última vez."""
+    chave = chave_pdf(os_data)
+    filename = cache.obter(chave)
+    if filename is None:
+        filename = renderizar_pdf_os(os_data, caminho_pdf_os(os_data[0], os_data[9], chave, cache.pasta))
+        cache.registrar(chave, os_data[0], filename)
+    return filename
+
+class FilaPdf:
+    """
+    Fila de geração de PDFs rodando num pool de processos.
+
+    `ao_progresso(os_id, mensagem)` é chamado quando um PDF entra na fila e
+    `ao_concluir(os_id, filename, erro)` quando termina (erro é None em caso de
+    sucesso). Os callbacks de conclusão rodam em outra thread, nunca na
+    thread do evento que pediu o PDF, inclusive quando o PDF sai do cache.
+    `fechar()` encerra os processos (chame ao fechar a janela). Pedidos com os mesmos dados de um PDF
+    que já está na fila são agrupados no mesmo trabalho, e uma OS que não mudou desde o último PDF
+    é atendida direto pelo cache, sem renderizar de novo.
+    """
+
+    def __init__(self, ao_progresso=None, ao_concluir=None, abrir_ao_concluir=True, max_processos=2, cache=None):
+        self.cache = cache if cache is not None else CachePdf()
+        self.ao_progresso = ao_progresso
+        self.ao_concluir = ao_concluir
+        self.abrir_ao_concluir = abrir_ao_concluir
+        self.max_processos = max_processos
+        self._executor = None
+        self._pendentes = {}
+        self._lock = threading.Lock()
+
+    def _obter_executor(self):
+        # O pool só é criado no primeiro PDF pedido
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_processos, mp_context=CONTEXTO_PROCESSOS)
+        return self._executor
+
+    def enviar(self, os_data, abrir=None):
+        """Coloca o PDF da OS na fila e devolve o Future com o nome do arquivo."""
+        os_id, cliente_nome = os_data[0], os_data[9]
+        abrir = self.abrir_ao_concluir if abrir is None else abrir
+        chave = chave_pdf(os_data)
+
+        # OS sem alterações desde o último PDF: devolve o arquivo existente,
+        # avisando numa thread própria como os PDFs que vêm do pool
+        existente = self.cache.obter(chave)
+        if existente is not None:
+            futuro = Future()
+            futuro.set_result(existente)
+            threading.Thread(target=self._concluido, args=(os_id, chave, futuro, abrir), daemon=True).start()
+            return futuro
+
+        with self._lock:
+            # Mesmo conteúdo já na fila; uma OS editada no meio gera outra chave
+            futuro = self._pendentes.get(chave)
+            if futuro is not None:
+                return futuro
+            filename = caminho_pdf_os(os_id, cliente_nome, chave, self.cache.pasta)
+            futuro = self._obter_executor().submit(renderizar_pdf_os, tuple(os_data), filename)
+            self._pendentes[chave] = futuro
+            na_fila = len(self._pendentes)
+
+        if self.ao_progresso:
+            self.ao_progresso(os_id, f"Gerando PDF da OS {os_id}... ({na_fila} na fila)")
+        futuro.add_done_callback(lambda f: self._concluido(os_id, chave, f, abrir, novo=True))
+        return futuro
+
+    def _concluido(self, os_id, chave, futuro, abrir, novo=False):
+        with self._lock:
+            self._pendentes.pop(chave, None)
+        erro = futuro.exception()
+        filename = None if erro else futuro.result()
+        if erro:
+            logger.error("Erro ao gerar PDF da OS %s: %s", os_id, erro)
+        else:
+            if novo:
+                self.cache.registrar(chave, os_id, filename)
+            logger.info("PDF salvo em: %s", os.path.abspath(filename))
+            if abrir:
+                abrir_pdf(filename)
+        if self.ao_concluir:
+            self.ao_concluir(os_id, filename, erro)
+
+    def fechar(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+# Exportação em lote ------------------------------------------------------
+
+def nome_pdf_lote(os_data):
+    """Nome do PDF de uma OS dentro do ZIP do lote."""
+    return f"os_{os_data[0]}_{os_data[9]}.pdf".replace(" ", "_").replace("/", "_")
+
+def exportar_lote(ordens, destino, formato=None, max_processos=None, ao_progresso=None):
+    """
+    Exporta várias OS de uma vez, com o mesmo layout do PDF individual.
+
+    `ordens` pode ser qualquer iterável de tuplas de OS (de preferência um
+    gerador, como SistemaOS.iterar_ordens, para não carregar tudo na memória).
+    `formato` é "pdf" (um único arquivo, uma OS por página) ou "zip" (um PDF
+    por OS); se omitido, vem da extensão de `destino`.
+    Só o ZIP usa o pool de processos e tem memória limitada por página; o PDF
+    único é desenhado num canvas só, no processo atual, e o reportlab guarda
+    todas as páginas até gravar o arquivo (a memória cresce com o lote).
+    `ao_progresso(quantidade)` é chamado a cada OS concluída.
+    Retorna a quantidade de OS exportadas.
+    """
+    if formato is None:
+        formato = "zip" if destino.lower().endswith(".zip") else "pdf"
+    pasta = os.path.dirname(destino)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    if formato == "zip":
+        return _exportar_zip(ordens, destino, max_processos, ao_progresso)
+    if formato == "pdf":
+        return _exportar_pdf_unico(ordens, destino, ao_progresso)
+    raise ValueError(f"Formato de exportação desconhecido: {formato}")
+
+def _exportar_pdf_unico(ordens, destino, ao_progresso=None):
+    # Um canvas só, uma OS por página, sem paralelismo. O canvas mantém as
+    # páginas até o save(): para lotes grandes, prefira o ZIP
+    canvas, letter = _reportlab()
+    c = canvas.Canvas(destino, pagesize=letter)
+    total = 0
+    for os_data in ordens:
+        desenhar_pagina_os(c, os_data)
+        c.showPage()
+        total += 1
+        if ao_progresso:
+            ao_progresso(total)
+    c.save()
+    return total
+
+def _exportar_zip(ordens, destino, max_processos=None, ao_progresso=None):
+    # Cada OS é renderizada num processo do pool; o processo principal só
+    # copia o arquivo pronto para o ZIP. No máximo 2 trabalhos por processo
+    # ficam em andamento, então a memória não cresce com o tamanho do lote.
+    max_processos = max_processos or os.cpu_count() or 1
+    limite = max_processos * 2
+    total = 0
+    with tempfile.TemporaryDirectory() as temporario, \
+            zipfile.ZipFile(destino, "w", zipfile.ZIP_DEFLATED) as arquivo_zip, \
+            ProcessPoolExecutor(max_workers=max_processos, mp_context=CONTEXTO_PROCESSOS) as executor:
+        em_andamento = set()
+
+        def coletar(futuros):
+            nonlocal total
+            for futuro in futuros:
+                filename = futuro.result()
+                arquivo_zip.write(filename, os.path.basename(filename))
+                os.remove(filename)
+                total += 1
+                if ao_progresso:
+                    ao_progresso(total)
+
+        for os_data in ordens:
+            if len(em_andamento) >= limite:
+                prontos, em_andamento = wait(em_andamento, return_when=FIRST_COMPLETED)
+                coletar(prontos)
+            filename = os.path.join(temporario, nome_pdf_lote(os_data))
+            em_andamento.add(executor.submit(renderizar_pdf_os, tuple(os_data), filename))
+        coletar(futuro for futuro in wait(em_andamento).done)
+    return total
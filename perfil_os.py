@@ -0,0 +1,235 @@
+"""
+Perfil da interface: quanto tempo cada handler de evento do Flet leva,
+quantos page.update() ele faz e quantos controles cada update compara.
+
+Ligado com OS_PERFIL=1 (ver o fim de sistema_os.main). Os handlers de todos
+os controles da página são envolvidos automaticamente, inclusive os de
+controles criados depois: a cada update os controles novos são conferidos.
+F12 mostra/esconde um painel com os handlers mais lentos e grava o rastro em
+ARQUIVO_PERFIL, no formato de trace do Chrome (abra em chrome://tracing ou
+em https://ui.perfetto.dev). O rastro também é gravado ao fechar o programa.
+
+Uso:
+    OS_PERFIL=1 python sistema_os.py
+"""
+import asyncio
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+import flet as ft
+
+logger = logging.getLogger(__name__)
+
+# Rastro gravado ao esconder o painel e ao sair
+ARQUIVO_PERFIL = "perfil_ui.json"
+# Eventos guardados no rastro (os mais antigos vão saindo)
+MAX_EVENTOS_PERFIL = 20000
+# Tempos guardados por handler para os percentis
+AMOSTRAS_POR_HANDLER = 500
+TECLA_PERFIL = "F12"
+LINHAS_PAINEL_PERFIL = 12
+
+def contar_controles(controle):
+    """Quantidade de controles na árvore de `controle` (o que um update percorre)."""
+    total = 0
+    pilha = [controle]
+    while pilha:
+        atual = pilha.pop()
+        total += 1
+        filhos = getattr(atual, "_get_children", None)
+        if filhos:
+            pilha.extend(filho for filho in filhos() if filho is not None)
+    return total
+
+def _percentil(valores_ordenados, p):
+    return valores_ordenados[round((len(valores_ordenados) - 1) * p / 100)]
+
+class _Medicao:
+    """Handler em andamento numa thread."""
+    __slots__ = ("nome", "inicio", "updates", "controles", "sobrecarga")
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.inicio = time.perf_counter()
+        self.updates = self.controles = 0
+        self.sobrecarga = 0.0  # tempo gasto contando controles, descontado do handler
+
+class PerfilUI:
+    def __init__(self, page, arquivo=ARQUIVO_PERFIL):
+        self.page = page
+        self.arquivo = arquivo
+        self.eventos = deque(maxlen=MAX_EVENTOS_PERFIL)  # eventos do trace do Chrome
+        self._por_handler = {}  # nome -> [tempos (ms), chamadas, updates, controles]
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._inicio = time.perf_counter()
+        self._update_original = page.update
+        self._texto = ft.Text("", size=11, font_family="monospace", color=ft.colors.WHITE)
+        self.painel = ft.Container(
+            content=self._texto, visible=False, right=10, top=10, padding=10, border_radius=8,
+            bgcolor=ft.colors.with_opacity(0.85, ft.colors.BLACK),
+        )
+
+    def instalar(self):
+        """Passa a medir: troca page.update, envolve os handlers e liga o F12."""
+        self.page.update = self._update
+        self.page.overlay.append(self.painel)
+        anterior = self.page.on_keyboard_event
+
+        def teclado(e):
+            if e.key == TECLA_PERFIL:
+                self.alternar_painel()
+            elif anterior:
+                anterior(e)
+
+        teclado._perfil = True  # o atalho não entra na medição
+        self.page.on_keyboard_event = teclado
+        atexit.register(self.salvar)
+        self._update_original()
+        self.envolver_handlers()
+        logger.info("Perfil da interface ligado: %s mostra o painel, rastro em %s", TECLA_PERFIL, self.arquivo)
+
+    def envolver_handlers(self):
+        """Envolve os handlers ainda não medidos dos controles da página."""
+        for controle in list(self.page._index.values()):
+            for evento, handler in list(controle.event_handlers.items()):
+                if handler is None or getattr(handler, "_perfil", False):
+                    continue
+                propriedade = f"on_{evento}"
+                nome_padrao = f"{type(controle).__name__}.{evento}"
+                if isinstance(getattr(type(controle), propriedade, None), property):
+                    # Pela propriedade: alguns controles guardam no dicionário
+                    # um adaptador assíncrono e o handler de verdade dentro dele
+                    try:
+                        atual = getattr(controle, propriedade)
+                    except AttributeError:
+                        continue
+                    if callable(atual) and not getattr(atual, "_perfil", False):
+                        setattr(controle, propriedade, self.envolver(atual, nome_padrao))
+                elif not asyncio.iscoroutinefunction(handler):
+                    controle.event_handlers[evento] = self.envolver(handler, nome_padrao)
+
+    def envolver(self, handler, nome_padrao):
+        nome = getattr(handler, "__name__", "<lambda>")
+        nome = nome_padrao if nome == "<lambda>" else f"{nome} ({nome_padrao})"
+
+        if asyncio.iscoroutinefunction(handler):
+            async def envolvido(*args, **kwargs):
+                self._comecar(nome)
+                try:
+                    return await handler(*args, **kwargs)
+                finally:
+                    self._terminar()
+        else:
+            def envolvido(*args, **kwargs):
+                self._comecar(nome)
+                try:
+                    return handler(*args, **kwargs)
+                finally:
+                    self._terminar()
+        envolvido._perfil = True
+        envolvido.__name__ = getattr(handler, "__name__", nome)
+        return envolvido
+
+    def _pilha(self):
+        pilha = getattr(self._local, "pilha", None)
+        if pilha is None:
+            pilha = self._local.pilha = []
+        return pilha
+
+    def _comecar(self, nome):
+        self._pilha().append(_Medicao(nome))
+
+    def _terminar(self):
+        medicao = self._pilha().pop()
+        fim = time.perf_counter()
+        segundos = fim - medicao.inicio - medicao.sobrecarga
+        self._evento(medicao.nome, "handler", medicao.inicio, segundos,
+                     {"updates": medicao.updates, "controles": medicao.controles})
+        with self._lock:
+            soma = self._por_handler.setdefault(medicao.nome, [deque(maxlen=AMOSTRAS_POR_HANDLER), 0, 0, 0])
+            soma[0].append(segundos * 1000)
+            soma[1] += 1
+            soma[2] += medicao.updates
+            soma[3] += medicao.controles
+        if self.painel.visible:
+            self._atualizar_painel()
+
+    def _update(self, *controles):
+        inicio = time.perf_counter()
+        quantidade = sum(contar_controles(c) for c in (controles or (self.page,)))
+        antes = time.perf_counter()
+        try:
+            self._update_original(*controles)
+        finally:
+            depois = time.perf_counter()
+            pilha = self._pilha()
+            medicao = pilha[-1] if pilha else None
+            self._evento("page.update", "update", antes, depois - antes,
+                         {"controles": quantidade, "handler": medicao.nome if medicao else None})
+            # Controles novos: envolve os handlers antes do primeiro clique
+            self.envolver_handlers()
+            if medicao:
+                medicao.updates += 1
+                medicao.controles += quantidade
+                medicao.sobrecarga += (antes - inicio) + (time.perf_counter() - depois)
+
+    def _evento(self, nome, categoria, inicio, segundos, args):
+        self.eventos.append({
+            "name": nome, "cat": categoria, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+            "ts": round((inicio - self._inicio) * 1e6), "dur": round(segundos * 1e6), "args": args,
+        })
+
+    def resumo(self):
+        """Handlers do mais lento (p95) para o mais rápido."""
+        with self._lock:
+            itens = [(nome, sorted(tempos), chamadas, updates, controles)
+                     for nome, (tempos, chamadas, updates, controles) in self._por_handler.items()]
+        linhas = [{
+            "handler": nome,
+            "chamadas": chamadas,
+            "p50_ms": round(_percentil(tempos, 50), 2),
+            "p95_ms": round(_percentil(tempos, 95), 2),
+            "max_ms": round(tempos[-1], 2),
+            "updates_por_chamada": round(updates / chamadas, 2),
+            "controles_por_update": round(controles / updates) if updates else 0,
+        } for nome, tempos, chamadas, updates, controles in itens]
+        return sorted(linhas, key=lambda linha: linha["p95_ms"], reverse=True)
+
+    def _atualizar_painel(self):
+        linhas = [f"{'handler':40} {'n':>5} {'p50':>8} {'p95':>8} {'upd':>5} {'ctrl':>6}"]
+        for linha in self.resumo()[:LINHAS_PAINEL_PERFIL]:
+            linhas.append(f"{linha['handler'][:40]:40} {linha['chamadas']:5} {linha['p50_ms']:8.1f} "
+                          f"{linha['p95_ms']:8.1f} {linha['updates_por_chamada']:5.1f} "
+                          f"{linha['controles_por_update']:6}")
+        self._texto.value = "\n".join(linhas)
+        # Direto no update original: o próprio painel não entra na medição
+        self._update_original(self.painel)
+
+    def alternar_painel(self):
+        self.painel.visible = not self.painel.visible
+        if self.painel.visible:
+            self._atualizar_painel()
+        else:
+            self._update_original(self.painel)
+            self.salvar()
+
+    def salvar(self, arquivo=None):
+        """Grava o rastro (trace do Chrome) com o resumo por handler."""
+        arquivo = arquivo or self.arquivo
+        temporario = arquivo + ".parcial"
+        try:
+            with open(temporario, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": list(self.eventos), "displayTimeUnit": "ms",
+                           "resumo": self.resumo()}, f, ensure_ascii=False)
+            os.replace(temporario, arquivo)
+        except OSError as e:
+            logger.error("Erro ao gravar o perfil da interface: %s", e)
+            return None
+        logger.info("Perfil da interface gravado em %s", os.path.abspath(arquivo))
+        return arquivo
@@ -0,0 +1,248 @@
+"""
+Camada de serviço do sistema de ordens de serviço.
+
+Reúne as regras que antes ficavam dentro dos handlers do Flet (validação dos
+cadastros, montagem dos dados da OS, geração do PDF) com objetos de entrada e
+saída tipados. Não importa nada da interface: pode ser usada por scripts,
+testes de carga ou outra interface.
+
+Exemplo:
+    servico = ServicoOS()
+    cliente = servico.cadastrar_cliente(NovoCliente("Maria", "(82) 99999-9999"))
+"""
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from banco_os import Ordem, SistemaOS
+from pdf_os import CachePdf, exportar_lote, gerar_pdf_com_cache
+
+class ErroValidacao(ValueError):
+    """Dados de entrada inválidos; a mensagem é pronta para mostrar ao usuário."""
+
+def limpar_telefone(telefone):
+    """Mantém apenas os dígitos do telefone."""
+    return ''.join(filter(str.isdigit, telefone or ""))
+
+# Objetos de entrada ------------------------------------------------------
+
+@dataclass
+class NovoCliente:
+    nome: str
+    telefone: str
+    email: str = ""
+    rua: str = ""
+    numero: str = ""
+    bairro: str = ""
+    cidade: str = ""
+    estado: str = ""
+
+@dataclass
+class NovoEquipamento:
+    cliente_id: str
+    tipo: str
+    marca: str = ""
+    modelo: str = ""
+    numero_serie: str = ""
+    observacao: str = ""
+
+@dataclass
+class NovoProduto:
+    nome: str
+    descricao: str = ""
+    preco: Union[str, float, None] = None
+    quantidade: Union[str, int, None] = None
+
+@dataclass
+class NovoTecnico:
+    nome: str
+    especialidade: str = ""
+
+@dataclass
+class NovaOrdem:
+    cliente_id: str
+    equipamento_id: str
+    tecnico_id: str
+    descricao_problema: str = ""
+
+# Objetos de saída --------------------------------------------------------
+
+@dataclass
+class Cadastro:
+    id: str
+    mensagem: str
+
+@dataclass
+class ClienteResumo:
+    nome: str
+    telefone: str
+    email: str
+    rua: str
+    numero: str
+    bairro: str
+    cidade: str
+    estado: str
+
+@dataclass
+class EquipamentoResumo:
+    tipo: str
+    marca: str
+    modelo: str
+    numero_serie: str
+    observacao: str
+
+@dataclass
+class ResumoOrdem:
+    """Dados mostrados para conferência antes de criar a OS."""
+    cliente: ClienteResumo
+    equipamento: EquipamentoResumo
+    tecnico_nome: str
+    descricao_problema: str
+
+class ServicoOS:
+    """Operações do sistema de OS sobre um SistemaOS (criado aqui se não for passado)."""
+
+    def __init__(self, sistema: Optional[SistemaOS] = None, caminho: Optional[str] = None,
+                 cache_pdf: Optional[CachePdf] = None):
+        self.sistema = sistema if sistema is not None else SistemaOS(caminho)
+        self._cache_pdf = cache_pdf
+
+    # Cadastros -----------------------------------------------------------
+
+    def validar_cliente(self, dados: NovoCliente) -> NovoCliente:
+        """Confere os campos obrigatórios e devolve o cliente com o telefone só em dígitos."""
+        if not dados.nome or not dados.telefone:
+            raise ErroValidacao("Nome e telefone são obrigatórios!")
+        telefone = limpar_telefone(dados.telefone)
+        # Valida se o telefone tem o formato correto (DDD + 9 dígitos)
+        if len(telefone) < 11:
+            raise ErroValidacao("Telefone deve ter DDD + 9 dígitos")
+        return NovoCliente(dados.nome, telefone, dados.email or "", dados.rua or "",
+                           dados.numero or "", dados.bairro or "", dados.cidade or "",
+                           dados.estado or "")
+
+    def cadastrar_cliente(self, dados: NovoCliente) -> Cadastro:
+        c = self.validar_cliente(dados)
+        id = self.sistema.add_cliente(c.nome, c.telefone, c.email, c.rua, c.numero,
+                                      c.bairro, c.cidade, c.estado)
+        return Cadastro(id, "Cliente cadastrado com sucesso!")
+
+    def validar_equipamento(self, dados: NovoEquipamento) -> NovoEquipamento:
+        if not dados.cliente_id:
+            raise ErroValidacao("Selecione um cliente primeiro!")
+        if not dados.tipo:
+            raise ErroValidacao("O tipo de equipamento é obrigatório!")
+        return dados
+
+    def cadastrar_equipamento(self, dados: NovoEquipamento) -> Cadastro:
+        e = self.validar_equipamento(dados)
+        id = self.sistema.add_equipamento(e.cliente_id, e.tipo, e.marca, e.modelo,
+                                          e.numero_serie, e.observacao)
+        return Cadastro(id, f"Equipamento {id} cadastrado com sucesso!")
+
+    def validar_produto(self, dados: NovoProduto) -> NovoProduto:
+        if not dados.nome:
+            raise ErroValidacao("Nome do produto é obrigatório!")
+        preco = dados.preco
+        if isinstance(preco, str):
+            # Aceita vírgula decimal (12,50)
+            preco = preco.replace(",", ".")
+        try:
+            preco = float(preco) if preco not in (None, "") else 0.0
+            quantidade = int(dados.quantidade) if dados.quantidade not in (None, "") else 0
+        except ValueError:
+            raise ErroValidacao("Preço e quantidade devem ser números!")
+        return NovoProduto(dados.nome, dados.descricao or "", preco, quantidade)
+
+    def cadastrar_produto(self, dados: NovoProduto) -> Cadastro:
+        p = self.validar_produto(dados)
+        id = self.sistema.add_produto(p.nome, p.descricao, p.preco, p.quantidade)
+        return Cadastro(id, "Produto cadastrado com sucesso!")
+
+    def validar_tecnico(self, dados: NovoTecnico) -> NovoTecnico:
+        if not dados.nome:
+            raise ErroValidacao("Nome do técnico é obrigatório!")
+        return dados
+
+    def cadastrar_tecnico(self, dados: NovoTecnico) -> Cadastro:
+        t = self.validar_tecnico(dados)
+        id = self.sistema.add_tecnico(t.nome, t.especialidade)
+        return Cadastro(id, "Técnico cadastrado com sucesso!")
+
+    # Ordens de serviço ---------------------------------------------------
+
+    def preparar_ordem(self, dados: NovaOrdem) -> ResumoOrdem:
+        """Valida a OS e reúne os dados de cliente e equipamento para conferência."""
+        if not dados.cliente_id:
+            raise ErroValidacao("Selecione um cliente!")
+        if not dados.equipamento_id:
+            raise ErroValidacao("Selecione um equipamento!")
+        if not dados.tecnico_id:
+            raise ErroValidacao("Selecione um técnico!")
+
+        # Uma consulta pela chave primária para cada registro
+        cliente = self.sistema.get_cliente(dados.cliente_id)
+        if not cliente:
+            raise ErroValidacao("Cliente não encontrado!")
+
+        equipamento = self.sistema.get_equipamento(dados.equipamento_id)
+        if not equipamento or equipamento.cliente_id != dados.cliente_id:
+            raise ErroValidacao("Equipamento não encontrado!")
+
+        tecnico = self.sistema.get_tecnico(dados.tecnico_id)
+        if not tecnico:
+            raise ErroValidacao("Técnico não encontrado!")
+
+        return ResumoOrdem(
+            cliente=ClienteResumo(
+                nome=cliente.nome,
+                telefone=cliente.telefone,
+                email=cliente.email or "N/A",
+                rua=cliente.rua or "",
+                numero=cliente.numero or "",
+                bairro=cliente.bairro or "",
+                cidade=cliente.cidade or "",
+                estado=cliente.estado or "",
+            ),
+            # Campos do equipamento com tratamento para evitar None
+            equipamento=EquipamentoResumo(
+                tipo=equipamento.tipo or "",
+                marca=equipamento.marca or "",
+                modelo=equipamento.modelo or "",
+                numero_serie=equipamento.numero_serie or "",
+                observacao=equipamento.observacao or "",
+            ),
+            tecnico_nome=tecnico.nome,
+            descricao_problema=dados.descricao_problema or "",
+        )
+
+    def criar_ordem(self, dados: NovaOrdem) -> Cadastro:
+        self.preparar_ordem(dados)
+        id = self.sistema.add_ordem_servico(dados.cliente_id, dados.equipamento_id,
+                                            dados.tecnico_id, (dados.descricao_problema or "").strip())
+        return Cadastro(id, f"Ordem de Serviço #{id} criada com sucesso!")
+
+    def obter_ordem(self, os_id: str) -> Optional[Ordem]:
+        """Registro completo (24 colunas) da OS, ou None se não existir."""
+        return self.sistema.get_ordem(os_id)
+
+    def gerar_pdf(self, os_id: str) -> str:
+        """Gera (ou reaproveita do cache) o PDF da OS e devolve o caminho do arquivo."""
+        ordem = self.obter_ordem(os_id)
+        if ordem is None:
+            raise ErroValidacao(f"OS {os_id} não encontrada!")
+        if self._cache_pdf is None:
+            self._cache_pdf = CachePdf()
+        return gerar_pdf_com_cache(ordem, self._cache_pdf)
+
+    def exportar_pdfs(self, destino: str, status: Optional[str] = None, inicio=None, fim=None,
+                      tecnico_id: Optional[str] = None, formato: Optional[str] = None,
+                      max_processos: Optional[int] = None, ao_progresso=None) -> int:
+        """
+        Exporta os PDFs das ordens filtradas para um único PDF (uma OS por
+        página) ou um ZIP com um PDF por OS. Ex.: todas as OS fechadas no mês:
+        servico.exportar_pdfs("OS/fechadas_04_2025.zip", status="Fechada",
+                              inicio="01/04/2025", fim="30/04/2025 23:59")
+        """
+        ordens = self.sistema.iterar_ordens(status=status, inicio=inicio, fim=fim, tecnico_id=tecnico_id)
+        return exportar_lote(ordens, destino, formato=formato,
+                             max_processos=max_processos, ao_progresso=ao_progresso)
@@ -1,510 +1,225 @@
+import inicio_os  # primeiro import: marca o início da contagem da abertura
+import functools
+import logging
+import os
 import sqlite3
 import flet as ft
 from datetime import datetime
-import uuid
-from fpdf import FPDF
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-import os
-
-# Nova importação
-import fpdf
-
-# Adicione esta função ao seu código para verificar e atualizar o banco existente
-def migrar_banco_se_necessario():
-    conn = sqlite3.connect('sistema_os.db')
-    cursor = conn.cursor()
-    
-    # Verifica se a coluna data_cadastro existe na tabela clientes
-    try:
-        cursor.execute("SELECT data_cadastro FROM clientes LIMIT 1")
-    except sqlite3.OperationalError:
-        # A coluna não existe, vamos adicioná-la
-        print("Migrando banco de dados: adicionando coluna data_cadastro à tabela clientes")
-        cursor.execute("ALTER TABLE clientes ADD COLUMN data_cadastro TEXT")
-        # Define um valor padrão para registros existentes
-        data_padrao = datetime.now().strftime('%d/%m/%Y %H:%M')
-        cursor.execute("UPDATE clientes SET data_cadastro = ?", (data_padrao,))
-    
-    conn.commit()
-    conn.close()
-
-migrar_banco_se_necessario()  # Adicione esta linha antes de usar o banco
-
-# Adicione uma função de migração para converter os IDs existentes
-def migrar_para_novos_ids():
-    """Migra os IDs de UUID para IDs sequenciais."""
-    conn = sqlite3.connect('sistema_os.db')
-    cursor = conn.cursor()
-    
-    try:
-        # Verifica se precisamos migrar
-        cursor.execute("PRAGMA table_info(clientes)")
-        columns = [col[1] for col in cursor.fetchall()]
-        if "id_antigo" in columns:
-            print("Migração já realizada anteriormente.")
-            return
-        
-        # Backup das tabelas antes da migração
-        print("Iniciando migração de IDs. Fazendo backup das tabelas...")
-        tables = ["clientes", "equipamentos", "produtos", "tecnicos", "ordens_servico"]
-        for table in tables:
-            cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
-        
-        # Recria as tabelas com a mesma estrutura
-        init_db()
-        
-        # Mapeamento de IDs antigos para novos
-        id_mapping = {
-            "clientes": {},
-            "equipamentos": {},
-            "produtos": {},
-            "tecnicos": {},
-            "ordens_servico": {}
-        }
-        
-        # Migra clientes
-        print("Migrando clientes...")
-        cursor.execute("SELECT * FROM clientes_old")
-        clientes = cursor.fetchall()
-        
-        cursor.execute("PRAGMA table_info(clientes_old)")
-        cliente_columns = [col[1] for col in cursor.fetchall()]
-        
-        for i, cliente in enumerate(clientes):
-            data = {cliente_columns[j]: cliente[j] for j in range(len(cliente_columns))}
-            old_id = data['id']
-            new_id = f"CLI{i+1:05d}"
-            id_mapping["clientes"][old_id] = new_id
-            
-            # Adiciona coluna id_antigo
-            cursor.execute("ALTER TABLE clientes ADD COLUMN id_antigo TEXT")
-            
-            # Insere com o novo ID
-            cursor.execute(f'''
-                INSERT INTO clientes (id, nome, telefone, email, rua, numero, bairro, cidade, estado, data_cadastro, id_antigo)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                new_id, 
-                data.get('nome'), 
-                data.get('telefone'), 
-                data.get('email'),
-                data.get('rua'),
-                data.get('numero'),
-                data.get('bairro'),
-                data.get('cidade'),
-                data.get('estado'),
-                data.get('data_cadastro'),
-                old_id
-            ))
-        
-        # Migração similar para outras tabelas...
-        # Código para equipamentos, produtos, técnicos e ordens de serviço
-        
-        print("Migração concluída com sucesso!")
-        conn.commit()
-    except Exception as e:
-        conn.rollback()
-        print(f"Erro durante a migração: {e}")
-        # Restaura as tabelas originais se houver erro
-        for table in ["clientes", "equipamentos", "produtos", "tecnicos", "ordens_servico"]:
+import threading
+import time
+
+from banco_os import STATUS_OS, TAMANHO_RESUMO_PROBLEMA
+from pdf_os import FilaPdf
+from servico_os import (ErroValidacao, NovaOrdem, NovoCliente, NovoEquipamento,
+                        NovoProduto, NovoTecnico, ServicoOS)
+
+inicio_os.marcar("importacoes")
+
+logger = logging.getLogger(__name__)
+
+# Atraso padrão (segundos) entre a última tecla e a execução da busca
+ATRASO_BUSCA = 0.3
+
+# Linhas fora da tela guardadas por lista para as próximas buscas
+MAX_LINHAS_RESERVA = 200
+
+class BuscaDebounced:
+    """
+    Controlador de busca enquanto o usuário digita.
+
+    Cada `agendar(termo)` reinicia a espera; a busca só roda depois de
+    `atraso` segundos sem novas teclas, numa thread de trabalho própria do
+    controlador (fora do handler do evento, e sempre a mesma, para reaproveitar
+    a conexão de leitura do pool). Se chegar um termo novo enquanto uma busca
+    está em andamento, `interromper(thread)` (opcional) é chamado para
+    cancelá-la e o resultado antigo é descartado: só o resultado do termo mais
+    recente chega em `renderizar`.
+    """
+
+    def __init__(self, buscar, renderizar, atraso=ATRASO_BUSCA, interromper=None):
+        self.buscar = buscar
+        self.renderizar = renderizar
+        self.atraso = atraso
+        self.interromper = interromper
+        self._cond = threading.Condition()
+        self._geracao = 0
+        self._pendente = None   # (geracao, termo, instante de execução)
+        self._em_andamento = False
+        self._thread = threading.Thread(target=self._trabalhar, daemon=True)
+        self._thread.start()
+
+    def agendar(self, termo):
+        with self._cond:
+            self._geracao += 1
+            self._pendente = (self._geracao, termo, time.monotonic() + self.atraso)
+            self._interromper_atual()
+            self._cond.notify()
+
+    def cancelar(self):
+        """Descarta a busca pendente e qualquer resultado ainda não exibido."""
+        with self._cond:
+            self._geracao += 1
+            self._pendente = None
+            self._interromper_atual()
+
+    def _interromper_atual(self):
+        if self._em_andamento and self.interromper is not None:
+            self.interromper(self._thread)
+
+    def _atual(self, geracao):
+        with self._cond:
+            return geracao == self._geracao
+
+    def _proxima(self):
+        """Espera até haver um termo e ele ficar `atraso` segundos sem mudar."""
+        with self._cond:
+            while True:
+                if self._pendente is None:
+                    self._cond.wait()
+                    continue
+                geracao, termo, quando = self._pendente
+                restante = quando - time.monotonic()
+                if restante > 0:
+                    self._cond.wait(restante)
+                    continue
+                self._pendente = None
+                self._em_andamento = True
+                return geracao, termo
+
+    def _trabalhar(self):
+        while True:
+            geracao, termo = self._proxima()
             try:
-                cursor.execute(f"DROP TABLE IF EXISTS {table}")
-                cursor.execute(f"ALTER TABLE {table}_old RENAME TO {table}")
-            except:
-                pass
-    finally:
-        conn.close()
-
-# Inicialização do Banco de Dados
-def init_db():
-    conn = sqlite3.connect('sistema_os.db')
-    cursor = conn.cursor()
-    
-    # Verificamos que a tabela de clientes tem a coluna data_cadastro
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS clientes (
-            id TEXT PRIMARY KEY,
-            nome TEXT NOT NULL,
-            telefone TEXT NOT NULL,
-            email TEXT,
-            rua TEXT,
-            numero TEXT,
-            bairro TEXT,
-            cidade TEXT,
-            estado TEXT,
-            data_cadastro TEXT
-        )
-    ''')
-    
-    # Tabela Equipamentos
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS equipamentos (
-            id TEXT PRIMARY KEY,
-            cliente_id TEXT,
-            tipo TEXT NOT NULL,
-            marca TEXT,
-            modelo TEXT,
-            numero_serie TEXT,
-            observacao TEXT,
-            FOREIGN KEY (cliente_id) REFERENCES clientes(id)
-        )
-    ''')
-    
-    # Tabela Produtos
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS produtos (
-            id TEXT PRIMARY KEY,
-            nome TEXT NOT NULL,
-            descricao TEXT,
-            preco REAL,
-            quantidade INTEGER
-        )
-    ''')
-    
-    # Tabela Ordens de Serviço
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS ordens_servico (
-            id TEXT PRIMARY KEY,
-            cliente_id TEXT,
-            equipamento_id TEXT,
-            tecnico_id TEXT,
-            data_abertura TEXT,
-            data_fechamento TEXT,
-            status TEXT,
-            descricao_problema TEXT,
-            descricao_solucao TEXT,
-            FOREIGN KEY (cliente_id) REFERENCES clientes(id),
-            FOREIGN KEY (equipamento_id) REFERENCES equipamentos(id),
-            FOREIGN KEY (tecnico_id) REFERENCES tecnicos(id)
-        )
-    ''')
-    
-    # Tabela Técnicos
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS tecnicos (
-            id TEXT PRIMARY KEY,
-            nome TEXT NOT NULL,
-            especialidade TEXT
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
-
-# Funções de CRUD
-class SistemaOS:
-    def __init__(self):
-        self.conn = sqlite3.connect('sistema_os.db')
-        # Inicializa contadores para cada tipo de entidade
-        self._init_counters()
-    
-    def _init_counters(self):
-        """Inicializa contadores para IDs sequenciais baseados no maior ID existente"""
-        cursor = self.conn.cursor()
-        # Para clientes (formato: CLI00001)
-        cursor.execute("SELECT id FROM clientes ORDER BY id DESC LIMIT 1")
-        result = cursor.fetchone()
-        last_id = result[0] if result else "CLI00000"
-        self.cliente_counter = int(last_id[3:]) if last_id.startswith("CLI") else 0
-        
-        # Para equipamentos (formato: EQP00001)
-        cursor.execute("SELECT id FROM equipamentos ORDER BY id DESC LIMIT 1")
-        result = cursor.fetchone()
-        last_id = result[0] if result else "EQP00000"
-        self.equip_counter = int(last_id[3:]) if last_id.startswith("EQP") else 0
-        
-        # Para produtos (formato: PRD00001)
-        cursor.execute("SELECT id FROM produtos ORDER BY id DESC LIMIT 1")
-        result = cursor.fetchone()
-        last_id = result[0] if result else "PRD00000"
-        self.produto_counter = int(last_id[3:]) if last_id.startswith("PRD") else 0
-        
-        # Para técnicos (formato: TEC00001)
-        cursor.execute("SELECT id FROM tecnicos ORDER BY id DESC LIMIT 1")
-        result = cursor.fetchone()
-        last_id = result[0] if result else "TEC00000"
-        self.tecnico_counter = int(last_id[3:]) if last_id.startswith("TEC") else 0
-        
-        # Para ordens de serviço (formato: OS00001)
-        cursor.execute("SELECT id FROM ordens_servico ORDER BY id DESC LIMIT 1")
-        result = cursor.fetchone()
-        last_id = result[0] if result else "OS00000"
-        self.os_counter = int(last_id[2:]) if last_id.startswith("OS") else 0
-    
-    # Métodos para gerar novos IDs
-    def _get_next_id(self, prefix, counter_attr):
-        counter = getattr(self, counter_attr) + 1
-        setattr(self, counter_attr, counter)
-        return f"{prefix}{counter:05d}"  # formato: PREFIX + 5 dígitos com zeros à esquerda
-    
-    def get_next_cliente_id(self):
-        return self._get_next_id("CLI", "cliente_counter")
-    
-    def get_next_equip_id(self):
-        return self._get_next_id("EQP", "equip_counter")
-    
-    def get_next_produto_id(self):
-        return self._get_next_id("PRD", "produto_counter")
-    
-    def get_next_tecnico_id(self):
-        return self._get_next_id("TEC", "tecnico_counter")
-    
-    def get_next_os_id(self):
-        return self._get_next_id("OS", "os_counter")
-    
-    # Modifique todos os métodos add_* para usar os novos IDs
-    def add_cliente(self, nome, telefone, email, rua, numero, bairro, cidade, estado):
-        if not nome or not telefone:
-            raise ValueError("Nome e telefone são obrigatórios")
-        
-        id = self.get_next_cliente_id()
-        data_cadastro = datetime.now().strftime('%d/%m/%Y %H:%M')
-        
-        cursor = self.conn.cursor()
-        try:
-            cursor.execute('''
-                INSERT INTO clientes (id, nome, telefone, email, rua, numero, bairro, cidade, estado, data_cadastro)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (id, nome, telefone, email, rua, numero, bairro, cidade, estado, data_cadastro))
-            self.conn.commit()
-            return id
-        except Exception as e:
-            print(f"Erro ao inserir cliente: {e}")
-            self.conn.rollback()
-            raise
-    
-    def add_equipamento(self, cliente_id, tipo, marca, modelo, numero_serie, observacao=None):
-        id = self.get_next_equip_id()
-        cursor = self.conn.cursor()
-        
-        # Verificar se a coluna observacao existe, se não, adicionar
-        try:
-            cursor.execute("SELECT observacao FROM equipamentos LIMIT 1")
-        except sqlite3.OperationalError:
-            # Adicionar coluna
-            cursor.execute("ALTER TABLE equipamentos ADD COLUMN observacao TEXT")
-        
-        # Inserir equipamento com observação
-        try:
-            cursor.execute('INSERT INTO equipamentos (id, cliente_id, tipo, marca, modelo, numero_serie, observacao) VALUES (?, ?, ?, ?, ?, ?, ?)',
-                         (id, cliente_id, tipo, marca, modelo, numero_serie, observacao))
-            self.conn.commit()
-            return id
-        except Exception as ex:
-            show_snackbar(page, f"Erro ao cadastrar equipamento: {str(ex)}")
-            print(f"Detalhe do erro: {ex}")  # <-- Corrigido aqui
-    
-    def add_produto(self, nome, descricao, preco, quantidade):
-        id = self.get_next_produto_id()
-        cursor = self.conn.cursor()
-        cursor.execute('INSERT INTO produtos (id, nome, descricao, preco, quantidade) VALUES (?, ?, ?, ?, ?)',
-                     (id, nome, descricao, preco, quantidade))
-        self.conn.commit()
-        return id
-    
-    def add_tecnico(self, nome, especialidade):
-        id = self.get_next_tecnico_id()
-        cursor = self.conn.cursor()
-        cursor.execute('INSERT INTO tecnicos (id, nome, especialidade) VALUES (?, ?, ?)',
-                     (id, nome, especialidade))
-        self.conn.commit()
-        return id
-    
-    def add_ordem_servico(self, cliente_id, equipamento_id, tecnico_id, descricao_problema):
-        try:
-            id = self.get_next_os_id()
-            data_abertura = datetime.now().strftime('%d/%m/%Y %H:%M')
-            status = 'Aberta'
-            cursor = self.conn.cursor()
-            print(f"Inserindo OS: {id}, {cliente_id}, {equipamento_id}, {tecnico_id}, {data_abertura}, {status}, {descricao_problema}")
-            cursor.execute('INSERT INTO ordens_servico (id, cliente_id, equipamento_id, tecnico_id, data_abertura, status, descricao_problema) VALUES (?, ?, ?, ?, ?, ?, ?)',
-                         (id, cliente_id, equipamento_id, tecnico_id, data_abertura, status, descricao_problema))
-            self.conn.commit()
-            return id
-        except Exception as e:
-            print(f"Erro ao inserir OS: {e}")
-            self.conn.rollback()
-            raise
-    
-    def update_status_os(self, os_id, status, descricao_solucao=None):
-        cursor = self.conn.cursor()
-        if status == 'Fechada':
-            # Formato de data brasileiro (dia/mês/ano)
-            data_fechamento = datetime.now().strftime('%d/%m/%Y %H:%M')
-            cursor.execute('UPDATE ordens_servico SET status = ?, data_fechamento = ?, descricao_solucao = ? WHERE id = ?',
-                          (status, data_fechamento, descricao_solucao, os_id))
-        else:
-            cursor.execute('UPDATE ordens_servico SET status = ? WHERE id = ?', (status, os_id))
-        self.conn.commit()
-
-    def buscar_clientes(self, termo_busca=None):
-        cursor = self.conn.cursor()
-        if termo_busca:
-            # Primeiro tenta buscar pelo ID exato (se for um ID)
-            cursor.execute('SELECT id, nome, telefone, email, rua, numero, bairro, cidade, estado FROM clientes WHERE id = ?', (termo_busca,))
-            result = cursor.fetchall()
-            
-            # Se não encontrou pelo ID, busca nos outros campos
-            if not result:
-                cursor.execute('''
-                    SELECT id, nome, telefone, email, rua, numero, bairro, cidade, estado
-                    FROM clientes 
-                    WHERE nome LIKE ? OR telefone LIKE ? OR email LIKE ?
-                ''', (f'%{termo_busca}%', f'%{termo_busca}%', f'%{termo_busca}%'))
-                result = cursor.fetchall()
-                
-            return result
-        else:
-            # Retorna todos os clientes (limitados a 20)
-            cursor.execute('SELECT id, nome, telefone, email, rua, numero, bairro, cidade, estado FROM clientes LIMIT 20')
-            return cursor.fetchall()
-
-    # Adicione este método à classe SistemaOS para buscar equipamentos por cliente
-    def buscar_equipamentos_por_cliente(self, cliente_id):
-        cursor = self.conn.cursor()
-        try:
-            # Tenta buscar com a coluna observacao
-            cursor.execute('''
-                SELECT id, tipo, marca, modelo, numero_serie, observacao
-                FROM equipamentos
-                WHERE cliente_id = ?
-            ''', (cliente_id,))
-        except sqlite3.OperationalError:
-            # Se falhar, busca sem a coluna (compatibilidade)
-            cursor.execute('''
-                SELECT id, tipo, marca, modelo, numero_serie
-                FROM equipamentos
-                WHERE cliente_id = ?
-            ''', (cliente_id,))
-        return cursor.fetchall()
-
-    # Adicione o método de busca de técnicos na classe SistemaOS
-    def buscar_tecnicos(self, termo_busca=None):
-        cursor = self.conn.cursor()
-        if termo_busca:
-            # Busca por nome ou especialidade que contenha o termo
-            cursor.execute('''
-                SELECT id, nome, especialidade 
-                FROM tecnicos 
-                WHERE nome LIKE ? OR especialidade LIKE ?
-            ''', (f'%{termo_busca}%', f'%{termo_busca}%'))
-        else:
-            # Retorna todos os técnicos (limitados a 20)
-            cursor.execute('SELECT id, nome, especialidade FROM tecnicos LIMIT 20')
-        
-        return cursor.fetchall()
-
-    # Adicione este método à classe SistemaOS para buscar ordens de serviço
-    def buscar_ordens_servico(self, filtro=None):
-        """
-        Busca ordens de serviço com filtro por ID da OS ou nome do cliente
-        """
-        cursor = self.conn.cursor()
-        
-        if filtro:
-            # Busca por ID da OS ou por nome de cliente
-            cursor.execute('''
-                SELECT os.id, os.cliente_id, os.equipamento_id, os.tecnico_id, 
-                      os.data_abertura, os.data_fechamento, os.status, 
-                      os.descricao_problema, os.descricao_solucao,
-                      c.nome, c.telefone, c.email, c.rua, c.numero, c.bairro, c.cidade, c.estado,
-                      e.tipo, e.marca, e.modelo, e.numero_serie, e.observacao,
-                      t.nome as tecnico_nome, t.especialidade
-                FROM ordens_servico os
-                JOIN clientes c ON os.cliente_id = c.id
-                JOIN equipamentos e ON os.equipamento_id = e.id
-                JOIN tecnicos t ON os.tecnico_id = t.id
-                WHERE os.id LIKE ? OR c.nome LIKE ?
-                ORDER BY os.data_abertura DESC
-            ''', (f'%{filtro}%', f'%{filtro}%'))
+                resultados = self.buscar(termo)
+            except sqlite3.OperationalError as e:
+                # Busca interrompida por um termo mais novo
+                if self._atual(geracao):
+                    logger.warning("Erro na busca: %s", e)
+                continue
+            finally:
+                with self._cond:
+                    self._em_andamento = False
+            if self._atual(geracao):
+                try:
+                    self.renderizar(termo, resultados)
+                except Exception as e:
+                    logger.exception("Erro ao exibir resultados da busca: %s", e)
+
+class AtualizacaoTela:
+    """
+    Junta as atualizações de tela de um evento num único envio ao cliente.
+
+    Os handlers registrados com `evento` não chamam page.update(): marcam o
+    que mudaram com `atualizar(*controles)` (inclusive nas funções auxiliares
+    que chamam, como show_snackbar) e, quando o handler mais externo termina,
+    um único page.update(*controles) leva as mudanças de todos eles. Só a
+    árvore dos controles marcados é comparada, não a página inteira.
+    `atualizar()` sem controles marca a página toda (necessário quando muda
+    page.overlay, ao abrir um diálogo). Fora de um evento (threads de busca
+    e da fila de PDF) cada `atualizar` é enviado na hora.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self._local = threading.local()
+
+    def evento(self, handler):
+        @functools.wraps(handler)
+        def envolvido(*args, **kwargs):
+            local = self._local
+            local.profundidade = getattr(local, "profundidade", 0) + 1
+            if local.profundidade == 1:
+                local.pagina, local.controles = False, []
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                local.profundidade -= 1
+                if local.profundidade == 0:
+                    self._enviar(local.pagina, local.controles)
+        return envolvido
+
+    def atualizar(self, *controles):
+        local = self._local
+        if not getattr(local, "profundidade", 0):
+            self._enviar(not controles, controles)
+        elif not controles:
+            local.pagina = True
         else:
-            # Retorna todas as ordens (limitadas a 50)
-            cursor.execute('''
-                SELECT os.id, os.cliente_id, os.equipamento_id, os.tecnico_id, 
-                      os.data_abertura, os.data_fechamento, os.status, 
-                      os.descricao_problema, os.descricao_solucao,
-                      c.nome, c.telefone, c.email, c.rua, c.numero, c.bairro, c.cidade, c.estado,
-                      e.tipo, e.marca, e.modelo, e.numero_serie, e.observacao,
-                      t.nome as tecnico_nome, t.especialidade
-                FROM ordens_servico os
-                JOIN clientes c ON os.cliente_id = c.id
-                JOIN equipamentos e ON os.equipamento_id = e.id
-                JOIN tecnicos t ON os.tecnico_id = t.id
-                ORDER BY os.data_abertura DESC
-                LIMIT 50
-            ''')
-        
-        return cursor.fetchall()
-
-# Modifique a função gerar_pdf_os
-def gerar_pdf_os(cliente, equipamento, descricao, nome_tecnico):
-    # Cria pasta 'OS' se não existir
-    os_folder = "OS"
-    if not os.path.exists(os_folder):
-        os.makedirs(os_folder)
-        print(f"Pasta '{os_folder}' criada com sucesso!")
-    
-    # Definir nome do arquivo dentro da pasta OS
-    filename = os.path.join(os_folder, f"os_{cliente['nome']}_{equipamento['tipo']}.pdf".replace(" ", "_"))
-    
-    c = canvas.Canvas(filename, pagesize=letter)
-    c.setFont("Helvetica", 12)
-    
-    # Resto do código permanece igual...
-
-    c.save()
-    show_snackbar(page, f"PDF gerado: {filename}")
-
-# Modifique a função gerar_pdf_os_existente
-def gerar_pdf_os_existente(os_data):
-    """Gera PDF para uma OS existente com design melhorado"""
-    
-    # Importar o módulo os com um nome diferente para evitar conflito com o parâmetro
-    import os as os_module
-    
-    # Cria pasta 'OS' se não existir
-    os_folder = "OS"
-    if not os_module.path.exists(os_folder):
-        os_module.makedirs(os_folder)
-        print(f"Pasta '{os_folder}' criada com sucesso!")
-    
-    # Extrair os dados necessários
-    (os_id, cliente_id, equipamento_id, tecnico_id, 
-     data_abertura, data_fechamento, status, 
-     descricao_problema, descricao_solucao,
-     cliente_nome, telefone, email, rua, numero, bairro, cidade, estado,
-     tipo_equip, marca, modelo, num_serie, observacao,
-     tecnico_nome, especialidade) = os_data
-    
-    # Nome do arquivo com data para evitar sobrescrita
-    data_hora = datetime.now().strftime('%Y%m%d_%H%M')
-    filename = os_module.path.join(os_folder, f"os_{os_id}_{cliente_nome.replace(' ', '_')}_{data_hora}.pdf".replace(" ", "_"))
-    
-    print(f"Gerando PDF em: {os_module.path.abspath(filename)}")
-    
-    c = canvas.Canvas(filename, pagesize=letter)
-    c.setFont("Helvetica", 12)
-    
-    # Resto do código permanece igual...
-
-    c.save()
-    show_snackbar(page, f"PDF gerado: {filename}")
-
-    # Também substitua todas as outras ocorrências de 'os.' por 'os_module.'
-    # Por exemplo, ao abrir o PDF automaticamente:
-    try:
-        if platform.system() == 'Darwin':       # macOS
-            subprocess.call(('open', filename))
-        elif platform.system() == 'Windows':    # Windows
-            os_module.startfile(filename)
-        else:                                   # linux
-            subprocess.call(('xdg-open', filename))
-    except Exception as e:
-        print(f"Erro ao abrir PDF: {e}")
+            local.controles.extend(c for c in controles if not any(c is m for m in local.controles))
+
+    def _enviar(self, pagina, controles):
+        # Controle ainda fora da página não pode ser atualizado sozinho
+        if pagina or any(c.page is None for c in controles):
+            self.page.update()
+        elif controles:
+            self.page.update(*self._sem_aninhados(controles))
+
+    @staticmethod
+    def _sem_aninhados(controles):
+        """Tira os controles que já estão dentro de outro da lista (seriam comparados duas vezes)."""
+        marcados = {id(c) for c in controles}
+        resultado = []
+        for controle in controles:
+            pai = getattr(controle, "parent", None)
+            while pai is not None and id(pai) not in marcados:
+                pai = getattr(pai, "parent", None)
+            if pai is None:
+                resultado.append(controle)
+        return resultado
+
+class ListaReciclada:
+    """
+    Linhas de uma lista de resultados reaproveitadas de uma busca para outra.
+
+    Em vez de limpar a lista e montar controles novos a cada busca, a linha i
+    continua sendo o mesmo controle: `preencher(linha, item)` só troca os
+    textos e o `data` dela, e o update leva apenas os valores que mudaram.
+    Linhas só entram ou saem da lista quando muda a quantidade de resultados;
+    as que saem ficam guardadas (até MAX_LINHAS_RESERVA) para a próxima busca.
+    `criar()` monta uma linha vazia; `vazio` é mostrado quando não há itens.
+    """
+
+    def __init__(self, lista, criar, preencher, vazio=None):
+        self.lista = lista
+        self.criar = criar
+        self.preencher = preencher
+        self.vazio = vazio
+        self.exibidas = 0
+        self._linhas = []
+        self._lock = threading.Lock()
+
+    def exibir(self, itens):
+        """Mostra `itens` no lugar do conteúdo atual da lista."""
+        with self._lock:
+            self._mostrar(self._preencher(0, itens))
+
+    def acrescentar(self, itens):
+        """Mostra `itens` depois das linhas já exibidas (próxima página)."""
+        with self._lock:
+            self._mostrar(self._preencher(self.exibidas, itens))
+
+    def _preencher(self, inicio, itens):
+        total = inicio
+        for item in itens:
+            if total == len(self._linhas):
+                self._linhas.append(self.criar())
+            self.preencher(self._linhas[total], item)
+            total += 1
+        return total
+
+    def _mostrar(self, total):
+        controles = self.lista.controls
+        if not total:
+            controles[:] = [] if self.vazio is None else [self.vazio]
+        # Mesma quantidade e mesmas linhas: a lista em si não muda
+        elif len(controles) != total or controles[0] is not self._linhas[0]:
+            controles[:] = self._linhas[:total]
+        self.exibidas = total
+        del self._linhas[total + MAX_LINHAS_RESERVA:]
 
 # Interface com Flet
 def main(page: ft.Page):
+    inicio_os.marcar("janela")
     page.title = "Sistema de Ordem de Serviço - Eletrônica"
     page.theme_mode = ft.ThemeMode.LIGHT
     page.padding = 0
@@ -538,17 +253,23 @@ def main(page: ft.Page):
         )
     }
     
-    sistema = SistemaOS()
+    # Regras de negócio ficam no serviço; a interface só coleta campos e exibe
+    servico = ServicoOS()
+    sistema = servico.sistema
+    inicio_os.marcar("banco")
+
+    # Um envio ao cliente por evento, só com os controles alterados
+    tela = AtualizacaoTela(page)
     
+    # Um snackbar só, reaproveitado: a cada mensagem muda o texto e reabre
+    snack = ft.SnackBar(content=ft.Text(""), action="OK")
+    page.overlay.append(snack)
+
     # Função para exibir mensagens de snackbar (versão atualizada)
     def show_snackbar(page, message):
-        snack = ft.SnackBar(
-            content=ft.Text(message),
-            action="OK"
-        )
-        page.overlay.append(snack)
+        snack.content.value = message
         snack.open = True
-        page.update()
+        tela.atualizar(snack)
     
     # Adicione esta função para limpar resultados de buscas quando mudar de aba
     def limpar_resultados_busca():
@@ -556,9 +277,10 @@ def main(page: ft.Page):
         resultados_busca_os.controls.clear()
         resultados_busca_tecnico.visible = False
         resultados_busca_tecnico.controls.clear()
-        page.update()
+        tela.atualizar(resultados_busca_os, resultados_busca_tecnico)
 
     # Função para alternar entre telas
+    @tela.evento
     def change_tab(e):
         index = e.control.selected_index
         titulo_pagina.value = [
@@ -567,24 +289,27 @@ def main(page: ft.Page):
             "Cadastro de Produtos", 
             "Cadastro de Técnicos", 
             "Gerenciamento de OS",
-            "Listagem de Ordens de Serviço"  # Novo título
+            "Listagem de Ordens de Serviço",  # Novo título
+            "Painel"
         ][index]
+        tela.atualizar(titulo_pagina)
         
-        cliente_container.visible = index == 0
-        equipamento_container.visible = index == 1
-        produto_container.visible = index == 2
-        tecnico_container.visible = index == 3
-        os_container.visible = index == 4
-        lista_os_container.visible = index == 5  # Nova visibilidade
+        # Só as duas abas que trocam de visibilidade vão para o cliente
+        for i, aba in enumerate(abas):
+            if aba.visible != (i == index):
+                aba.visible = i == index
+                tela.atualizar(aba)
         
         # Se selecionou Listar OS, carrega todas as ordens
         if index == 5:
             buscar_os(None)  # Carrega OS automaticamente
         
+        # O painel lê os contadores prontos (tabelas de resumo), não as ordens
+        if index == 6:
+            atualizar_painel()
+        
         # Limpar resultados de busca ao trocar de aba
         limpar_resultados_busca()
-        
-        page.update()
     
     # Título da página
     titulo_pagina = ft.Text("Cadastro de Clientes", size=24, weight=ft.FontWeight.BOLD, color=primary_color)
@@ -641,43 +366,49 @@ def main(page: ft.Page):
     )
 
     # Função para buscar clientes
+    @tela.evento
     def buscar_cliente(e):
         termo = busca_cliente_field.value
         if not termo or len(termo) < 3:
+            busca_cliente_debounced.cancelar()
             resultados_busca.visible = False
-            page.update()
+            tela.atualizar(resultados_busca)
             return
-            
-        resultados = sistema.buscar_clientes(termo)
-        resultados_busca.controls.clear()
-        
-        if not resultados:
-            resultados_busca.controls.append(
-                ft.Text("Nenhum cliente encontrado", italic=True, color=ft.colors.GREY_500)
-            )
-        else:
-            for cliente in resultados:
-                # Use os mesmos 9 campos retornados pela consulta SQL
-                cliente_id, nome, telefone, email, rua, numero, bairro, cidade, estado = cliente
-                resultados_busca.controls.append(
-                    ft.Container(
-                        content=ft.Column([
-                            ft.Text(f"{nome}", weight=ft.FontWeight.BOLD),
-                            ft.Text(f"Tel: {telefone} | Email: {email or 'N/A'}", size=12)
-                        ]),
-                        margin=5,
-                        padding=10,
-                        border_radius=5,
-                        bgcolor=ft.colors.BLUE_50,
-                        data=cliente_id,  # Armazena o ID do cliente como atributo de dados
-                        on_click=lambda e: selecionar_cliente(e)
-                    )
-                )
-        
+        busca_cliente_debounced.agendar(termo)
+
+    # Linha de resultado da busca de clientes (reaproveitada entre buscas)
+    def criar_linha_cliente():
+        return ft.Container(
+            content=ft.Column([
+                ft.Text(weight=ft.FontWeight.BOLD),
+                ft.Text(size=12)
+            ]),
+            margin=5,
+            padding=10,
+            border_radius=5,
+            bgcolor=ft.colors.BLUE_50,
+            on_click=selecionar_cliente
+        )
+
+    def preencher_linha_cliente(linha, cliente):
+        nome_texto, contato_texto = linha.content.controls
+        nome_texto.value = f"{cliente.nome}"
+        contato_texto.value = f"Tel: {cliente.telefone} | Email: {cliente.email or 'N/A'}"
+        linha.data = cliente.id  # Armazena o ID do cliente como atributo de dados
+
+    linhas_cliente = ListaReciclada(
+        resultados_busca, criar_linha_cliente, preencher_linha_cliente,
+        vazio=ft.Text("Nenhum cliente encontrado", italic=True, color=ft.colors.GREY_500)
+    )
+
+    # Exibe os resultados da busca mais recente de clientes
+    def exibir_resultados_cliente(termo, resultados):
+        linhas_cliente.exibir(resultados)
         resultados_busca.visible = True
-        page.update()
+        tela.atualizar(resultados_busca)
 
     # Função para selecionar o cliente quando clicar no resultado
+    @tela.evento
     def selecionar_cliente(e):
         cliente_id = e.control.data
         cliente_nome = e.control.content.controls[0].value
@@ -690,11 +421,15 @@ def main(page: ft.Page):
         # Esconde a lista de resultados após a seleção
         resultados_busca.visible = False
         busca_cliente_field.value = ""
-        page.update()
+        tela.atualizar(cliente_id_equip, cliente_nome_exibicao, resultados_busca, busca_cliente_field)
+
+    busca_cliente_debounced = BuscaDebounced(sistema.buscar_clientes, exibir_resultados_cliente,
+                                             interromper=sistema.pool.interromper)
 
     # Associar o evento de mudança ao campo de busca
     busca_cliente_field.on_change = buscar_cliente
 
+    @tela.evento
     def format_telefone(e):
         # Remove todos os caracteres não numéricos
         text = ''.join(filter(str.isdigit, telefone_cliente.value or ""))
@@ -711,42 +446,34 @@ def main(page: ft.Page):
             
         # Atualiza o valor do campo
         telefone_cliente.value = formatted
-        page.update()
+        tela.atualizar(telefone_cliente)
 
     # Adiciona o evento on_change ao campo de telefone
     telefone_cliente.on_change = format_telefone
 
     # Atualizar a função add_cliente para usar a nova abordagem
+    @tela.evento
     def add_cliente(e):
-        if not nome_cliente.value or not telefone_cliente.value:
-            show_snackbar(page, "Nome e telefone são obrigatórios!")
-            return
-            
-        # Extrai apenas os dígitos do telefone para salvar
-        telefone_limpo = ''.join(filter(str.isdigit, telefone_cliente.value))
-        
-        # Valida se o telefone tem o formato correto (DDD + 9 dígitos)
-        if len(telefone_limpo) < 11:
-            show_snackbar(page, "Telefone deve ter DDD + 9 dígitos")
-            return
-        
         try:
-            sistema.add_cliente(
+            resultado = servico.cadastrar_cliente(NovoCliente(
                 nome_cliente.value,
-                telefone_limpo,  # Usando a versão limpa para armazenar
+                telefone_cliente.value,
                 email_cliente.value,
                 rua_cliente.value,
                 numero_cliente.value,
                 bairro_cliente.value,
                 cidade_cliente.value,
                 estado_cliente.value
-            )
-            show_snackbar(page, "Cliente cadastrado com sucesso!")
+            ))
+            show_snackbar(page, resultado.mensagem)
             # Limpa os campos após o cadastro
-            for field in [nome_cliente, telefone_cliente, email_cliente, rua_cliente, 
-                        numero_cliente, bairro_cliente, cidade_cliente, estado_cliente]:
+            campos = [nome_cliente, telefone_cliente, email_cliente, rua_cliente,
+                      numero_cliente, bairro_cliente, cidade_cliente, estado_cliente]
+            for field in campos:
                 field.value = ""
-            page.update()
+            tela.atualizar(*campos)
+        except ErroValidacao as ex:
+            show_snackbar(page, str(ex))
         except Exception as ex:
             show_snackbar(page, f"Erro ao cadastrar: {str(ex)}")
     
@@ -829,28 +556,21 @@ def main(page: ft.Page):
     )
 
     # Função para adicionar equipamento melhorada
+    @tela.evento
     def add_equipamento(e):
-        if not cliente_id_equip.value:
-            show_snackbar(page, "Selecione um cliente primeiro!")
-            return
-            
-        if not tipo_equip.value:
-            show_snackbar(page, "O tipo de equipamento é obrigatório!")
-            return
-        
         try:
             # Adiciona o equipamento ao banco de dados
-            equip_id = sistema.add_equipamento(
+            resultado = servico.cadastrar_equipamento(NovoEquipamento(
                 cliente_id_equip.value,
                 tipo_equip.value,
                 marca_equip.value,
                 modelo_equip.value,
                 numero_serie_equip.value,
                 observacao_equip.value  # Novo campo de observações
-            )
+            ))
             
             # Exibe mensagem de sucesso com o ID
-            show_snackbar(page, f"Equipamento {equip_id} cadastrado com sucesso!")
+            show_snackbar(page, resultado.mensagem)
             
             # Limpa os campos após o cadastro
             tipo_equip.value = ""
@@ -866,10 +586,12 @@ def main(page: ft.Page):
             # cliente_nome_exibicao.color = ft.colors.GREY_500
             # cliente_nome_exibicao.italic = True
             
-            page.update()
+            tela.atualizar(tipo_equip, marca_equip, modelo_equip, numero_serie_equip, observacao_equip)
+        except ErroValidacao as ex:
+            show_snackbar(page, str(ex))
         except Exception as ex:
             show_snackbar(page, f"Erro ao cadastrar equipamento: {str(ex)}")
-            print(f"Detalhe do erro: {ex}")
+            logger.exception("Erro ao cadastrar equipamento: %s", ex)
 
     # Container de equipamento redesenhado
     equipamento_container = ft.Container(
@@ -973,7 +695,7 @@ def main(page: ft.Page):
         multiline=True,
         min_lines=3,
         max_lines=5,
-        on_change=lambda e: print(f"Descrição digitada: {e.control.value}"),
+        on_change=lambda e: logger.debug("Descrição digitada: %r", e.control.value),
         border_color=ft.colors.GREY_400,  # Cor neutra em vez de vermelho
         bgcolor=ft.colors.GREY_50   # Fundo neutro em vez de vermelho
     )
@@ -1049,17 +771,19 @@ def main(page: ft.Page):
     preco_produto = ft.TextField(label="Preço", keyboard_type=ft.KeyboardType.NUMBER)
     quantidade_produto = ft.TextField(label="Quantidade", keyboard_type=ft.KeyboardType.NUMBER)
     
+    @tela.evento
     def add_produto(e):
-        if not nome_produto.value:
-            show_snackbar(page, "Nome do produto é obrigatório!")
+        try:
+            resultado = servico.cadastrar_produto(NovoProduto(
+                nome_produto.value,
+                descricao_produto.value,
+                preco_produto.value,
+                quantidade_produto.value
+            ))
+        except ErroValidacao as ex:
+            show_snackbar(page, str(ex))
             return
-        sistema.add_produto(
-            nome_produto.value,
-            descricao_produto.value,
-            float(preco_produto.value) if preco_produto.value else 0.0,
-            int(quantidade_produto.value) if quantidade_produto.value else 0
-        )
-        show_snackbar(page, "Produto cadastrado com sucesso!")
+        show_snackbar(page, resultado.mensagem)
     
     produto_container = ft.Container(
         content=ft.Column([
@@ -1077,19 +801,17 @@ def main(page: ft.Page):
     nome_tecnico = ft.TextField(label="Nome")
     especialidade_tecnico = ft.TextField(label="Especialidade")
     
+    @tela.evento
     def add_tecnico(e):
-        if not nome_tecnico.value:
-            page.snack_bar = ft.SnackBar(ft.Text("Nome do técnico é obrigatório!"))
-            page.snack_bar.open = True
-            page.update()
+        try:
+            resultado = servico.cadastrar_tecnico(NovoTecnico(
+                nome_tecnico.value,
+                especialidade_tecnico.value
+            ))
+        except ErroValidacao as ex:
+            show_snackbar(page, str(ex))
             return
-        sistema.add_tecnico(
-            nome_tecnico.value,
-            especialidade_tecnico.value
-        )
-        page.snack_bar = ft.SnackBar(ft.Text("Técnico cadastrado com sucesso!"))
-        page.snack_bar.open = True
-        page.update()
+        show_snackbar(page, resultado.mensagem)
     
     tecnico_container = ft.Container(
         content=ft.Column([
@@ -1129,49 +851,57 @@ def main(page: ft.Page):
     )
 
     # Função para realizar a busca quando o usuário digitar
+    @tela.evento
     def buscar_cliente_os(e):
         termo = busca_cliente_os.value
         if not termo or len(termo) < 3:
+            busca_cliente_os_debounced.cancelar()
             resultados_busca_os.visible = False
-            page.update()
+            tela.atualizar(resultados_busca_os)
             return
-            
-        resultados = sistema.buscar_clientes(termo)
-        resultados_busca_os.controls.clear()
-        
-        if not resultados:
-            resultados_busca_os.controls.append(
-                ft.Text("Nenhum cliente encontrado", italic=True, color=ft.colors.GREY_500)
-            )
-        else:
-            for cliente in resultados:
-                # Desempacote todos os campos corretamente
-                cliente_id, nome, telefone, email, rua, numero, bairro, cidade, estado = cliente
-                resultados_busca_os.controls.append(
-                    ft.Container(
-                        content=ft.Column([
-                            ft.Text(f"{nome}", weight=ft.FontWeight.BOLD),
-                            ft.Text(f"ID: {cliente_id}", size=12),
-                            ft.Text(f"Tel: {telefone} | Email: {email or 'N/A'}", size=12)
-                        ]),
-                        margin=5,
-                        padding=10,
-                        border_radius=5,
-                        bgcolor=ft.colors.BLUE_50,
-                        data=cliente_id,  # Armazena o ID do cliente como um atributo de dados
-                        on_click=lambda e: selecionar_cliente_os(e)
-                    )
-                )
+        busca_cliente_os_debounced.agendar(termo)
+
+    # Linha de resultado da busca de clientes na tela de OS
+    def criar_linha_cliente_os():
+        return ft.Container(
+            content=ft.Column([
+                ft.Text(weight=ft.FontWeight.BOLD),
+                ft.Text(size=12),
+                ft.Text(size=12)
+            ]),
+            margin=5,
+            padding=10,
+            border_radius=5,
+            bgcolor=ft.colors.BLUE_50,
+            on_click=selecionar_cliente_os
+        )
+
+    def preencher_linha_cliente_os(linha, cliente):
+        nome_texto, id_texto, contato_texto = linha.content.controls
+        nome_texto.value = f"{cliente.nome}"
+        id_texto.value = f"ID: {cliente.id}"
+        contato_texto.value = f"Tel: {cliente.telefone} | Email: {cliente.email or 'N/A'}"
+        linha.data = cliente.id  # Armazena o ID do cliente como um atributo de dados
+
+    linhas_cliente_os = ListaReciclada(
+        resultados_busca_os, criar_linha_cliente_os, preencher_linha_cliente_os,
+        vazio=ft.Text("Nenhum cliente encontrado", italic=True, color=ft.colors.GREY_500)
+    )
+
+    # Exibe os resultados da busca mais recente de clientes na tela de OS
+    def exibir_resultados_cliente_os(termo, resultados):
+        linhas_cliente_os.exibir(resultados)
         
         resultados_busca_os.visible = True
-        page.update()
+        tela.atualizar(resultados_busca_os)
 
     # Modificação na função selecionar_cliente_os
+    @tela.evento
     def selecionar_cliente_os(e):
         cliente_id = e.control.data
         cliente_nome = e.control.content.controls[0].value
         
-        print(f"Cliente selecionado: ID={cliente_id}, Nome={cliente_nome}")
+        logger.debug("Cliente selecionado: ID=%s, Nome=%s", cliente_id, cliente_nome)
         
         # Atualiza os campos do cliente
         cliente_id_os.value = cliente_id
@@ -1179,8 +909,6 @@ def main(page: ft.Page):
         cliente_nome_exibicao_os.color = primary_color
         cliente_nome_exibicao_os.italic = False
         
-        print(f"Valor atribuído ao cliente_id_os: {cliente_id_os.value}")
-        
         # Buscar equipamentos do cliente
         equipamentos = sistema.buscar_equipamentos_por_cliente(cliente_id)
         
@@ -1212,29 +940,23 @@ def main(page: ft.Page):
             )
         else:
             for equip in equipamentos:
-                # Verifica se temos observações no resultado
-                if len(equip) > 5:
-                    equip_id, tipo, marca, modelo, num_serie, observacao = equip
-                else:
-                    equip_id, tipo, marca, modelo, num_serie = equip
-                    observacao = None
-                    
                 # Descrição principal do equipamento
-                descricao = f"{tipo} - {marca} {modelo}" if marca and modelo else tipo
+                descricao = f"{equip.tipo} - {equip.marca} {equip.modelo}" if equip.marca and equip.modelo else equip.tipo
                 
                 # Informações adicionais para exibir na lista
                 info_adicional = ""
-                if num_serie:
-                    info_adicional += f"S/N: {num_serie}"
+                if equip.numero_serie:
+                    info_adicional += f"S/N: {equip.numero_serie}"
                 
                 # Conteúdo do item da lista
                 container_content = [
                     ft.Text(descricao, weight=ft.FontWeight.BOLD),
                     ft.Text(info_adicional or "Sem número de série", size=12),
-                    ft.Text(f"ID: {equip_id}", size=10, color=ft.colors.GREY_500)
+                    ft.Text(f"ID: {equip.id}", size=10, color=ft.colors.GREY_500)
                 ]
                 
                 # Se tiver observação, adiciona
+                observacao = equip.observacao
                 if observacao:
                     container_content.insert(2, 
                         ft.Text(f"Obs: {observacao[:50]}{'...' if len(observacao) > 50 else ''}", 
@@ -1248,7 +970,7 @@ def main(page: ft.Page):
                         padding=10,
                         border_radius=5,
                         bgcolor=ft.colors.BLUE_50,
-                        data=equip_id,
+                        data=equip.id,
                         on_click=selecionar_equipamento,
                         ink=True  # Efeito de ondulação ao clicar
                     )
@@ -1259,27 +981,25 @@ def main(page: ft.Page):
         # Esconde a lista de resultados de clientes após a seleção
         resultados_busca_os.visible = False
         busca_cliente_os.value = ""
-        page.update()
+        tela.atualizar(cliente_id_os, cliente_nome_exibicao_os, equipamento_id_os, equipamento_selector,
+                       sem_cliente_container, resultados_busca_os, busca_cliente_os)
 
     # Função para selecionar um equipamento da lista
+    @tela.evento
     def selecionar_equipamento(e):
         equip_id = e.control.data
         equip_descricao = e.control.content.controls[0].value
         
-        # Log para depuração
-        print(f"Equipamento selecionado: ID={equip_id}, Descrição={equip_descricao}")
+        logger.debug("Equipamento selecionado: ID=%s, Descrição=%s", equip_id, equip_descricao)
         
         equipamento_id_os.value = equip_id
         equipamento_nome_exibicao.value = f"Equipamento: {equip_descricao}"
         equipamento_nome_exibicao.color = primary_color
         equipamento_nome_exibicao.italic = False
         
-        # Verificar se o valor foi atribuído corretamente
-        print(f"Valor atribuído ao equipamento_id_os: {equipamento_id_os.value}")
-        
         # Esconde a lista de equipamentos
         equipamento_selector.visible = False
-        page.update()
+        tela.atualizar(equipamento_id_os, equipamento_nome_exibicao, equipamento_selector)
 
     # Busca de equipamentos
     equipamento_id_os = ft.TextField(
@@ -1374,43 +1094,52 @@ def main(page: ft.Page):
     )
 
     # Função para buscar técnicos
+    @tela.evento
     def buscar_tecnico(e):
         termo = busca_tecnico_os.value
         if not termo or len(termo) < 3:
+            busca_tecnico_debounced.cancelar()
             resultados_busca_tecnico.visible = False
-            page.update()
+            tela.atualizar(resultados_busca_tecnico)
             return
-            
-        resultados = sistema.buscar_tecnicos(termo)
-        resultados_busca_tecnico.controls.clear()
-        
-        if not resultados:
-            resultados_busca_tecnico.controls.append(
-                ft.Text("Nenhum técnico encontrado", italic=True, color=ft.colors.GREY_500)
-            )
-        else:
-            for tecnico in resultados:
-                tecnico_id, nome, especialidade = tecnico
-                resultados_busca_tecnico.controls.append(
-                    ft.Container(
-                        content=ft.Column([
-                            ft.Text(f"{nome}", weight=ft.FontWeight.BOLD),
-                            ft.Text(f"Especialidade: {especialidade or 'N/A'}", size=12),
-                            ft.Text(f"ID: {tecnico_id}", size=12)
-                        ]),
-                        margin=5,
-                        padding=10,
-                        border_radius=5,
-                        bgcolor=ft.colors.BLUE_50,
-                        data=tecnico_id,  # Armazena o ID do técnico como um atributo de dados
-                        on_click=lambda e: selecionar_tecnico(e)
-                    )
-                )
+        busca_tecnico_debounced.agendar(termo)
+
+    # Linha de resultado da busca de técnicos (reaproveitada entre buscas)
+    def criar_linha_tecnico():
+        return ft.Container(
+            content=ft.Column([
+                ft.Text(weight=ft.FontWeight.BOLD),
+                ft.Text(size=12),
+                ft.Text(size=12)
+            ]),
+            margin=5,
+            padding=10,
+            border_radius=5,
+            bgcolor=ft.colors.BLUE_50,
+            on_click=selecionar_tecnico
+        )
+
+    def preencher_linha_tecnico(linha, tecnico):
+        nome_texto, especialidade_texto, id_texto = linha.content.controls
+        nome_texto.value = f"{tecnico.nome}"
+        especialidade_texto.value = f"Especialidade: {tecnico.especialidade or 'N/A'}"
+        id_texto.value = f"ID: {tecnico.id}"
+        linha.data = tecnico.id  # Armazena o ID do técnico como um atributo de dados
+
+    linhas_tecnico = ListaReciclada(
+        resultados_busca_tecnico, criar_linha_tecnico, preencher_linha_tecnico,
+        vazio=ft.Text("Nenhum técnico encontrado", italic=True, color=ft.colors.GREY_500)
+    )
+
+    # Exibe os resultados da busca mais recente de técnicos
+    def exibir_resultados_tecnico(termo, resultados):
+        linhas_tecnico.exibir(resultados)
         
         resultados_busca_tecnico.visible = True
-        page.update()
+        tela.atualizar(resultados_busca_tecnico)
 
     # Função para selecionar o técnico
+    @tela.evento
     def selecionar_tecnico(e):
         tecnico_id = e.control.data
         tecnico_nome = e.control.content.controls[0].value
@@ -1423,7 +1152,12 @@ def main(page: ft.Page):
         # Esconde a lista de resultados após a seleção
         resultados_busca_tecnico.visible = False
         busca_tecnico_os.value = ""
-        page.update()
+        tela.atualizar(tecnico_id_os, tecnico_nome_exibicao, resultados_busca_tecnico, busca_tecnico_os)
+
+    busca_tecnico_debounced = BuscaDebounced(sistema.buscar_tecnicos, exibir_resultados_tecnico,
+                                             interromper=sistema.pool.interromper)
+    busca_cliente_os_debounced = BuscaDebounced(sistema.buscar_clientes, exibir_resultados_cliente_os,
+                                                interromper=sistema.pool.interromper)
 
     # Associa o evento de mudança ao campo de busca
     busca_tecnico_os.on_change = buscar_tecnico
@@ -1437,6 +1171,7 @@ def main(page: ft.Page):
     # Variável para armazenar temporariamente os dados da OS
     os_dados_salvos = {}
 
+    @tela.evento
     def salvar_os(e):
         # Salva os valores atuais dos campos em um dicionário
         os_dados_salvos["cliente_id"] = cliente_id_os.value
@@ -1444,89 +1179,46 @@ def main(page: ft.Page):
         os_dados_salvos["tecnico_id"] = tecnico_id_os.value
         os_dados_salvos["descricao"] = descricao_problema_os.value
         show_snackbar(page, f"OS salva temporariamente!\nDescrição: {descricao_problema_os.value}")
-        print(f"DEBUG salvar_os: {os_dados_salvos}")
+        logger.debug("salvar_os: %s", os_dados_salvos)
 
     # Funções para OS
+    @tela.evento
     def add_os(e):
-        print("----- VERIFICAÇÃO DE DESCRIÇÃO -----")
-        print(f"Descrição ID: {id(descricao_problema_os)}")
-        print(f"Valor atual: '{descricao_problema_os.value}'")
-        print(f"Tipo: {type(descricao_problema_os.value)}")
-        
+        logger.debug("add_os: descrição %r", descricao_problema_os.value)
+
         # Pegue o valor digitado diretamente do campo
         atual_descricao = descricao_problema_os.value or ""  # Use string vazia se for None
         
-        # Verifica apenas campos que continuam obrigatórios
-        if not cliente_id_os.value:
-            show_snackbar(page, "Selecione um cliente!")
-            return
-                
-        if not equipamento_id_os.value:
-            show_snackbar(page, "Selecione um equipamento!")
-            return
-        
-        if not tecnico_id_os.value:
-            show_snackbar(page, "Selecione um técnico!")
-            return
+        nova_ordem = NovaOrdem(
+            cliente_id_os.value,
+            equipamento_id_os.value,
+            tecnico_id_os.value,
+            atual_descricao
+        )
         
         try:
-            # PRIMEIRO: Busque os dados de cliente e equipamento para o modal
-            # Procura cliente
-            resultados_cliente = sistema.buscar_clientes(cliente_id_os.value)
-            if not resultados_cliente:
-                show_snackbar(page, "Cliente não encontrado!")
-                return
-            cliente = resultados_cliente[0]
-            
-            # Busca equipamentos
-            equipamento_lista = sistema.buscar_equipamentos_por_cliente(cliente_id_os.value)
-            equipamento = next((eq for eq in equipamento_lista if eq[0] == equipamento_id_os.value), None)
-            if not equipamento:
-                show_snackbar(page, "Equipamento não encontrado!")
-                return
-            
-            # Dados do técnico
-            tecnico_nome = tecnico_nome_exibicao.value.replace("Técnico selecionado: ", "")
-            
-            # Prepara dicionários para modal e PDF
-            cliente_dict = {
-                "nome": cliente[1],
-                "telefone": cliente[2],
-                "email": cliente[3] or "N/A",
-                "rua": cliente[4] or "",
-                "numero": cliente[5] or "",
-                "bairro": cliente[6] or "",
-                "cidade": cliente[7] or "",
-                "estado": cliente[8] or ""
-            }
-            
-            # Campos do equipamento com tratamento para evitar None
-            equipamento_dict = {
-                "tipo": equipamento[1] or "",
-                "marca": equipamento[2] or "",
-                "modelo": equipamento[3] or "",
-                "numero_serie": equipamento[4] or "",
-                "observacao": equipamento[5] if len(equipamento) > 5 else ""
-            }
+            # PRIMEIRO: Valida e busca os dados de cliente e equipamento para o modal
+            resumo = servico.preparar_ordem(nova_ordem)
+            cliente_dict = resumo.cliente
+            equipamento_dict = resumo.equipamento
+            tecnico_nome = resumo.tecnico_nome
             
             # --- Modal ---
+            @tela.evento
             def gerar_pdf_e_salvar(ev):
                 # Criação da OS no banco
-                os_id = sistema.add_ordem_servico(
-                    cliente_id_os.value,
-                    equipamento_id_os.value,
-                    tecnico_id_os.value,
-                    atual_descricao.strip()
-                )
+                resultado = servico.criar_ordem(nova_ordem)
                 
-                # Gera o PDF
-                gerar_pdf_os(cliente_dict, equipamento_dict, atual_descricao, tecnico_nome)
+                # Gera o PDF em segundo plano a partir da OS gravada
+                ordem = servico.obter_ordem(resultado.id)
+                if ordem:
+                    fila_pdf.enviar(ordem)
                 
                 # Fecha o modal
                 dlg.open = False
                 
                 # Mostra confirmação
-                show_snackbar(page, f"Ordem de Serviço #{os_id} criada com sucesso!")
+                show_snackbar(page, resultado.mensagem)
                 
                 # Limpa os campos após cadastrar
                 cliente_id_os.value = ""
@@ -1547,21 +1239,23 @@ def main(page: ft.Page):
                 tecnico_nome_exibicao.color = ft.colors.GREY_500
                 tecnico_nome_exibicao.italic = True
                 
+                tela.atualizar(dlg, cliente_id_os, equipamento_id_os, tecnico_id_os, descricao_problema_os,
+                               cliente_nome_exibicao_os, equipamento_nome_exibicao, tecnico_nome_exibicao)
+                
                 # Atualiza a data mostrada
                 atualizar_datas()
-                page.update()
 
             modal_content = ft.Column([
                 ft.Text("Confirmação da OS e Termo de Garantia", size=20, weight=ft.FontWeight.BOLD, color=primary_color),
                 ft.Divider(),
-                ft.Text(f"Cliente: {cliente_dict['nome']}"),
-                ft.Text(f"Telefone: {cliente_dict['telefone']}"),
-                ft.Text(f"Email: {cliente_dict['email']}"),
-                ft.Text(f"Endereço: {cliente_dict['rua']}, {cliente_dict['numero']} - {cliente_dict['bairro']}, {cliente_dict['cidade']}/{cliente_dict['estado']}"),
+                ft.Text(f"Cliente: {cliente_dict.nome}"),
+                ft.Text(f"Telefone: {cliente_dict.telefone}"),
+                ft.Text(f"Email: {cliente_dict.email}"),
+                ft.Text(f"Endereço: {cliente_dict.rua}, {cliente_dict.numero} - {cliente_dict.bairro}, {cliente_dict.cidade}/{cliente_dict.estado}"),
                 ft.Divider(),
-                ft.Text(f"Equipamento: {equipamento_dict['tipo']} - {equipamento_dict['marca']} {equipamento_dict['modelo']}"),
-                ft.Text(f"Nº Série: {equipamento_dict['numero_serie']}"),
-                ft.Text(f"Observações: {equipamento_dict['observacao']}"),
+                ft.Text(f"Equipamento: {equipamento_dict.tipo} - {equipamento_dict.marca} {equipamento_dict.modelo}"),
+                ft.Text(f"Nº Série: {equipamento_dict.numero_serie}"),
+                ft.Text(f"Observações: {equipamento_dict.observacao}"),
                 ft.Divider(),
                 ft.Text(f"Problema relatado: {atual_descricao}"),
                 ft.Divider(),
@@ -1578,19 +1272,21 @@ def main(page: ft.Page):
                 content=modal_content,
                 actions=[
                     ft.TextButton("Gerar PDF e Salvar", on_click=gerar_pdf_e_salvar, style=ft.ButtonStyle(color=primary_color)),
-                    ft.TextButton("Cancelar", on_click=lambda _: setattr(dlg, 'open', False) or page.update()),
+                    ft.TextButton("Cancelar", on_click=lambda _: setattr(dlg, 'open', False) or tela.atualizar(dlg)),
                 ],
                 actions_alignment=ft.MainAxisAlignment.END,
             )
             page.overlay.append(dlg)
             dlg.open = True
-            page.update()
+            tela.atualizar()  # overlay mudou: vai a página
             
+        except ErroValidacao as ex:
+            show_snackbar(page, str(ex))
         except Exception as ex:
             show_snackbar(page, f"Erro ao criar OS: {str(ex)}")
-            # Imprimir erro para depuração
-            print(f"Detalhes do erro: {ex}")
+            logger.exception("Erro ao criar OS: %s", ex)
 
+    @tela.evento
     def update_os(e):
         # Verificações de campos obrigatórios
         if not cliente_id_os.value:
@@ -1611,28 +1307,14 @@ def main(page: ft.Page):
         # If you have other date fields, update them here too
         # For example:
         # data_atualizacao_text.value = f"Última Atualização: {current_datetime}"
-        page.update()
+        tela.atualizar(data_abertura_text)
 
     # Adicione esta função para depurar os campos de ID
     def verificar_ids(e):
-        print("---- STATUS DOS IDs ----")
-        print(f"Cliente ID: '{cliente_id_os.value}'")
-        print(f"Equipamento ID: '{equipamento_id_os.value}'")
-        print(f"Técnico ID: '{tecnico_id_os.value}'")
-        print(f"Descrição: '{descricao_problema_os.value}'")
-        
-        if cliente_id_os.value and equipamento_id_os.value and tecnico_id_os.value and descricao_problema_os.value:
-            print("TODOS OS CAMPOS ESTÃO PREENCHIDOS!")
-        else:
-            print("CAMPOS FALTANDO:")
-            if not cliente_id_os.value:
-                print("- Cliente ID está vazio")
-            if not equipamento_id_os.value:
-                print("- Equipamento ID está vazio")
-            if not tecnico_id_os.value:
-                print("- Técnico ID está vazio")
-            if not descricao_problema_os.value:
-                print("- Descrição está vazia")
+        campos = {"Cliente ID": cliente_id_os.value, "Equipamento ID": equipamento_id_os.value,
+                  "Técnico ID": tecnico_id_os.value, "Descrição": descricao_problema_os.value}
+        faltando = [nome for nome, valor in campos.items() if not valor]
+        logger.debug("IDs da OS: %s; faltando: %s", campos, ", ".join(faltando) or "nenhum")
 
     os_container = ft.Container(
         content=ft.Column([
@@ -1755,9 +1437,14 @@ def main(page: ft.Page):
         height=400,
         spacing=10,
         padding=20,
-        auto_scroll=True
+        auto_scroll=False,  # A lista cresce para baixo conforme o usuário rola
+        on_scroll_interval=100,
     )
 
+    # Estado da paginação da listagem: termo atual e marcador da próxima página
+    paginacao_os = {"termo": None, "proximo": None}
+    carregando_os = threading.Lock()
+
     os_detalhes = ft.Container(
         content=ft.Column([
             ft.Text("Selecione uma OS para ver os detalhes", 
@@ -1774,137 +1461,173 @@ def main(page: ft.Page):
     )
 
     # Adicione a função para buscar as ordens de serviço
+    @tela.evento
     def buscar_os(e):
         termo = busca_os_field.value
+        # Busca imediata (botões/troca de aba) substitui qualquer busca pendente
+        busca_os_debounced.cancelar()
         
-        # Limpa a lista atual
-        lista_os.controls.clear()
-        
-        # Faz a busca no banco de dados
-        ordens = sistema.buscar_ordens_servico(termo)
-        
-        if not ordens:
-            lista_os.controls.append(
-                ft.Container(
-                    content=ft.Column([
-                        ft.Icon(ft.icons.SEARCH_OFF, color=ft.colors.GREY_500, size=40),
-                        ft.Text("Nenhuma ordem de serviço encontrada", 
-                              italic=True, 
-                              color=ft.colors.GREY_500)
-                    ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                    padding=20,
-                    alignment=ft.alignment.center
-                )
-            )
-        else:
-            for ordem in ordens:
-                # Desempacotamos os valores de cada OS
-                (os_id, cliente_id, equipamento_id, tecnico_id, 
-                 data_abertura, data_fechamento, status, 
-                 descricao_problema, descricao_solucao,
-                 cliente_nome, telefone, email, rua, numero, bairro, cidade, estado,
-                 tipo_equip, marca, modelo, num_serie, observacao,
-                 tecnico_nome, especialidade) = ordem
-                
-                # Data de fechamento formatada
-                fechamento_txt = f"Fechada em: {data_fechamento}" if data_fechamento else "Em aberto"
-                
-                # Status com cores diferentes
-                status_color = {
-                    "Aberta": ft.colors.BLUE,
-                    "Em andamento": ft.colors.ORANGE,
-                    "Aguardando peças": ft.colors.PURPLE,
-                    "Fechada": ft.colors.GREEN,
-                }.get(status, ft.colors.GREY)
-                
-                # Descrição curta do problema
-                problema_curto = (descricao_problema[:50] + "...") if descricao_problema and len(descricao_problema) > 50 else (descricao_problema or "Sem descrição")
-                
-                # Container para cada OS
-                lista_os.controls.append(
-                    ft.Container(
-                        content=ft.Column([
-                            ft.Row([
-                                ft.Text(f"OS: {os_id}", 
-                                      weight=ft.FontWeight.BOLD, 
-                                      size=16),
-                                ft.Text(status, 
-                                      weight=ft.FontWeight.BOLD, 
-                                      color=status_color)
-                            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-                            
-                            ft.Divider(height=1, color=ft.colors.GREY_300),
-                            
-                            ft.Row([
-                                ft.Column([
-                                    ft.Text("Cliente:", size=12, color=ft.colors.GREY_700),
-                                    ft.Text(cliente_nome, weight=ft.FontWeight.BOLD)
-                                ], expand=True),
-                                
-                                ft.Column([
-                                    ft.Text("Equipamento:", size=12, color=ft.colors.GREY_700),
-                                    ft.Text(f"{tipo_equip} {marca} {modelo}".strip())
-                                ], expand=True)
-                            ]),
-                            
-                            ft.Row([
-                                ft.Column([
-                                    ft.Text("Abertura:", size=12, color=ft.colors.GREY_700),
-                                    ft.Text(data_abertura)
-                                ], expand=True),
-                                
-                                ft.Column([
-                                    ft.Text("Fechamento:", size=12, color=ft.colors.GREY_700),
-                                    ft.Text(data_fechamento or "Em aberto")
-                                ], expand=True),
-                            ]),
-                            
-                            ft.Text("Problema: " + problema_curto, 
-                                  size=12, 
-                                  color=ft.colors.GREY_800,
-                                  italic=True)
-                        ]),
-                        bgcolor=ft.colors.WHITE,
-                        border=ft.border.all(1, ft.colors.GREY_300),
-                        border_radius=10,
-                        padding=15,
-                        margin=5,
-                        ink=True,  # Efeito de ondulação ao clicar
-                        data=ordem,  # Armazena todos os dados da OS
-                        on_click=exibir_detalhes_os
-                    )
-                )
-        
-        page.update()
+        # Faz a busca no banco de dados (apenas a primeira página)
+        exibir_ordens(termo, sistema.buscar_ordens_pagina(termo))
+
+    # Versão usada enquanto o usuário digita: espera a pausa na digitação
+    def buscar_os_digitando(e):
+        busca_os_debounced.agendar(busca_os_field.value)
+
+    def criar_item_os():
+        """Cria um cartão de OS vazio para a listagem (preenchido por preencher_item_os)."""
+        # Container para cada OS
+        return ft.Container(
+            content=ft.Column([
+                ft.Row([
+                    ft.Text(weight=ft.FontWeight.BOLD, 
+                          size=16),
+                    ft.Text(weight=ft.FontWeight.BOLD)
+                ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+
+                ft.Divider(height=1, color=ft.colors.GREY_300),
+
+                ft.Row([
+                    ft.Column([
+                        ft.Text("Cliente:", size=12, color=ft.colors.GREY_700),
+                        ft.Text(weight=ft.FontWeight.BOLD)
+                    ], expand=True),
+
+                    ft.Column([
+                        ft.Text("Equipamento:", size=12, color=ft.colors.GREY_700),
+                        ft.Text()
+                    ], expand=True)
+                ]),
+
+                ft.Row([
+                    ft.Column([
+                        ft.Text("Abertura:", size=12, color=ft.colors.GREY_700),
+                        ft.Text()
+                    ], expand=True),
+
+                    ft.Column([
+                        ft.Text("Fechamento:", size=12, color=ft.colors.GREY_700),
+                        ft.Text()
+                    ], expand=True),
+                ]),
+
+                ft.Text(size=12, 
+                      color=ft.colors.GREY_800,
+                      italic=True)
+            ]),
+            bgcolor=ft.colors.WHITE,
+            border=ft.border.all(1, ft.colors.GREY_300),
+            border_radius=10,
+            padding=15,
+            margin=5,
+            ink=True,  # Efeito de ondulação ao clicar
+            on_click=exibir_detalhes_os
+        )
+
+    def preencher_item_os(item, ordem):
+        """Põe os dados de um OrdemResumo num cartão da listagem."""
+        # Status com cores diferentes
+        status_color = {
+            "Aberta": ft.colors.BLUE,
+            "Em andamento": ft.colors.ORANGE,
+            "Aguardando peças": ft.colors.PURPLE,
+            "Fechada": ft.colors.GREEN,
+        }.get(ordem.status, ft.colors.GREY)
+        
+        # Descrição curta do problema (a consulta já traz só o começo)
+        problema = ordem.problema
+        problema_curto = (problema[:TAMANHO_RESUMO_PROBLEMA] + "...") if problema and len(problema) > TAMANHO_RESUMO_PROBLEMA else (problema or "Sem descrição")
+
+        cabecalho, _, pessoas, datas, problema_texto = item.content.controls
+        numero_texto, status_texto = cabecalho.controls
+        cliente_texto, equipamento_texto = (coluna.controls[1] for coluna in pessoas.controls)
+        abertura_texto, fechamento_texto = (coluna.controls[1] for coluna in datas.controls)
+
+        numero_texto.value = f"OS: {ordem.id}"
+        status_texto.value = ordem.status
+        status_texto.color = status_color
+        cliente_texto.value = ordem.cliente_nome
+        equipamento_texto.value = ordem.equipamento
+        abertura_texto.value = ordem.data_abertura
+        fechamento_texto.value = ordem.data_fechamento or "Em aberto"
+        problema_texto.value = "Problema: " + problema_curto
+        item.data = ordem.id  # Só o ID: o registro completo é lido ao abrir os detalhes
+
+    itens_os = ListaReciclada(
+        lista_os, criar_item_os, preencher_item_os,
+        vazio=ft.Container(
+            content=ft.Column([
+                ft.Icon(ft.icons.SEARCH_OFF, color=ft.colors.GREY_500, size=40),
+                ft.Text("Nenhuma ordem de serviço encontrada", 
+                      italic=True, 
+                      color=ft.colors.GREY_500)
+            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+            padding=20,
+            alignment=ft.alignment.center
+        )
+    )
+
+    def exibir_ordens(termo, pagina):
+        ordens, proximo = pagina
+        paginacao_os["termo"] = termo
+        paginacao_os["proximo"] = proximo
+
+        # Reaproveita os cartões já na lista
+        itens_os.exibir(ordens)
+        tela.atualizar(lista_os)
+
+    # Carrega a próxima página quando a rolagem chega perto do fim da lista
+    def carregar_mais_os():
+        if paginacao_os["proximo"] is None:
+            return
+        # Ignora eventos de rolagem enquanto uma página ainda está carregando
+        if not carregando_os.acquire(blocking=False):
+            return
+        try:
+            termo = paginacao_os["termo"]
+            ordens, proximo = sistema.buscar_ordens_pagina(termo, apos=paginacao_os["proximo"])
+            # Uma busca nova pode ter substituído a lista enquanto carregava
+            if termo != paginacao_os["termo"]:
+                return
+            paginacao_os["proximo"] = proximo
+            itens_os.acrescentar(ordens)
+            tela.atualizar(lista_os)
+        finally:
+            carregando_os.release()
+
+    @tela.evento
+    def rolagem_lista_os(e):
+        if e.max_scroll_extent and e.pixels >= e.max_scroll_extent - 200:
+            carregar_mais_os()
+
+    lista_os.on_scroll = rolagem_lista_os
 
     # Função para mostrar detalhes quando clicar em uma OS
+    @tela.evento
     def exibir_detalhes_os(e):
-        os_data = e.control.data
-        
-        # Desempacotamos os valores
-        (os_id, cliente_id, equipamento_id, tecnico_id, 
-         data_abertura, data_fechamento, status, 
-         descricao_problema, descricao_solucao,
-         cliente_nome, telefone, email, rua, numero, bairro, cidade, estado,
-         tipo_equip, marca, modelo, num_serie, observacao,
-         tecnico_nome, especialidade) = os_data
+        # O cartão guarda só o ID; o registro completo é lido agora, pela chave primária
+        os_data = sistema.get_ordem(e.control.data)
+        if os_data is None:
+            show_snackbar(page, f"OS {e.control.data} não encontrada!")
+            return
+        o = os_data
         
         # Criamos o conteúdo do modal
         modal_content = ft.Column([
             # Cabeçalho da OS com status
             ft.Row([
-                ft.Text(f"Ordem de Serviço: {os_id}", 
+                ft.Text(f"Ordem de Serviço: {o.id}", 
                        size=20, 
                        weight=ft.FontWeight.BOLD,
                        color=primary_color),
                 ft.Container(
-                    content=ft.Text(status, color="white"),
+                    content=ft.Text(o.status, color="white"),
                     bgcolor={
                         "Aberta": ft.colors.BLUE,
                         "Em andamento": ft.colors.ORANGE,
                         "Aguardando peças": ft.colors.PURPLE,
                         "Fechada": ft.colors.GREEN,
-                    }.get(status, ft.colors.GREY),
+                    }.get(o.status, ft.colors.GREY),
                     border_radius=15,
                     padding=ft.padding.only(left=10, right=10, top=5, bottom=5),
                     width=150,
@@ -1914,8 +1637,8 @@ def main(page: ft.Page):
             
             # Datas
             ft.Row([
-                ft.Text(f"Aberta em: {data_abertura}", size=14),
-                ft.Text(f"Fechada em: {data_fechamento or 'Em aberto'}", size=14),
+                ft.Text(f"Aberta em: {o.data_abertura}", size=14),
+                ft.Text(f"Fechada em: {o.data_fechamento or 'Em aberto'}", size=14),
             ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
             
             ft.Divider(height=1),
@@ -1927,10 +1650,10 @@ def main(page: ft.Page):
                            size=16, 
                            weight=ft.FontWeight.BOLD,
                            color=primary_color),
-                    ft.Text(f"Nome: {cliente_nome}", size=14),
-                    ft.Text(f"Telefone: {telefone}", size=14),
-                    ft.Text(f"Email: {email or 'N/A'}", size=14),
-                    ft.Text(f"Endereço: {rua}, {numero} - {bairro}, {cidade}/{estado}", size=14),
+                    ft.Text(f"Nome: {o.cliente_nome}", size=14),
+                    ft.Text(f"Telefone: {o.telefone}", size=14),
+                    ft.Text(f"Email: {o.email or 'N/A'}", size=14),
+                    ft.Text(f"Endereço: {o.rua}, {o.numero} - {o.bairro}, {o.cidade}/{o.estado}", size=14),
                 ]),
                 bgcolor=ft.colors.BLUE_50,
                 border_radius=10,
@@ -1945,10 +1668,10 @@ def main(page: ft.Page):
                            size=16, 
                            weight=ft.FontWeight.BOLD,
                            color=primary_color),
-                    ft.Text(f"Tipo: {tipo_equip}", size=14),
-                    ft.Text(f"Marca/Modelo: {marca} {modelo}", size=14),
-                    ft.Text(f"Número de Série: {num_serie or 'N/A'}", size=14),
-                    ft.Text(f"Observações: {observacao or 'N/A'}", size=14),
+                    ft.Text(f"Tipo: {o.equipamento_tipo}", size=14),
+                    ft.Text(f"Marca/Modelo: {o.marca} {o.modelo}", size=14),
+                    ft.Text(f"Número de Série: {o.numero_serie or 'N/A'}", size=14),
+                    ft.Text(f"Observações: {o.observacao or 'N/A'}", size=14),
                 ]),
                 bgcolor=ft.colors.GREEN_50,
                 border_radius=10,
@@ -1963,8 +1686,8 @@ def main(page: ft.Page):
                            size=16, 
                            weight=ft.FontWeight.BOLD,
                            color=primary_color),
-                    ft.Text(f"Nome: {tecnico_nome}", size=14),
-                    ft.Text(f"Especialidade: {especialidade or 'N/A'}", size=14),
+                    ft.Text(f"Nome: {o.tecnico_nome}", size=14),
+                    ft.Text(f"Especialidade: {o.especialidade or 'N/A'}", size=14),
                 ]),
                 bgcolor=ft.colors.AMBER_50,
                 border_radius=10,
@@ -1978,7 +1701,7 @@ def main(page: ft.Page):
                    weight=ft.FontWeight.BOLD,
                    color=primary_color),
             ft.Container(
-                content=ft.Text(descricao_problema or "Não informado"),
+                content=ft.Text(o.descricao_problema or "Não informado"),
                 bgcolor=ft.colors.RED_50,
                 width=float("inf"),
                 padding=10,
@@ -1991,7 +1714,7 @@ def main(page: ft.Page):
                    weight=ft.FontWeight.BOLD,
                    color=primary_color),
             ft.Container(
-                content=ft.Text(descricao_solucao or "OS não finalizada"),
+                content=ft.Text(o.descricao_solucao or "OS não finalizada"),
                 bgcolor=ft.colors.GREEN_50,
                 width=float("inf"),
                 padding=10,
@@ -2025,7 +1748,7 @@ def main(page: ft.Page):
         # Criando a função para fechar o modal
         def close_dlg():
             dlg_modal.open = False
-            page.update()
+            tela.atualizar(dlg_modal)
         
         # Função para fechar o modal e editar
         def fechar_modal_e_editar(data):
@@ -2043,340 +1766,40 @@ def main(page: ft.Page):
         # Mostrar o modal
         page.overlay.append(dlg_modal)
         dlg_modal.open = True
-        page.update()
+        tela.atualizar()  # overlay mudou: vai a página
 
     # Função para gerar PDF de uma OS existente
-    def gerar_pdf_os_existente(os_data):
-        """Gera PDF para uma OS existente com design melhorado"""
-        
-        # Importar o módulo os com um nome diferente para evitar conflito com o parâmetro
-        import os as os_module
-        
-        # Cria pasta 'OS' se não existir
-        os_folder = "OS"
-        if not os_module.path.exists(os_folder):
-            os_module.makedirs(os_folder)
-            print(f"Pasta '{os_folder}' criada com sucesso!")
-        
-        # Extrair os dados necessários
-        (os_id, cliente_id, equipamento_id, tecnico_id, 
-         data_abertura, data_fechamento, status, 
-         descricao_problema, descricao_solucao,
-         cliente_nome, telefone, email, rua, numero, bairro, cidade, estado,
-         tipo_equip, marca, modelo, num_serie, observacao,
-         tecnico_nome, especialidade) = os_data
-        
-        # Nome do arquivo com data para evitar sobrescrita
-        data_hora = datetime.now().strftime('%Y%m%d_%H%M')
-        filename = os_module.path.join(os_folder, f"os_{os_id}_{cliente_nome.replace(' ', '_')}_{data_hora}.pdf".replace(" ", "_"))
-        
-        print(f"Gerando PDF em: {os_module.path.abspath(filename)}")
-        
-        c = canvas.Canvas(filename, pagesize=letter)
-        width, height = letter  # width=612, height=792 pontos
-        
-        # Adicionar borda à página (mais fina e sutil)
-        c.setStrokeColorRGB(0.8, 0.8, 0.8)
-        c.setLineWidth(1)
-        c.rect(20, 20, width-40, height-40)
-        
-        # Cabeçalho com informações da empresa - TAMANHO REDUZIDO
-        c.setFont("Helvetica-Bold", 16)  # Reduzido de 18 para 16
-        c.drawCentredString(width/2, height-50, "ELETRÔNICA NEW STAR")  # Posição ajustada de -60 para -50
-        
-        c.setFont("Helvetica", 10)  # Reduzido de 12 para 10
-        c.drawCentredString(width/2, height-70, "CNPJ: 07.914.206/0001-76")  # Posição ajustada
-        c.drawCentredString(width/2, height-85, "Rua Sete de Maio, 559 A - Chã do Pilar")
-        c.drawCentredString(width/2, height-100, "Pilar - AL, CEP: 57150-000 - Tel: (82) 9999-9999")
-        
-        # Linha separadora
-        c.setLineWidth(0.5)  # Linha mais fina
-        c.line(50, height-115, width-50, height-115)
-        
-        # Título do documento
-        c.setFont("Helvetica-Bold", 14)  # Reduzido de 16 para 14
-        c.drawCentredString(width/2, height-140, f"ORDEM DE SERVIÇO #{os_id}")
-        
-        # Status da OS com design melhorado
-        status_colors = {
-            "Aberta": (0, 0, 0.8),  # Azul
-            "Em andamento": (0.9, 0.5, 0),  # Laranja
-            "Aguardando peças": (0.6, 0, 0.6),  # Roxo
-            "Fechada": (0, 0.6, 0),  # Verde
-        }
-        color = status_colors.get(status, (0.5, 0.5, 0.5))  # Cinza como padrão
-        
-        # Caixa para o status mais compacta
-        c.setFillColorRGB(*color)
-        c.setStrokeColorRGB(*color)
-        c.roundRect(width/2-50, height-165, 100, 20, 8, fill=1)  # Menor e mais acima
-        c.setFillColorRGB(1, 1, 1)  # Branco
-        c.setFont("Helvetica-Bold", 12)  # Fonte menor
-        c.drawCentredString(width/2, height-155, status.upper())
-        c.setFillColorRGB(0, 0, 0)  # Preto
-        
-        # Datas - Posicionamento ajustado
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(50, height-190, "Abertura:")
-        c.setFont("Helvetica", 10)
-        c.drawString(110, height-190, data_abertura)
-        
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(width-250, height-190, "Fechamento:")
-        c.setFont("Helvetica", 10)
-        c.drawString(width-170, height-190, data_fechamento or "Em aberto")
-        
-        # Linha separadora
-        c.line(50, height-200, width-50, height-200)
-        
-        # Dados do Cliente - Layout mais compacto
-        y = height-220
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(50, y, "INFORMAÇÕES DO CLIENTE")
-        y -= 15
-        
-        # Tabela de informações do cliente em duas colunas
-        col1_x = 50
-        col2_x = width/2
-        
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(col1_x, y, "Nome:")
-        c.setFont("Helvetica", 10)
-        c.drawString(col1_x + 50, y, cliente_nome)
-        
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(col2_x, y, "Telefone:")
-        c.setFont("Helvetica", 10)
-        c.drawString(col2_x + 60, y, telefone)
-        y -= 15
-        
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(col1_x, y, "Email:")
-        c.setFont("Helvetica", 10)
-        c.drawString(col1_x + 50, y, email or "N/A")
-        y -= 15
-        
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(col1_x, y, "Endereço:")
-        c.setFont("Helvetica", 10)
-        endereco = f"{rua}, {numero} - {bairro}, {cidade}/{estado}"
-        # Verificar se o endereço é muito longo
-        if len(endereco) > 50:
-            c.drawString(col1_x + 60, y, endereco[:50])
-            c.drawString(col1_x + 60, y - 12, endereco[50:])
-            y -= 12  # Espaço adicional se endereço for longo
-        else:
-            c.drawString(col1_x + 60, y, endereco)
-        y -= 20
-        
-        # Dados do Equipamento - Layout melhorado
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(50, y, "INFORMAÇÕES DO EQUIPAMENTO")
-        y -= 15
-        
-        # Tabela de informações do equipamento em duas colunas
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(col1_x, y, "Tipo:")
-        c.setFont("Helvetica", 10)
-        c.drawString(col1_x + 50, y, tipo_equip or "")
-        
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(col2_x, y, "Marca/Modelo:")
-        c.setFont("Helvetica", 10)
-        c.drawString(col2_x + 80, y, f"{marca} {modelo}".strip())
-        y -= 15
-        
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(col1_x, y, "Nº Série:")
-        c.setFont("Helvetica", 10)
-        c.drawString(col1_x + 50, y, num_serie or "Não informado")
-        y -= 15
-        
-        # Observações do equipamento com quebra de linha se for muito longo
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(col1_x, y, "Observações:")
-        c.setFont("Helvetica", 10)
-        obs = observacao or "Nenhuma"
-        if len(obs) > 70:
-            c.drawString(col1_x + 75, y, obs[:70])
-            c.drawString(col1_x + 75, y - 12, obs[70:140])
-            y -= 12  # Espaço adicional
-        else:
-            c.drawString(col1_x + 75, y, obs)
-        y -= 20
-        
-        # Descrição do problema
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(50, y, "DESCRIÇÃO DO PROBLEMA")
-        y -= 15
-        
-        # Caixa para o problema - mais compacta
-        c.setFillColorRGB(0.95, 0.95, 1.0)  # Azul bem claro
-        c.setStrokeColorRGB(0.8, 0.8, 0.9)
-        problema_height = 50  # Reduzido de 60 para 50
-        c.rect(50, y-problema_height, width-100, problema_height, fill=1)
-        c.setFillColorRGB(0, 0, 0)  # Preto
-        
-        # Texto do problema
-        textobject = c.beginText(55, y-12)
-        textobject.setFont("Helvetica", 10)  # Fonte menor
-        if descricao_problema:
-            # Dividir em linhas se for muito longo
-            lines = []
-            for line in descricao_problema.split('\n'):
-                if len(line) > 80:  # Permite linhas um pouco mais longas
-                    words = line.split()
-                    current_line = ""
-                    for word in words:
-                        if len(current_line) + len(word) + 1 <= 80:
-                            current_line += (" " + word if current_line else word)
-                        else:
-                            lines.append(current_line)
-                            current_line = word
-                    if current_line:
-                        lines.append(current_line)
-                else:
-                    lines.append(line)
-            
-            for line in lines[:4]:  # Limitar a 4 linhas
-                textobject.textLine(line)
+    # PDFs são gerados em segundo plano; a interface só recebe os avisos
+    def pdf_na_fila(os_id, mensagem):
+        show_snackbar(page, mensagem)
+
+    def pdf_concluido(os_id, filename, erro):
+        if erro:
+            show_snackbar(page, f"Erro ao gerar PDF da OS {os_id}: {erro}")
         else:
-            textobject.textLine("Não informado")
-        
-        c.drawText(textobject)
-        y -= problema_height + 5
-        
-        # Se existir solução, mostrá-la
-        if status == "Fechada" and descricao_solucao:
-            c.setFont("Helvetica-Bold", 12)
-            c.drawString(50, y, "SOLUÇÃO APLICADA")
-            y -= 15
-            
-            # Caixa para a solução - também mais compacta
-            c.setFillColorRGB(0.95, 1.0, 0.95)  # Verde bem claro
-            c.setStrokeColorRGB(0.8, 0.9, 0.8)
-            solucao_height = 50  # Altura reduzida
-            c.rect(50, y-solucao_height, width-100, solucao_height, fill=1)
-            c.setFillColorRGB(0, 0, 0)  # Preto
-            
-            # Texto da solução
-            textobject = c.beginText(55, y-12)
-            textobject.setFont("Helvetica", 10)  # Fonte menor
-            
-            # Mesmo processamento para o texto da solução
-            lines = []
-            for line in descricao_solucao.split('\n'):
-                if len(line) > 80:
-                    words = line.split()
-                    current_line = ""
-                    for word in words:
-                        if len(current_line) + len(word) + 1 <= 80:
-                            current_line += (" " + word if current_line else word)
-                        else:
-                            lines.append(current_line)
-                            current_line = word
-                    if current_line:
-                        lines.append(current_line)
-                else:
-                    lines.append(line)
-            
-            for line in lines[:4]:  # Limitar a 4 linhas
-                textobject.textLine(line)
-            
-            c.drawText(textobject)
-            y -= solucao_height + 5
-        
-        # Técnico responsável
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(50, y, "Técnico Responsável:")
-        c.setFont("Helvetica", 10)
-        c.drawString(160, y, tecnico_nome)
-        
-        c.setFont("Helvetica-Oblique", 9)
-        c.drawString(160, y-12, f"Especialidade: {especialidade or 'N/A'}")
-        y -= 25
-        
-        # Termo de garantia em destaque - MAIS COMPACTO
-        c.setFont("Helvetica-Bold", 11)  # Reduzido
-        c.drawString(50, y, "TERMO DE GARANTIA")
-        y -= 15
-        
-        # Texto do termo de garantia melhorado - FONTE MENOR
-        termo_garantia = """
-1. PRAZO: Garantimos os serviços por 90 dias, conforme Código de Defesa do Consumidor.
-2. COBERTURA: Esta garantia cobre apenas componentes substituídos e serviços descritos nesta OS.
-3. EXCLUSÕES: Não cobre: a) Uso inadequado; b) Quedas/umidade; c) Oscilações elétricas; d) Outros problemas.
-4. RETIRADA: Prazo de 90 dias para retirada após conclusão. Após, sujeito a descarte conforme lei.
-        """
-        
-        # Caixa para o termo de garantia - MENOR ALTURA
-        c.setFillColorRGB(1.0, 0.98, 0.9)  # Amarelo bem claro
-        c.setStrokeColorRGB(0.9, 0.8, 0.7)
-        termo_height = 70  # Reduzido
-        c.rect(50, y-termo_height, width-100, termo_height, fill=1)
-        c.setFillColorRGB(0, 0, 0)  # Preto
-        
-        # Texto do termo
-        textobject = c.beginText(55, y-12)
-        textobject.setFont("Helvetica", 8)  # Fonte menor
-        for line in termo_garantia.split('\n'):
-            if line.strip():  # Só adiciona linhas não vazias
-                textobject.textLine(line)
-        c.drawText(textobject)
-        y -= termo_height + 10
-        
-        # Assinaturas - ESPAÇAMENTO ADEQUADO PARA EVITAR SOBREPOSIÇÃO
-        assinatura_y = max(100, y-20)  # Garante espaço mínimo ou usa a posição calculada
-        
-        c.setFont("Helvetica", 10)
-        c.line(100, assinatura_y, 250, assinatura_y)
-        c.drawCentredString(175, assinatura_y-15, "Assinatura do Cliente")
-        
-        c.line(350, assinatura_y, 500, assinatura_y)
-        c.drawCentredString(425, assinatura_y-15, "Assinatura do Representante")
-        
-        # Carimbo da empresa
-        c.setStrokeColorRGB(0.7, 0.7, 0.7)
-        c.circle(175, assinatura_y-65, 30, stroke=1)  # Carimbo menor
-        c.setFont("Helvetica-Bold", 9)
-        c.drawCentredString(175, assinatura_y-60, "CARIMBO")
-        c.drawCentredString(175, assinatura_y-72, "DA EMPRESA")
-        
-        # Rodapé
-        c.setFont("Helvetica-Oblique", 7)  # Fonte ainda menor
-        c.drawCentredString(width/2, 35, f"Ordem de Serviço #{os_id} gerada em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
-        c.drawCentredString(width/2, 25, "Este documento é um comprovante oficial de serviço - ELETRÔNICA NEW STAR")
-        
-        # Adicione isso ao final da função gerar_pdf_os_existente antes de c.save()
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(50, 100, f"Versão atualizada: {datetime.now()}")
+            show_snackbar(page, f"PDF da OS {os_id} gerado: {filename}")
 
-        c.save()
-        show_snackbar(page, f"PDF da OS {os_id} gerado: {filename}")
-        
-        # Imprimir informação para debug
-        print(f"PDF salvo em: {os_module.path.abspath(filename)}")
-        
-        # Abrir o PDF automaticamente
-        import platform, subprocess
-        try:
-            if platform.system() == 'Darwin':       # macOS
-                subprocess.call(('open', filename))
-            elif platform.system() == 'Windows':    # Windows
-                os_module.startfile(filename)
-            else:                                   # linux
-                subprocess.call(('xdg-open', filename))
-        except Exception as e:
-            print(f"Erro ao abrir PDF: {e}")
+    fila_pdf = FilaPdf(ao_progresso=pdf_na_fila, ao_concluir=pdf_concluido)
+    # Fechar a janela encerra os processos de PDF (a fila os recria se precisar)
+    page.on_disconnect = lambda e: fila_pdf.fechar()
+
+    busca_os_debounced = BuscaDebounced(sistema.buscar_ordens_pagina, exibir_ordens,
+                                        interromper=sistema.pool.interromper)
+
+    # Função para gerar PDF de uma OS existente
+    def gerar_pdf_os_existente(os_data):
+        """Envia o PDF da OS para a fila de geração (não bloqueia a interface)"""
+        fila_pdf.enviar(os_data)
 
     # Associe a função de busca ao campo
-    busca_os_field.on_change = buscar_os
+    busca_os_field.on_change = buscar_os_digitando
 
     # Adicione a função buscar_todas_os
+    @tela.evento
     def buscar_todas_os():
         busca_os_field.value = ""
+        tela.atualizar(busca_os_field)
         buscar_os(None)
-        page.update()
 
     # Crie o container para listar ordens de serviço
     lista_os_container = ft.Container(
@@ -2422,6 +1845,58 @@ def main(page: ft.Page):
         padding=20,
     )
 
+    # Painel: OS por técnico e situação, e tempo médio de atendimento
+    tabela_painel = ft.DataTable(
+        columns=[ft.DataColumn(ft.Text("Técnico"))]
+            + [ft.DataColumn(ft.Text(status), numeric=True) for status in STATUS_OS]
+            + [ft.DataColumn(ft.Text("Total"), numeric=True),
+               ft.DataColumn(ft.Text("Tempo médio"), numeric=True)],
+        rows=[],
+    )
+    estatisticas_cache = ft.Text("", size=12, color=ft.colors.GREY_600)
+
+    def atualizar_painel():
+        linhas = []
+        for linha in sistema.painel_tecnicos():
+            horas = linha["tempo_medio_horas"]
+            tempo = "-" if horas is None else (f"{horas / 24:.1f} dias" if horas >= 48 else f"{horas:.1f} h")
+            linhas.append(ft.DataRow(cells=[ft.DataCell(ft.Text(linha["tecnico_nome"]))]
+                + [ft.DataCell(ft.Text(str(linha[status]))) for status in STATUS_OS]
+                + [ft.DataCell(ft.Text(str(linha["total"]))), ft.DataCell(ft.Text(tempo))]))
+        tabela_painel.rows = linhas
+        cache = sistema.cache.estatisticas()
+        estatisticas_cache.value = (f"Cache de consultas: {cache['taxa_acerto']:.0%} de acertos "
+                                    f"({cache['acertos']}/{cache['acertos'] + cache['falhas']}), "
+                                    f"{cache['itens']} itens, {cache['invalidacoes']} invalidações")
+        tela.atualizar(tabela_painel, estatisticas_cache)
+
+    @tela.evento
+    def reconstruir_painel(e):
+        diferencas = sistema.reconstruir_painel()
+        atualizar_painel()
+        show_snackbar(page, f"Contadores reconstruídos ({len(diferencas)} corrigidos)")
+
+    @tela.evento
+    def recarregar_painel(e):
+        atualizar_painel()
+
+    painel_container = ft.Container(
+        content=ft.Column([
+            ft.Row([
+                ft.ElevatedButton("Atualizar", icon=ft.icons.REFRESH, on_click=recarregar_painel),
+                ft.OutlinedButton("Reconstruir contadores", icon=ft.icons.BUILD, on_click=reconstruir_painel),
+            ], alignment=ft.MainAxisAlignment.CENTER),
+            ft.Row([tabela_painel], scroll=ft.ScrollMode.AUTO),
+            estatisticas_cache,
+        ]),
+        visible=False,
+        padding=20,
+    )
+
+    # Containers de cada aba, na ordem da barra de navegação
+    abas = [cliente_container, equipamento_container, produto_container, tecnico_container,
+            os_container, lista_os_container, painel_container]
+
     # Barra de navegação
     page.navigation_bar = ft.NavigationBar(
         destinations=[
@@ -2430,7 +1905,8 @@ def main(page: ft.Page):
             ft.NavigationBarDestination(icon=ft.icons.INVENTORY, label="Produtos"),
             ft.NavigationBarDestination(icon=ft.icons.ENGINEERING, label="Técnicos"),
             ft.NavigationBarDestination(icon=ft.icons.WORK, label="OS"),
-            ft.NavigationBarDestination(icon=ft.icons.LIST_ALT, label="Listar OS")  # Nova opção
+            ft.NavigationBarDestination(icon=ft.icons.LIST_ALT, label="Listar OS"),  # Nova opção
+            ft.NavigationBarDestination(icon=ft.icons.DASHBOARD, label="Painel"),
         ],
         on_change=change_tab,
         bgcolor=primary_color,
@@ -2453,12 +1929,23 @@ def main(page: ft.Page):
                 produto_container,
                 tecnico_container,
                 os_container,
-                lista_os_container  # Novo container
+                lista_os_container,  # Novo container
+                painel_container
             ], scroll=ft.ScrollMode.AUTO),
             expand=True
         )
     )
+    inicio_os.marcar("primeiro_quadro")
+    inicio_os.registrar()
+
+    if os.environ.get("OS_PERFIL"):
+        # Mede handlers e page.update(); F12 mostra os mais lentos (ver perfil_os.py)
+        from perfil_os import PerfilUI
+        PerfilUI(page).instalar()
 
 # Iniciar a aplicação
 if __name__ == "__main__":
+    # OS_LOG=DEBUG mostra as mensagens de depuração (desligadas por padrão)
+    logging.basicConfig(level=os.environ.get("OS_LOG", "INFO").upper(),
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
     ft.app(target=main)
@@ -0,0 +1,32 @@
+import banco_os
+
+
+def test_escrita_em_outra_tabela_mantem_o_cache(tmp_path):
+    sistema = banco_os.SistemaOS(str(tmp_path / "os.db"))
+    cliente_id = sistema.add_cliente("Maria", "82999999999", "", "", "", "", "", "")
+    tecnico_id = sistema.add_tecnico("Luciano", "TV")
+
+    def consultar():
+        return sistema.get_cliente(cliente_id), sistema.get_tecnico(tecnico_id), sistema.buscar_tecnicos()
+
+    antes = consultar()
+    falhas = sistema.cache.falhas
+    sistema.add_produto("Cabo", "HDMI", 10.0, 5)
+
+    assert consultar() == antes
+    assert sistema.cache.falhas == falhas
+    sistema.pool.fechar()
+
+
+def test_escrita_de_outro_programa_limpa_o_cache(tmp_path):
+    caminho = str(tmp_path / "os.db")
+    sistema = banco_os.SistemaOS(caminho)
+    outro = banco_os.SistemaOS(caminho)
+    cliente_id = sistema.add_cliente("Maria", "82999999999", "", "", "", "", "", "")
+    assert sistema.buscar_equipamentos_por_cliente(cliente_id) == []
+
+    outro.add_equipamento(cliente_id, "TV", "LG", "M32", "123")
+
+    assert len(sistema.buscar_equipamentos_por_cliente(cliente_id)) == 1
+    sistema.pool.fechar()
+    outro.pool.fechar()
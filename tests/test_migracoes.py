@@ -0,0 +1,112 @@
+import sqlite3
+
+import pytest
+
+import banco_os
+
+
+def criar_banco_legado(caminho):
+    """Banco como a migração antiga de IDs o deixava: cópias *_old com linhas que não chegaram às tabelas novas."""
+    conn = sqlite3.connect(caminho)
+    conn.executescript('''
+        CREATE TABLE clientes (id TEXT PRIMARY KEY, nome TEXT NOT NULL, telefone TEXT NOT NULL, email TEXT,
+            rua TEXT, numero TEXT, bairro TEXT, cidade TEXT, estado TEXT, data_cadastro TEXT, id_antigo TEXT);
+        CREATE TABLE equipamentos (id TEXT PRIMARY KEY, cliente_id TEXT, tipo TEXT NOT NULL, marca TEXT,
+            modelo TEXT, numero_serie TEXT, observacao TEXT);
+        CREATE TABLE produtos (id TEXT PRIMARY KEY, nome TEXT NOT NULL, descricao TEXT, preco REAL, quantidade INTEGER);
+        CREATE TABLE tecnicos (id TEXT PRIMARY KEY, nome TEXT NOT NULL, especialidade TEXT);
+        CREATE TABLE ordens_servico (id TEXT PRIMARY KEY, cliente_id TEXT, equipamento_id TEXT, tecnico_id TEXT,
+            data_abertura TEXT, data_fechamento TEXT, status TEXT, descricao_problema TEXT, descricao_solucao TEXT);
+
+        CREATE TABLE clientes_old (id TEXT PRIMARY KEY, nome TEXT NOT NULL, telefone TEXT NOT NULL, email TEXT,
+            rua TEXT, numero TEXT, bairro TEXT, cidade TEXT, estado TEXT, data_cadastro TEXT);
+        CREATE TABLE equipamentos_old (id TEXT PRIMARY KEY, cliente_id TEXT, tipo TEXT NOT NULL, marca TEXT,
+            modelo TEXT, numero_serie TEXT);
+        CREATE TABLE produtos_old (id TEXT PRIMARY KEY, nome TEXT NOT NULL, descricao TEXT, preco REAL, quantidade INTEGER);
+        CREATE TABLE tecnicos_old (id TEXT PRIMARY KEY, nome TEXT NOT NULL, especialidade TEXT);
+        CREATE TABLE ordens_servico_old (id TEXT PRIMARY KEY, cliente_id TEXT, equipamento_id TEXT, tecnico_id TEXT,
+            data_abertura TEXT, data_fechamento TEXT, status TEXT, descricao_problema TEXT, descricao_solucao TEXT);
+
+        -- Cliente migrado (o UUID ficou em id_antigo) e cliente que não chegou a ser
+        INSERT INTO clientes (id, nome, telefone, data_cadastro, id_antigo)
+            VALUES ('CLI00001', 'Maria', '82999999999', '21/04/2025 10:27', 'uuid-cli-1');
+        INSERT INTO clientes_old (id, nome, telefone, data_cadastro) VALUES
+            ('uuid-cli-1', 'Maria', '82999999999', '21/04/2025 10:27'),
+            ('uuid-cli-2', 'José', '82988888888', '22/04/2025 09:00');
+        INSERT INTO equipamentos_old VALUES ('uuid-eqp-1', 'uuid-cli-1', 'TV', 'LG', 'M32', '123');
+        INSERT INTO tecnicos_old VALUES ('uuid-tec-1', 'Luciano', 'TV');
+        INSERT INTO ordens_servico_old VALUES ('uuid-os-1', 'uuid-cli-1', 'uuid-eqp-1', 'uuid-tec-1',
+            '23/04/2025 14:41', NULL, 'Aberta', 'Não liga', NULL);
+    ''')
+    conn.commit()
+    conn.close()
+
+
+def contar(conn, sql):
+    return conn.execute(sql).fetchone()[0]
+
+
+def test_migracao_devolve_linhas_das_tabelas_old(tmp_path):
+    caminho = str(tmp_path / "legado.db")
+    criar_banco_legado(caminho)
+
+    banco_os.init_db(caminho)
+
+    conn = sqlite3.connect(caminho)
+    for tabela in ["clientes", "equipamentos", "produtos", "tecnicos", "ordens_servico"]:
+        assert not banco_os.tabela_existe(conn.cursor(), f"{tabela}_old")
+    # O cliente já migrado não é duplicado; o que faltava volta com o UUID
+    assert contar(conn, "SELECT COUNT(*) FROM clientes") == 2
+    assert contar(conn, "SELECT COUNT(*) FROM clientes WHERE id = 'uuid-cli-2'") == 1
+    assert contar(conn, "SELECT COUNT(*) FROM equipamentos WHERE id = 'uuid-eqp-1'") == 1
+    assert contar(conn, "SELECT COUNT(*) FROM tecnicos WHERE id = 'uuid-tec-1'") == 1
+    ordem = conn.execute("SELECT tecnico_id, data_abertura_ts FROM ordens_servico WHERE id = 'uuid-os-1'").fetchone()
+    assert ordem == ("uuid-tec-1", banco_os.para_epoch("23/04/2025 14:41"))
+    conn.close()
+
+
+def test_migracao_para_se_linha_old_nao_pode_voltar(tmp_path):
+    caminho = str(tmp_path / "legado.db")
+    criar_banco_legado(caminho)
+    conn = sqlite3.connect(caminho)
+    # Sem tipo a linha não cabe na tabela atual (NOT NULL): a migração para
+    # com erro e a cópia continua no banco
+    conn.execute("DROP TABLE tecnicos_old")
+    conn.execute("CREATE TABLE tecnicos_old (id TEXT PRIMARY KEY, nome TEXT, especialidade TEXT)")
+    conn.execute("INSERT INTO tecnicos_old VALUES ('uuid-tec-2', NULL, 'Som')")
+    conn.commit()
+    conn.close()
+
+    with pytest.raises(sqlite3.IntegrityError):
+        banco_os.init_db(caminho)
+
+    conn = sqlite3.connect(caminho)
+    assert banco_os.versao_schema(conn) == 1
+    assert contar(conn, "SELECT COUNT(*) FROM tecnicos_old") == 1
+    conn.close()
+
+
+def test_migracao_de_ids_reescreve_referencias_aos_uuids(tmp_path):
+    caminho = str(tmp_path / "legado.db")
+    criar_banco_legado(caminho)
+    conn = sqlite3.connect(caminho)
+    # OS gravada depois da migração antiga ainda apontando para o UUID do cliente
+    conn.execute('''INSERT INTO ordens_servico VALUES ('OS00001', 'uuid-cli-1', 'uuid-eqp-1', 'uuid-tec-1',
+                    '24/04/2025 08:00', NULL, 'Aberta', 'Tela quebrada', NULL)''')
+    conn.commit()
+    conn.close()
+
+    alteradas = banco_os.migrar_para_novos_ids(caminho)
+
+    conn = sqlite3.connect(caminho)
+    # 4 IDs trocados (cliente, equipamento, técnico e OS devolvidos das cópias)
+    # e 7 referências reescritas
+    assert alteradas == 4 + 7
+    referencias = conn.execute(
+        "SELECT cliente_id, equipamento_id, tecnico_id FROM ordens_servico ORDER BY id").fetchall()
+    assert referencias == [("CLI00001", "EQP00001", "TEC00001")] * 2
+    assert conn.execute("SELECT cliente_id FROM equipamentos").fetchall() == [("CLI00001",)]
+    # O painel não guarda contadores dos IDs antigos
+    assert conn.execute("SELECT tecnico_id, status, quantidade FROM resumo_tecnico_status").fetchall() == \
+        [("TEC00001", "Aberta", 2)]
+    conn.close()